@@ -0,0 +1,154 @@
+from typing import Callable, Tuple, Union
+import math
+
+Number = Union[int, float]
+
+
+class Dual:
+    """ A dual number a + b ε with ε^2 = 0, for forward-mode automatic differentiation.
+    Evaluating f(Dual(x, 1)) carries f'(x) along in the ε part, exactly up to
+    rounding and in a single evaluation of f. Arithmetic with plain numbers works,
+    and NumPy functions such as np.exp or np.sin dispatch to the methods below.
+    Args:
+        value (float): The real part a.
+        derivative (float, optional): The ε part b. Defaults to 0."""
+    __slots__ = ("value", "derivative")
+
+    def __init__(self, value: Number, derivative: Number = 0.0) -> None:
+        self.value = value
+        self.derivative = derivative
+
+    @staticmethod
+    def _lift(other: Union["Dual", Number]) -> "Dual":
+        return other if isinstance(other, Dual) else Dual(other)
+
+    # Arithmetic
+    def __add__(self, other):
+        other = self._lift(other)
+        return Dual(self.value + other.value, self.derivative + other.derivative)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._lift(other)
+        return Dual(self.value - other.value, self.derivative - other.derivative)
+
+    def __rsub__(self, other):
+        return self._lift(other) - self
+
+    def __mul__(self, other):
+        other = self._lift(other)
+        return Dual(self.value * other.value, self.derivative * other.value + self.value * other.derivative)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = self._lift(other)
+        return Dual(self.value / other.value,
+                    (self.derivative * other.value - self.value * other.derivative) / other.value ** 2)
+
+    def __rtruediv__(self, other):
+        return self._lift(other) / self
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            # d(u^v) = u^v (v' ln u + v u' / u)
+            value = self.value ** other.value
+            return Dual(value, value * (other.derivative * math.log(self.value)
+                                        + other.value * self.derivative / self.value))
+        if other == 0:
+            return Dual(1.0, 0.0)
+        return Dual(self.value ** other, other * self.value ** (other - 1) * self.derivative)
+
+    def __rpow__(self, other):
+        return self._lift(other) ** self
+
+    def __neg__(self):
+        return Dual(-self.value, -self.derivative)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.value < 0 else self
+
+    # Comparisons use the real part, so branches in f follow the primal computation
+    def __eq__(self, other):
+        return self.value == self._lift(other).value
+
+    def __lt__(self, other):
+        return self.value < self._lift(other).value
+
+    def __le__(self, other):
+        return self.value <= self._lift(other).value
+
+    def __gt__(self, other):
+        return self.value > self._lift(other).value
+
+    def __ge__(self, other):
+        return self.value >= self._lift(other).value
+
+    __hash__ = None
+
+    def __float__(self) -> float:
+        return float(self.value)
+
+    # Elementary functions, also used by the matching NumPy ufuncs
+    def exp(self):
+        value = math.exp(self.value)
+        return Dual(value, value * self.derivative)
+
+    def log(self):
+        return Dual(math.log(self.value), self.derivative / self.value)
+
+    def sqrt(self):
+        value = math.sqrt(self.value)
+        return Dual(value, self.derivative / (2 * value))
+
+    def sin(self):
+        return Dual(math.sin(self.value), math.cos(self.value) * self.derivative)
+
+    def cos(self):
+        return Dual(math.cos(self.value), -math.sin(self.value) * self.derivative)
+
+    def tan(self):
+        value = math.tan(self.value)
+        return Dual(value, (1 + value ** 2) * self.derivative)
+
+    def arctan(self):
+        return Dual(math.atan(self.value), self.derivative / (1 + self.value ** 2))
+
+    def sinh(self):
+        return Dual(math.sinh(self.value), math.cosh(self.value) * self.derivative)
+
+    def cosh(self):
+        return Dual(math.cosh(self.value), math.sinh(self.value) * self.derivative)
+
+    def tanh(self):
+        value = math.tanh(self.value)
+        return Dual(value, (1 - value ** 2) * self.derivative)
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value}, {self.derivative})"
+
+
+def derivative(f: Callable, x: Number) -> Tuple[float, float]:
+    """ Value and derivative of f at x by forward-mode automatic differentiation.
+    Args:
+        f (Callable): Function of one variable built from arithmetic and the
+            functions supported by Dual.
+        x (float): The point.
+    Returns:
+        Tuple[float, float]: f(x) and f'(x)."""
+    result = f(Dual(x, 1.0))
+    if isinstance(result, Dual):
+        return result.value, result.derivative
+    return result, 0.0  # f does not depend on x
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    print(derivative(lambda x: x ** 3 - 2 * x - 5, 2.0))        # (-1.0, 10.0)
+    print(derivative(lambda x: np.exp(np.sin(x)) / x, 1.0))
+    print(derivative(lambda x: 2 ** x, 3.0))                    # (8.0, 8 ln 2)
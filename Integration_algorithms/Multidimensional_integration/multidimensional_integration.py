@@ -0,0 +1,288 @@
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from scipy.stats import qmc
+except ImportError:  # SciPy is optional, only the Sobol sampler needs it
+    qmc = None
+
+current_dir = Path().resolve()
+subdir_gauss = current_dir / "Integration_algorithms" / "Gaussian_quadrature"
+
+# Add subfolder to sys.path
+if str(subdir_gauss) not in sys.path:
+    sys.path.append(str(subdir_gauss))
+
+from gaussian_quadrature import gauss_rule
+
+METHODS = ("plain", "halton", "sobol", "stratified")
+DEFAULT_CHUNK_SIZE: int = 1 << 14
+MIN_REPLICATES: int = 8  # Chunk estimates needed before a replicate standard error is trusted
+
+# f maps an (m, d) array of points to the m function values
+Integrand = Callable[[np.ndarray], np.ndarray]
+
+
+class MonteCarloResult(NamedTuple):
+    """ Result of a Monte Carlo integration.
+    integral: The estimate of the integral.
+    standard_error: Estimated standard error of the estimate.
+    samples: Number of points at which f was evaluated.
+    converged: True if target_error was reached before the sample budget ran out."""
+    integral: float
+    standard_error: float
+    samples: int
+    converged: bool
+
+
+class _RunningMoments:
+    """ Count, mean and sum of squared deviations of a stream, merged one batch at
+    a time with the parallel form of Welford's update, so no sample is stored."""
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def merge(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else math.inf
+
+
+def _check_bounds(bounds: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """ Split [(lower, upper), ...] into lower and upper arrays."""
+    bounds = np.asarray(bounds, dtype=float)
+    if bounds.ndim != 2 or bounds.shape[1] != 2 or bounds.shape[0] == 0:
+        raise ValueError("bounds must be a sequence of (lower, upper) pairs, one per dimension.")
+    if np.any(bounds[:, 0] >= bounds[:, 1]):
+        raise ValueError("Lower limit must be less than upper limit")
+    return bounds[:, 0], bounds[:, 1]
+
+
+def tensor_cubature(f: Integrand, bounds: Sequence[Tuple[float, float]], order: int = 10,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> float:
+    """
+    Integrate f over a box with the tensor product of Gauss-Legendre rules.
+
+    The grid has order^d points, so this is meant for low dimensions; it is exact
+    for polynomials of degree 2 * order - 1 in every variable. Grid points are
+    generated and evaluated chunk_size at a time.
+
+    Parameters:
+    f (callable): Maps an (m, d) array of points to m values.
+    bounds (sequence): (lower, upper) limits for each of the d dimensions.
+    order (int): Nodes per dimension. Default is 10.
+    chunk_size (int): Points per call of f. Default is 2^14.
+
+    Returns:
+    float: The approximate value of the integral.
+
+    Raises:
+    ValueError: If the bounds are invalid.
+    """
+    lower, upper = _check_bounds(bounds)
+    nodes, weights = gauss_rule("legendre", order)
+    half = (upper - lower) / 2
+    dimension = lower.shape[0]
+    total_points = order ** dimension
+    integral = 0.0
+    for start in range(0, total_points, chunk_size):
+        index = np.unravel_index(np.arange(start, min(start + chunk_size, total_points)), (order,) * dimension)
+        points = np.column_stack([lower[k] + half[k] * (nodes[i] + 1) for k, i in enumerate(index)])
+        chunk_weights = np.prod([weights[i] for i in index], axis=0)
+        integral += float(chunk_weights @ f(points))
+    return integral * float(np.prod(half))
+
+
+def _halton(count: int, dimension: int) -> np.ndarray:
+    """ The first count points of the Halton sequence in [0, 1)^d, one radical
+    inverse per prime base, computed digit by digit for all points at once."""
+    primes = []
+    candidate = 2
+    while len(primes) < dimension:
+        if all(candidate % p for p in primes):
+            primes.append(candidate)
+        candidate += 1
+    index = np.arange(1, count + 1)
+    points = np.empty((count, dimension))
+    for k, base in enumerate(primes):
+        remaining, value, scale = index.copy(), np.zeros(count), 1.0 / base
+        while np.any(remaining):
+            value += (remaining % base) * scale
+            remaining //= base
+            scale /= base
+        points[:, k] = value
+    return points
+
+
+def _stratified(count: int, dimension: int, rng: np.random.Generator) -> np.ndarray:
+    """ Exactly count points: the same number in every cell of an equal k^s grid over
+    the first s axes (s = d when the chunk is large enough), uniform elsewhere. The
+    remaining count mod k^s points go to distinct cells drawn uniformly at random,
+    so every point is still uniform on the box and the chunk mean stays unbiased."""
+    axes = dimension if count >= 2 ** dimension else max(1, int(math.log2(count)))
+    k = max(1, int(count ** (1 / axes) + 1e-9))
+    cells = k ** axes
+    per_cell = count // cells
+    cell_index = np.concatenate((np.repeat(np.arange(cells), per_cell),
+                                 rng.choice(cells, count - cells * per_cell, replace=False)))
+    points = rng.random((count, dimension))
+    for axis, coordinate in enumerate(np.unravel_index(cell_index, (k,) * axes)):
+        points[:, axis] = (coordinate + points[:, axis]) / k
+    return points
+
+
+def _sample_chunk(f: Integrand, method: str, lower: np.ndarray, upper: np.ndarray,
+                  chunk_size: int, seed: np.random.SeedSequence) -> Tuple[int, float, float]:
+    """ Evaluate f on one chunk of points drawn with its own random stream.
+    Returns the count, mean and sum of squared deviations of the values."""
+    rng = np.random.default_rng(seed)
+    dimension = lower.shape[0]
+    if method == "plain":
+        unit = rng.random((chunk_size, dimension))
+    elif method == "halton":
+        # Cranley-Patterson rotation makes every chunk an independent replicate
+        unit = (_halton(chunk_size, dimension) + rng.random(dimension)) % 1.0
+    elif method == "sobol":
+        unit = qmc.Sobol(dimension, scramble=True, seed=rng).random(chunk_size)
+    else:
+        unit = _stratified(chunk_size, dimension, rng)
+    values = np.asarray(f(lower + (upper - lower) * unit), dtype=float)
+    mean = float(values.mean())
+    return values.shape[0], mean, float(np.sum((values - mean) ** 2))
+
+
+def monte_carlo_integrate(f: Integrand, bounds: Sequence[Tuple[float, float]], method: str = "plain",
+                          target_error: Optional[float] = None, max_samples: int = 1 << 22,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, seed: Optional[int] = None,
+                          workers: Optional[int] = None) -> MonteCarloResult:
+    """
+    Integrate f over a box by Monte Carlo sampling, streamed in fixed-size chunks.
+
+    "plain" draws independent uniform points and keeps a running mean and variance
+    of the values. "halton" (randomly shifted), "sobol" (scrambled, needs SciPy)
+    and "stratified" make every chunk an independent randomised estimate, and the
+    running statistics are kept over the chunk estimates. These replicates must be
+    identically distributed, so they are always full chunks of chunk_size points
+    (or of max_samples points if that is smaller); a remainder of the budget too
+    small for a full chunk is left unused, and at least MIN_REPLICATES chunks are
+    drawn before the standard error may stop the run. Sampling stops as soon
+    as the standard error drops below target_error or max_samples is reached.
+    Chunk i always draws from child i of one SeedSequence, so the chunks are the
+    same for any number of workers; a pool only checks target_error after each
+    wave of chunks and may therefore use a few more samples.
+
+    Parameters:
+    f (callable): Maps an (m, d) array of points to m values. Must be picklable if workers > 1.
+    bounds (sequence): (lower, upper) limits for each of the d dimensions.
+    method (str): One of "plain", "halton", "sobol" or "stratified". Default is "plain".
+    target_error (float, optional): Standard error at which to stop early.
+    max_samples (int): Budget of function evaluations. Default is 2^22.
+    chunk_size (int): Points per chunk. Default is 2^14.
+    seed (int, optional): Seed of the random streams.
+    workers (int, optional): Evaluate chunks on this many processes. Default runs in-process.
+
+    Returns:
+    MonteCarloResult: The estimate, its standard error, the samples used and whether
+        target_error was reached.
+
+    Raises:
+    ValueError: If the method or the bounds are invalid.
+    ImportError: If the Sobol sampler is requested but SciPy is not installed.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose from {METHODS}.")
+    if method == "sobol" and qmc is None:
+        raise ImportError("The sobol method requires SciPy to be installed.")
+    if chunk_size <= 0:
+        raise ValueError("The chunk size must be a positive integer.")
+    lower, upper = _check_bounds(bounds)
+    volume = float(np.prod(upper - lower))
+    if method != "plain":
+        chunk_size = min(chunk_size, max_samples)
+    seeds = np.random.SeedSequence(seed)
+    moments = _RunningMoments()
+    samples = 0
+
+    def standard_error() -> float:
+        return math.sqrt(moments.variance / moments.count) * volume
+
+    def record(chunk: Tuple[int, float, float]) -> None:
+        count, mean, m2 = chunk
+        if method == "plain":
+            moments.merge(count, mean, m2)
+        else:
+            moments.merge(1, mean, 0.0)  # One replicate per chunk
+
+    executor = ProcessPoolExecutor(workers) if workers and workers > 1 else None
+    wave = workers if executor is not None else 1
+    try:
+        while samples < max_samples:
+            sizes = []
+            for _ in range(wave):
+                size = min(chunk_size, max_samples - samples - sum(sizes))
+                if size <= 0 or (method != "plain" and size < chunk_size):
+                    break
+                sizes.append(size)
+            if not sizes:
+                break
+            children = seeds.spawn(len(sizes))
+            if executor is None:
+                chunks = [_sample_chunk(f, method, lower, upper, sizes[0], children[0])]
+            else:
+                chunks = list(executor.map(_sample_chunk, [f] * len(sizes), [method] * len(sizes),
+                                           [lower] * len(sizes), [upper] * len(sizes), sizes, children))
+            for chunk in chunks:
+                record(chunk)
+                samples += chunk[0]
+            enough = moments.count > 1 if method == "plain" else moments.count >= MIN_REPLICATES
+            if target_error is not None and enough and standard_error() <= target_error:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    error = standard_error() if moments.count > 1 else math.inf
+    converged = target_error is not None and error <= target_error
+    return MonteCarloResult(moments.mean * volume, error, samples, converged)
+
+
+if __name__ == "__main__":
+    # Integral of exp(-|x|^2) over [0, 1]^d is (sqrt(pi) / 2 * erf(1))^d
+    def gaussian(points):
+        return np.exp(-np.sum(points ** 2, axis=1))
+
+    one_dimensional = math.sqrt(math.pi) / 2 * math.erf(1)
+    print(f"tensor, d=3: error {tensor_cubature(gaussian, [(0, 1)] * 3, order=8) - one_dimensional ** 3:.1e}")
+    dimension = 8
+    exact = one_dimensional ** dimension
+    for method in METHODS:
+        if method == "sobol" and qmc is None:
+            continue
+        result = monte_carlo_integrate(gaussian, [(0, 1)] * dimension, method=method, target_error=1e-5, seed=0)
+        print(f"{method:>10}, d={dimension}: error {result.integral - exact:+.1e}, "
+              f"standard error {result.standard_error:.1e} after {result.samples} samples")
+
+    # At an equal budget, stratified sampling must beat plain sampling
+    budget, dimension = 1 << 18, 5
+    exact = one_dimensional ** dimension
+    rms_error = {}
+    for method in ("plain", "stratified"):
+        errors = [monte_carlo_integrate(gaussian, [(0, 1)] * dimension, method=method, max_samples=budget,
+                                        seed=seed).integral - exact for seed in range(8)]
+        rms_error[method] = math.sqrt(np.mean(np.square(errors)))
+    print(f"RMS error at {budget} samples, d={dimension}: {rms_error}")
+    assert rms_error["stratified"] < rms_error["plain"], "stratified sampling should beat plain sampling"
@@ -1,7 +1,101 @@
-from typing import Callable
+from typing import Callable, List
 import numpy as np
 
 
+class RombergIntegrator:
+    """
+    Resumable Romberg integration of a function f over the interval [a, b].
+
+    Level i of the table uses the trapezoidal rule with 2^i panels. Only the
+    newest two rows of the Romberg table are stored, together with the trapezoid
+    estimate of every level, so raising the level or tightening the tolerance
+    evaluates f only at the new midpoints and never repeats an evaluation.
+
+    Parameters:
+    f (callable): The function to integrate. It must accept a NumPy array of points.
+    a (float): The lower limit of integration.
+    b (float): The upper limit of integration.
+    """
+
+    def __init__(self, f: Callable[[float], float], a: float, b: float) -> None:
+        self.f = f
+        self.a = a
+        self.b = b
+        # First estimate with the Trapezoidal Rule (0th column of Romberg table)
+        self.trapezoids: List[float] = [(f(a) + f(b)) * (b - a) / 2]
+        self.previous_row = np.empty(0)
+        self.current_row = np.array([self.trapezoids[0]])
+        self.error_history: List[float] = []  # |R[i, i] - R[i-1, i-1]| for every level i >= 1
+        self.evaluations = 2
+
+    @property
+    def level(self) -> int:
+        """ Index i of the newest row of the table."""
+        return len(self.trapezoids) - 1
+
+    @property
+    def estimate(self) -> float:
+        """ The most extrapolated value R[i, i] of the newest row."""
+        return float(self.current_row[-1])
+
+    @property
+    def error(self) -> float:
+        """ The latest extrapolation error |R[i, i] - R[i-1, i-1]|, inf before the first refinement."""
+        return self.error_history[-1] if self.error_history else float("inf")
+
+    def refine(self) -> float:
+        """
+        Add one level to the table, evaluating f at the 2^(i-1) new midpoints only.
+
+        Returns:
+        float: The new estimate R[i, i].
+        """
+        i = self.level + 1
+        # Trapezoidal Rule refinement
+        h = (self.b - self.a) / (2 ** i)
+        sum_f = np.sum(self.f(self.a + np.arange(1, 2 ** i, 2) * h))
+        self.evaluations += 2 ** (i - 1)
+        self.trapezoids.append(self.trapezoids[-1] / 2 + h * sum_f)
+
+        # Richardson extrapolation against the previous row
+        row = np.empty(i + 1)
+        row[0] = self.trapezoids[-1]
+        factors = 4.0 ** np.arange(1, i + 1) - 1
+        for j in range(1, i + 1):
+            row[j] = row[j - 1] + (row[j - 1] - self.current_row[j - 1]) / factors[j - 1]
+        self.previous_row, self.current_row = self.current_row, row
+        self.error_history.append(float(abs(row[i] - self.previous_row[i - 1])))
+        return float(row[i])
+
+    def integrate(self, tol: float = 1e-6, max_iterations: int = 10) -> float:
+        """
+        Refine until the extrapolation error is below tol.
+
+        Calling again with a smaller tol or a larger max_iterations resumes from
+        the current level.
+
+        Parameters:
+        tol (float): Tolerance for convergence. Default is 1e-6.
+        max_iterations (int): Maximum number of levels of the table. Default is 10.
+
+        Returns:
+        float: Approximated integral of the function f from a to b.
+
+        Raises:
+        ValueError: If the number of iterations exceeds the maximum limit.
+        """
+        # Check for convergence, the current level may already be good enough
+        if self.error_history and self.error < tol:
+            return self.estimate
+        while self.level < max_iterations - 1:
+            self.refine()
+            if self.error < tol:
+                return self.estimate
+
+        # Raise an error if convergence not reached within max iterations
+        raise ValueError("Romberg integration did not converge within the maximum number of iterations")
+
+
 def romberg_integration(f: Callable[[float], float], a: float, b: float,
                         tol=1e-6, max_iterations: int = 10) -> float:
     """
@@ -23,28 +117,17 @@ def romberg_integration(f: Callable[[float], float], a: float, b: float,
     Notes:
     The function uses an adaptive approach, increasing the order of the Romberg table until
     the desired accuracy (tolerance) is achieved or the maximum number of iterations is reached.
+    Use RombergIntegrator directly to resume a computation that did not converge.
     """
+    return RombergIntegrator(f, a, b).integrate(tol, max_iterations)
 
-    # Initialize the Romberg table with zeros
-    R = np.zeros((max_iterations, max_iterations), dtype=float)
-
-    # First estimate with the Trapezoidal Rule (0th column of Romberg table)
-    R[0, 0] = (f(a) + f(b)) * (b - a) / 2
-
-    # Iterate to fill the Romberg table
-    for i in range(1, max_iterations):
-        # Trapezoidal Rule refinement
-        h = (b - a) / (2 ** i)
-        sum_f = np.sum(f(a + np.arange(1, 2 ** i, 2) * h))
-        R[i, 0] = R[i - 1, 0] / 2 + h * sum_f
-
-        # Richardson extrapolation
-        for j in range(1, i + 1):
-            R[i, j] = R[i, j - 1] + (R[i, j - 1] - R[i - 1, j - 1]) / (4 ** j - 1)
-
-        # Check for convergence
-        if i > 0 and abs(R[i, i] - R[i - 1, i - 1]) < tol:
-            return R[i, i]
 
-    # Raise an error if convergence not reached within max iterations
-    raise ValueError("Romberg integration did not converge within the maximum number of iterations")
\ No newline at end of file
+if __name__ == "__main__":
+    integrator = RombergIntegrator(np.exp, 0, 1)
+    try:
+        integrator.integrate(tol=1e-14, max_iterations=4)
+    except ValueError as error:
+        print(error)
+    # Resumes at level 3, only the new midpoints are evaluated
+    print(integrator.integrate(tol=1e-14, max_iterations=10) - (np.e - 1), integrator.evaluations)
+    print(integrator.error_history)
@@ -1,6 +1,18 @@
-from typing import Callable, Union
+from typing import Callable, Optional, Union
+import sys
+from pathlib import Path
+
 import numpy as np
 
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Integration_algorithms" / "integration_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from integration_utils import DEFAULT_CHUNK_POINTS, fixed_rule_batch
+
 
 def simpsons_one_third(f: Callable[[Union[float, np.ndarray]], Union[float, np.ndarray]],
                        lower_lim: float, upper_lim: float, n: int) -> float:
@@ -46,3 +58,46 @@ def simpsons_one_third(f: Callable[[Union[float, np.ndarray]], Union[float, np.n
     return h / 3 * integral  # Multiply by h/3
 
 
+def simpsons_one_third_batch(f: Callable[..., np.ndarray], lower_lims: np.ndarray, upper_lims: np.ndarray,
+                             n: int, params: Optional[np.ndarray] = None,
+                             chunk_points: int = DEFAULT_CHUNK_POINTS) -> np.ndarray:
+    """
+    Approximates many integrals with Simpson's 1/3 rule in vectorized calls of f.
+
+    Parameters
+    ----------
+    f : Callable[..., np.ndarray]
+        The function to integrate, called as f(x) or f(x, p1, ..., pk). x has shape
+        (rows, n + 1), one row of nodes per interval, and every parameter has shape
+        (rows, 1), so that plain NumPy expressions broadcast.
+    lower_lims : np.ndarray
+        The lower limits of integration, shape (m,).
+    upper_lims : np.ndarray
+        The upper limits of integration, shape (m,).
+    n : int
+        The number of sub-intervals used on every interval.
+    params : np.ndarray, optional
+        Parameters of shape (m,) or (m, k), one row per interval.
+    chunk_points : int, optional
+        Maximum number of nodes per call of f, which bounds memory. Defaults to 2^20.
+
+    Returns
+    -------
+    np.ndarray
+        The m approximate integrals.
+
+    Raises
+    ------
+    ValueError
+        If n is odd, a lower limit is not less than its upper limit or the shapes do not match.
+    """
+    if n % 2 != 0 or n <= 0:
+        raise ValueError("n (Number of sub-intervals) must be even")
+    # Unit nodes and the 1, 4, 2, ..., 4, 1 weights on [0, 1], shared by every interval
+    nodes = np.linspace(0.0, 1.0, n + 1)
+    weights = np.full(n + 1, 2.0)
+    weights[1::2] = 4
+    weights[[0, -1]] = 1
+    weights /= 3 * n
+
+    return fixed_rule_batch(f, lower_lims, upper_lims, nodes, weights, params, chunk_points)
@@ -1,6 +1,18 @@
-from typing import Callable, Union
+from typing import Callable, Optional, Union
+import sys
+from pathlib import Path
+
 import numpy as np
 
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Integration_algorithms" / "integration_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from integration_utils import DEFAULT_CHUNK_POINTS, fixed_rule_batch
+
 
 def trapezoidal_integration(f: Callable[[Union[np.ndarray, float]], Union[np.ndarray, float]],
                             lower_lim: float, upper_lim: float, divisions: int) -> float:
@@ -27,3 +39,34 @@ def trapezoidal_integration(f: Callable[[Union[np.ndarray, float]], Union[np.nda
 
     return integral * h
 
+
+def trapezoidal_integration_batch(f: Callable[..., np.ndarray], lower_lims: np.ndarray, upper_lims: np.ndarray,
+                                  divisions: int, params: Optional[np.ndarray] = None,
+                                  chunk_points: int = DEFAULT_CHUNK_POINTS) -> np.ndarray:
+    """
+    Perform trapezoidal integration over many intervals in vectorized calls of f
+    Args:
+        f (Callable[..., np.ndarray]): Function to be integrated. It is called as f(x) or f(x, p1, ..., pk)
+            with x of shape (rows, divisions + 1), one row of nodes per interval, and every
+            parameter of shape (rows, 1), so that plain NumPy expressions broadcast.
+        lower_lims (np.ndarray): Lower limits of integration, shape (m,).
+        upper_lims (np.ndarray): Upper limits of integration, shape (m,).
+        divisions (int): Number of divisions used on every interval.
+        params (np.ndarray, optional): Parameters of shape (m,) or (m, k), one row per interval.
+        chunk_points (int, optional): Maximum number of nodes per call of f, which bounds memory.
+            Defaults to 2^20.
+    Returns:
+        np.ndarray: The m integrals.
+    Raises:
+        ValueError: If divisions is not a positive integer, if an upper limit is not greater than
+            its lower limit or if the shapes do not match.
+    """
+    if divisions <= 0:
+        raise ValueError("Number of divisions must be a positive integer.")
+    # Unit nodes and weights on [0, 1], shared by every interval
+    nodes = np.linspace(0.0, 1.0, divisions + 1)
+    weights = np.full(divisions + 1, 1.0 / divisions)
+    weights[[0, -1]] /= 2
+
+    return fixed_rule_batch(f, lower_lims, upper_lims, nodes, weights, params, chunk_points)
+
@@ -0,0 +1,54 @@
+from typing import Callable, Optional
+import numpy as np
+
+# Upper bound on the number of nodes evaluated per call of f by the batched rules
+DEFAULT_CHUNK_POINTS: int = 1 << 20
+
+
+def fixed_rule_batch(f: Callable[..., np.ndarray], lower_lims: np.ndarray, upper_lims: np.ndarray,
+                     nodes: np.ndarray, weights: np.ndarray, params: Optional[np.ndarray] = None,
+                     chunk_points: int = DEFAULT_CHUNK_POINTS) -> np.ndarray:
+    """
+    Apply one fixed quadrature rule to many intervals in vectorized calls of f.
+    Args:
+        f (Callable[..., np.ndarray]): Function to be integrated. It is called as f(x) or f(x, p1, ..., pk)
+            with x of shape (rows, len(nodes)), one row of nodes per interval, and every
+            parameter of shape (rows, 1), so that plain NumPy expressions broadcast.
+        lower_lims (np.ndarray): Lower limits of integration, shape (m,).
+        upper_lims (np.ndarray): Upper limits of integration, shape (m,).
+        nodes (np.ndarray): Nodes of the rule on [0, 1].
+        weights (np.ndarray): Weights of the rule on [0, 1], scaled by the width of every interval.
+        params (np.ndarray, optional): Parameters of shape (m,) or (m, k), one row per interval.
+        chunk_points (int, optional): Maximum number of nodes per call of f, which bounds memory.
+            Defaults to 2^20.
+    Returns:
+        np.ndarray: The m integrals.
+    Raises:
+        ValueError: If an upper limit is not greater than its lower limit or if the shapes do not match.
+    """
+    lower_lims, upper_lims = np.broadcast_arrays(np.asarray(lower_lims, dtype=float),
+                                                 np.asarray(upper_lims, dtype=float))
+    if lower_lims.ndim != 1:
+        raise ValueError("The limits must be 1-D arrays.")
+    if np.any(upper_lims <= lower_lims):
+        raise ValueError("Upper limit must be greater than lower limit.")
+    if params is None:
+        columns = ()
+    else:
+        params = np.asarray(params)
+        if params.ndim == 1:
+            params = params[:, None]
+        if params.ndim != 2 or params.shape[0] != lower_lims.shape[0]:
+            raise ValueError("params must have shape (m,) or (m, k) with one row per interval.")
+        columns = tuple(params.T)
+
+    m, n_nodes = lower_lims.shape[0], nodes.shape[0]
+    widths = upper_lims - lower_lims
+    rows = max(1, chunk_points // n_nodes)
+    integrals = np.empty(m)
+    for start in range(0, m, rows):
+        stop = min(start + rows, m)
+        width = widths[start:stop, None]
+        values = f(lower_lims[start:stop, None] + width * nodes, *(column[start:stop, None] for column in columns))
+        integrals[start:stop] = np.broadcast_to(values, (stop - start, n_nodes)) @ weights * widths[start:stop]
+    return integrals
@@ -1,4 +1,6 @@
-from typing import List, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
+from collections import deque
+import numpy as np
 
 
 def newton_forward_interpolation(x: List[Union[int, float]], y: List[Union[int, float]],
@@ -34,10 +36,11 @@ def newton_forward_interpolation(x: List[Union[int, float]], y: List[Union[int,
     # Loop over the differences
     for i in range(1, len(x)):
         # Update the polynomial
-        # Note that the coefficients are overwritten
-        for j in range(len(x) - i):
+        # Note that the coefficients are overwritten from the end, so that
+        # coefficients[j] ends up as the divided difference f[x_0, ..., x_j]
+        for j in range(len(x) - 1, i - 1, -1):
             # Compute the jth coefficient
-            coefficients[j] = (coefficients[j + 1] - coefficients[j]) / (i * h)
+            coefficients[j] = (coefficients[j] - coefficients[j - 1]) / (i * h)
 
     # Evaluate the polynomial at t
     result = coefficients[0]
@@ -46,3 +49,164 @@ def newton_forward_interpolation(x: List[Union[int, float]], y: List[Union[int,
         cumulative_product *= (target - x[i - 1])  # Update the product term
         result += coefficients[i] * cumulative_product  # Update the result
     return result, coefficients
+
+
+class NewtonForwardInterpolator:
+    """
+    Newton forward-difference interpolation on equally spaced points, fitted once.
+
+    The polynomial is stored through the top edge of the difference table,
+    d_k = Δ^k y_0, and evaluated in s = (t - x_0) / h with the nested form
+        p = d_0 + s (d_1 + (s - 1) / 2 (d_2 + (s - 2) / 3 (... + (s - n + 1) / n d_n))),
+    so every target costs n multiplications and arrays of targets are evaluated at once.
+    The bottom edge of the table, Δ^k y_{n-k}, is kept as well, which lets append add
+    a sample in O(n). With a window, the oldest sample is dropped as a new one arrives,
+    which suits streams of equally spaced sensor readings. The window keeps its raw
+    samples and rebuilds the table from them on every drop, O(window^2): updating
+    the top edge in place would compound the rounding errors of every step.
+    Args:
+        x: The x-coordinates of the points, equally spaced and increasing.
+        y: The y-coordinates of the points.
+        window: Maximum number of samples kept by append, or None to keep all of them.
+    Raises:
+        ValueError: If the points are not equally spaced or the lengths do not match.
+    """
+
+    def __init__(self, x: Sequence[float], y: Sequence[float], window: Optional[int] = None) -> None:
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.ndim != 1 or x.shape != y.shape or x.shape[0] < 2:
+            raise ValueError("The arrays x and y must have the same length, at least 2.")
+        spacing = np.diff(x)
+        h = (x[-1] - x[0]) / (x.shape[0] - 1)
+        if h <= 0 or not np.allclose(spacing, h, rtol=1e-9, atol=0):
+            raise ValueError("The points must be equally spaced.")
+        if window is not None and window < 2:
+            raise ValueError("The window must hold at least 2 samples.")
+        self.h = float(h)
+        self.window = window
+        self._start = float(x[0])
+        self._dropped = 0  # Samples dropped by the window, x_0 = start + dropped * h
+        if window is not None and y.shape[0] > window:
+            self._dropped = y.shape[0] - window
+            y = y[-window:]
+        self._samples = deque(y, maxlen=window) if window is not None else None
+        self._top, self._bottom = self._difference_edges(y)
+
+    @staticmethod
+    def _difference_edges(y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ Top (Δ^k y_0) and bottom (Δ^k y_{n-k}) edges of the difference table,
+        one vectorized difference per order."""
+        top = np.empty(y.shape[0])
+        bottom = np.empty(y.shape[0])
+        differences = y
+        for k in range(y.shape[0]):
+            top[k] = differences[0]
+            bottom[k] = differences[-1]
+            differences = np.diff(differences)
+        return top, bottom
+
+    def __len__(self) -> int:
+        return self._top.shape[0]
+
+    @property
+    def x0(self) -> float:
+        """ The x-coordinate of the oldest sample."""
+        return self._start + self._dropped * self.h
+
+    @property
+    def x(self) -> np.ndarray:
+        """ The x-coordinates of the samples currently interpolated."""
+        return self.x0 + self.h * np.arange(len(self))
+
+    @property
+    def differences(self) -> np.ndarray:
+        """ The forward differences Δ^k y_0, k = 0, ..., n."""
+        return self._top.copy()
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        """ The Newton coefficients f[x_0, ..., x_k] = Δ^k y_0 / (k! h^k),
+        as returned by newton_forward_interpolation."""
+        k = np.arange(len(self))
+        scale = np.cumprod(np.concatenate(([1.0], k[1:] * self.h)))
+        return self._top / scale
+
+    def append(self, y_new: float) -> None:
+        """
+        Add the sample y_new at x_n + h in O(n), without recomputing the table.
+        In sliding-window mode the oldest sample is dropped once the window is full,
+        and the table is rebuilt from the retained samples in O(window^2).
+        Args:
+            y_new: The new y-coordinate.
+        """
+        n = len(self)
+        if self.window is not None:
+            self._samples.append(float(y_new))
+            if n + 1 > self.window:
+                # Rebuild the table from the samples kept in the window
+                self._dropped += 1
+                self._top, self._bottom = self._difference_edges(np.array(self._samples))
+                return
+        bottom = np.empty(n + 1)
+        # New bottom edge: Δ^k y_{n+1-k} = Δ^{k-1} y_{n+2-k} - Δ^{k-1} y_{n+1-k}
+        bottom[0] = y_new
+        bottom[1:] = y_new - np.cumsum(self._bottom)
+        top = np.empty(n + 1)
+        top[:n] = self._top
+        top[n] = bottom[n]
+        self._top, self._bottom = top, bottom
+
+    def extend(self, y_new: Sequence[float]) -> None:
+        """ Append several samples in order."""
+        for value in np.asarray(y_new, dtype=float).reshape(-1):
+            self.append(value)
+
+    def evaluate(self, target: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Evaluate the interpolating polynomial at any number of targets.
+        Targets outside [x_0, x_n] are extrapolated.
+        Args:
+            target: A point or an array of points.
+        Returns:
+            The values, with the shape of target.
+        """
+        s = (np.asarray(target, dtype=float) - self.x0) / self.h
+        n = len(self) - 1
+        result = np.full(s.shape, self._top[n])
+        for k in range(n - 1, -1, -1):
+            result *= (s - k) / (k + 1)
+            result += self._top[k]
+        return float(result) if result.ndim == 0 else result
+
+    __call__ = evaluate
+
+
+if __name__ == "__main__":
+    x = [0.0, 0.5, 1.0, 1.5, 2.0]
+    y = [float(t ** 3 - t) for t in x]
+    print(newton_forward_interpolation(x, y, 1.2))
+    # The cubic is reproduced exactly and its divided differences are f[x_0, ..., x_k]
+    value, divided_differences = newton_forward_interpolation(x, y, 1.2)
+    assert abs(value - (1.2 ** 3 - 1.2)) < 1e-12
+    assert np.allclose(divided_differences, [0.0, -0.75, 1.5, 1.0, 0.0])
+
+    interpolator = NewtonForwardInterpolator(x, y)
+    print(interpolator(1.2), interpolator.coefficients)
+    print(interpolator(np.linspace(0, 2, 5)))
+
+    # Streaming: keep the last 4 samples of a sensor and predict the next one
+    stream = NewtonForwardInterpolator([0.0, 0.1, 0.2, 0.3], np.sin([0.0, 0.1, 0.2, 0.3]), window=4)
+    for step in range(4, 10):
+        t = 0.1 * step
+        print(f"t = {t:.1f}: predicted {stream(t):.6f}, measured {np.sin(t):.6f}")
+        stream.append(np.sin(t))
+
+    # A long stream stays as accurate as a fresh fit on the same window
+    h = 2.0 ** -7  # Exactly representable, so newton_forward_interpolation sees equal spacing
+    stream = NewtonForwardInterpolator(h * np.arange(8), np.sin(h * np.arange(8)), window=8)
+    for step in range(8, 20_008):
+        stream.append(np.sin(h * step))
+    target = stream.x0 + 3.5 * h
+    reference, _ = newton_forward_interpolation(list(stream.x), list(np.sin(stream.x)), target)
+    assert abs(stream(target) - reference) < 1e-12 and abs(stream(target) - np.sin(target)) < 1e-12
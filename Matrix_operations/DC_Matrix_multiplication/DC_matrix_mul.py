@@ -1,55 +1,47 @@
 from typing import List, Union
-from copy import deepcopy as deep
+import sys
+from pathlib import Path
 
-# First we need to define a function that adds two matrices together.
-def matrix_add(matrix1 : List[List[Union[int, float]]], matrix2 : List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
-    """ Multiplies two matrices together.
-    Args:
-        matrix1 (List[List[Union[int, float]]]): The first matrix.
-        matrix2 (List[List[Union[int, float]]]): The second matrix.
-    Returns:
-        List[List[Union[int, float]]]: The sum of the two matrices.
-    Raises:
-        ValueError: If the dimensions of the two matrices are not equal.
-        ValueError: If the first matrix is not a rectangular matrix.
-        ValueError: If the second matrix is not a rectangular matrix."""
-    
-    m1_rows, m1_cols = len(matrix1), len(matrix1[0])
-    m2_rows, m2_cols = len(matrix2), len(matrix2[0])
+current_dir = Path().resolve()
+subdir_add = current_dir / "Matrix_operations" / "matrix_addition"
+subdir_mul = current_dir / "Matrix_operations" / "matrix_multiplication"
+subdir_type = current_dir / "Matrix_operations" / "matrix_type"
 
-    if m1_rows != m2_rows or m1_cols != m2_cols:
-        raise ValueError("The dimensions of the two matrices must be equal.")
-    
-    for row in matrix1:
-        if len(row) != m1_cols:
-            raise ValueError("The first matrix must be a rectangular matrix.")
-        
-    for row in matrix2:
-        if len(row) != m2_cols:
-            raise ValueError("The second matrix must be a rectangular matrix.")
+# Add subfolders to sys.path
+for subdir in (subdir_add, subdir_mul, subdir_type):
+    if str(subdir) not in sys.path:
+        sys.path.append(str(subdir))
 
-    result = deep(matrix1)
-    for row in range(m1_rows):
-        for col in range(m1_cols):
-            result[row][col] += matrix2[row][col]
-    return result
+# matrix_add is re-exported from here for backwards compatibility
+from matrix_addition import matrix_add
+from matrix_multiplication import matrix_multiply
+from matrix_type import Matrix
 
+MatrixLike = Union[List[List[Union[int, float]]], Matrix]
 
 # Now we can define the divide and conquer matrix multiplication function.
-def DC_matrix_mul(matrix1: List[List[Union[int, float]]], matrix2: List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
+def DC_matrix_mul(matrix1: MatrixLike, matrix2: MatrixLike,
+                  crossover: int = 16) -> MatrixLike:
     """ Multiply matrices using the divide and conquer method. 
     Works for matrices of size 2^n x 2^n.
     Args:
-        matrix1 (List[List[Union[int, float]]]): The first matrix.
-        matrix2 (List[List[Union[int, float]]]): The second matrix.
+        matrix1 (MatrixLike): The first matrix, a nested list or a Matrix.
+        matrix2 (MatrixLike): The second matrix, a nested list or a Matrix.
+        crossover (int, optional): Size at or below which the classical product is
+            used instead of recursing further. Defaults to 16.
     Returns:
-        List[List[Union[int, float]]]: The product of the two matrices.
+        MatrixLike: The product of the two matrices, a Matrix if either input is one.
     Raises:
         ValueError: If the dimensions of the two matrices are not equal.
         ValueError: If the first matrix is not a rectangular matrix.
         ValueError: If the second matrix is not a rectangular matrix."""
-    m1_rows, m1_cols = len(matrix1), len(matrix1[0])
-    m2_rows, m2_cols = len(matrix2), len(matrix2[0])
+    is_matrix = isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix)
+    if is_matrix:
+        matrix1, matrix2 = Matrix.asmatrix(matrix1), Matrix.asmatrix(matrix2)
+        (m1_rows, m1_cols), (m2_rows, m2_cols) = matrix1.shape, matrix2.shape
+    else:
+        m1_rows, m1_cols = len(matrix1), len(matrix1[0])
+        m2_rows, m2_cols = len(matrix2), len(matrix2[0])
 
     # Check if the matrices have shapes which are a power of 2.
     def is_power_of_2(n):
@@ -62,11 +54,19 @@ def DC_matrix_mul(matrix1: List[List[Union[int, float]]], matrix2: List[List[Uni
     
     # Base case
     if m1_rows == 1:
+        if is_matrix:
+            return Matrix([[matrix1[0, 0] * matrix2[0, 0]]])
         return [[matrix1[0][0] * matrix2[0][0]]]
+    if m1_rows <= crossover:
+        return matrix_multiply(matrix1, matrix2, backend="ikj")
     
     # Split matrices into quarters
     def split(X):
-        """ Split matrix into quarters."""
+        """ Split matrix into quarters. A Matrix is split into views, without copying."""
+        if is_matrix:
+            half = len(X) // 2
+            return [X.submatrix(0, half, 0, half), X.submatrix(0, half, half, 2 * half),
+                    X.submatrix(half, 2 * half, 0, half), X.submatrix(half, 2 * half, half, 2 * half)]
         return [
             [X[i][:len(X)//2] for i in range(len(X)//2)],
             [X[i][len(X)//2:] for i in range(len(X)//2)],
@@ -78,12 +78,25 @@ def DC_matrix_mul(matrix1: List[List[Union[int, float]]], matrix2: List[List[Uni
     b11, b12, b21, b22 = split(matrix2)
 
     # Recursive calls for submatrices
-    c11 = matrix_add(DC_matrix_mul(a11, b11), DC_matrix_mul(a12, b21))
-    c12 = matrix_add(DC_matrix_mul(a11, b12), DC_matrix_mul(a12, b22))
-    c21 = matrix_add(DC_matrix_mul(a21, b11), DC_matrix_mul(a22, b21))
-    c22 = matrix_add(DC_matrix_mul(a21, b12), DC_matrix_mul(a22, b22))
+    # Accumulate the second product into the first one in place
+    c11 = DC_matrix_mul(a11, b11, crossover)
+    matrix_add(c11, DC_matrix_mul(a12, b21, crossover), out=c11)
+    c12 = DC_matrix_mul(a11, b12, crossover)
+    matrix_add(c12, DC_matrix_mul(a12, b22, crossover), out=c12)
+    c21 = DC_matrix_mul(a21, b11, crossover)
+    matrix_add(c21, DC_matrix_mul(a22, b21, crossover), out=c21)
+    c22 = DC_matrix_mul(a21, b12, crossover)
+    matrix_add(c22, DC_matrix_mul(a22, b22, crossover), out=c22)
 
     # Combine subproducts
+    if is_matrix:
+        half = m1_rows // 2
+        result = Matrix.zeros(m1_rows, m1_rows)
+        result.submatrix(0, half, 0, half).assign(c11)
+        result.submatrix(0, half, half, m1_rows).assign(c12)
+        result.submatrix(half, m1_rows, 0, half).assign(c21)
+        result.submatrix(half, m1_rows, half, m1_rows).assign(c22)
+        return result
     top = [c11[i] + c12[i] for i in range(len(c11))]
     bottom = [c21[i] + c22[i] for i in range(len(c21))]
     # each row in top and bottom is a list, so we need to add them together
@@ -1,11 +1,20 @@
-from typing import List, Union
+from typing import Dict, List, Tuple, Union
 from copy import deepcopy as deep
 import sys
+import time
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by the hybrid kernel
+    np = None
+
 current_dir = Path().resolve()
 subdir_add = current_dir / "Matrix_operations" / "matrix_addition"
 subdir_sub = current_dir / "Matrix_operations" / "matrix_subtraction"
+subdir_mul = current_dir / "Matrix_operations" / "matrix_multiplication"
+subdir_comb = current_dir / "Matrix_operations" / "linear_combination"
+subdir_type = current_dir / "Matrix_operations" / "matrix_type"
 
 # Add subfolder to sys.path
 if str(subdir_add) not in sys.path:
@@ -14,25 +23,50 @@ if str(subdir_add) not in sys.path:
 if str(subdir_sub) not in sys.path:
     sys.path.append(str(subdir_sub))
 
+if str(subdir_mul) not in sys.path:
+    sys.path.append(str(subdir_mul))
+
+if str(subdir_comb) not in sys.path:
+    sys.path.append(str(subdir_comb))
+
+if str(subdir_type) not in sys.path:
+    sys.path.append(str(subdir_type))
+
 # Import modules from matrix subfolders
 from matrix_addition import matrix_add
 from matrix_subtraction import matrix_subtract
+from matrix_multiplication import _all_floats, matrix_multiply
+from linear_combination import combine
+from matrix_type import Matrix
 
+MatrixLike = Union[List[List[Union[int, float]]], Matrix]
 
-def Strassen_multiply(matrix1: List[List[Union[int, float]]], matrix2: List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
+# Default size at or below which the recursion hands over to a classical kernel
+DEFAULT_CROSSOVER: int = 512
+
+
+def Strassen_multiply(matrix1: MatrixLike, matrix2: MatrixLike,
+                      crossover: int = 16) -> MatrixLike:
     """ Multiply matrices using the divide and conquer method. 
     Works for matrices of size 2^n x 2^n.
     Args:
-        matrix1 (List[List[Union[int, float]]]): The first matrix.
-        matrix2 (List[List[Union[int, float]]]): The second matrix.
+        matrix1 (MatrixLike): The first matrix, a nested list or a Matrix.
+        matrix2 (MatrixLike): The second matrix, a nested list or a Matrix.
+        crossover (int, optional): Size at or below which the classical product is
+            used instead of recursing further. Defaults to 16.
     Returns:
-        List[List[Union[int, float]]]: The product of the two matrices.
+        MatrixLike: The product of the two matrices, a Matrix if either input is one.
     Raises:
         ValueError: If the dimensions of the two matrices are not equal.
         ValueError: If the first matrix is not a rectangular matrix.
         ValueError: If the second matrix is not a rectangular matrix."""
-    m1_rows, m1_cols = len(matrix1), len(matrix1[0])
-    m2_rows, m2_cols = len(matrix2), len(matrix2[0])
+    is_matrix = isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix)
+    if is_matrix:
+        matrix1, matrix2 = Matrix.asmatrix(matrix1), Matrix.asmatrix(matrix2)
+        (m1_rows, m1_cols), (m2_rows, m2_cols) = matrix1.shape, matrix2.shape
+    else:
+        m1_rows, m1_cols = len(matrix1), len(matrix1[0])
+        m2_rows, m2_cols = len(matrix2), len(matrix2[0])
 
     # Check if the matrices have shapes which are a power of 2.
     def is_power_of_2(n):
@@ -45,11 +79,19 @@ def Strassen_multiply(matrix1: List[List[Union[int, float]]], matrix2: List[List
     
     # Base case
     if m1_rows == 1:
+        if is_matrix:
+            return Matrix([[matrix1[0, 0] * matrix2[0, 0]]])
         return [[matrix1[0][0] * matrix2[0][0]]]
+    if m1_rows <= crossover:
+        return matrix_multiply(matrix1, matrix2, backend="ikj")
     
     # Split matrices into quarters
     def split(X):
-        """ Split matrix into quarters."""
+        """ Split matrix into quarters. A Matrix is split into views, without copying."""
+        if is_matrix:
+            half = len(X) // 2
+            return [X.submatrix(0, half, 0, half), X.submatrix(0, half, half, 2 * half),
+                    X.submatrix(half, 2 * half, 0, half), X.submatrix(half, 2 * half, half, 2 * half)]
         return [
             [X[i][:len(X)//2] for i in range(len(X)//2)],
             [X[i][len(X)//2:] for i in range(len(X)//2)],
@@ -60,28 +102,210 @@ def Strassen_multiply(matrix1: List[List[Union[int, float]]], matrix2: List[List
     a11, a12, a21, a22 = split(matrix1)
     b11, b12, b21, b22 = split(matrix2)
 
-    P = Strassen_multiply(matrix_add(a11, a22), matrix_add(b11, b22))
-    Q = Strassen_multiply(matrix_add(a21, a22), b11)
-    R = Strassen_multiply(a11, matrix_subtract(b12, b22))
-    S = Strassen_multiply(a22, matrix_subtract(b21, b11))
-    T = Strassen_multiply(matrix_add(a11, a12), b22)
-    U = Strassen_multiply(matrix_subtract(a21, a11), matrix_add(b11, b12))
-    V = Strassen_multiply(matrix_subtract(a12, a22), matrix_add(b21, b22))
+    P = Strassen_multiply(matrix_add(a11, a22), matrix_add(b11, b22), crossover)
+    Q = Strassen_multiply(matrix_add(a21, a22), b11, crossover)
+    R = Strassen_multiply(a11, matrix_subtract(b12, b22), crossover)
+    S = Strassen_multiply(a22, matrix_subtract(b21, b11), crossover)
+    T = Strassen_multiply(matrix_add(a11, a12), b22, crossover)
+    U = Strassen_multiply(matrix_subtract(a21, a11), matrix_add(b11, b12), crossover)
+    V = Strassen_multiply(matrix_subtract(a12, a22), matrix_add(b21, b22), crossover)
 
-    # Combine submatrices into 4 quadrants of the result matrix
-    C11 = matrix_add(matrix_subtract(matrix_add(P, S), T), V)
-    C12 = matrix_add(R, T)
-    C21 = matrix_add(Q, S)
-    C22 = matrix_add(matrix_subtract(matrix_add(P, R), Q), U)
+    # Combine submatrices into 4 quadrants of the result matrix.
+    # Each quadrant is one fused pass, written over a product that is no longer needed.
+    C11 = combine([(1, P), (1, S), (-1, T), (1, V)])
+    C22 = combine([(1, P), (1, R), (-1, Q), (1, U)], out=U)
+    C12 = matrix_add(R, T, out=R)
+    C21 = matrix_add(Q, S, out=Q)
 
     # Combine submatrices into one result matrix
+    if is_matrix:
+        half = m1_rows // 2
+        result = Matrix.zeros(m1_rows, m1_rows)
+        result.submatrix(0, half, 0, half).assign(C11)
+        result.submatrix(0, half, half, m1_rows).assign(C12)
+        result.submatrix(half, m1_rows, 0, half).assign(C21)
+        result.submatrix(half, m1_rows, half, m1_rows).assign(C22)
+        return result
     top = [C11[i] + C12[i] for i in range(len(C11))]
     bottom = [C21[i] + C22[i] for i in range(len(C21))]
     return top + bottom
 
 
+def _allocate_workspaces(m: int, k: int, n: int, crossover: int, dtype) -> List[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]]:
+    """ Preallocate the scratch buffers used by every recursion level.
+    All seven products of one level have the same shape and are computed one
+    after another, so a single (S, T, P) triple per level is enough.
+    Args:
+        m, k, n (int): The product is (m x k) @ (k x n).
+        crossover (int): Size at or below which the classical kernel is used.
+        dtype: The dtype of the buffers.
+    Returns:
+        List[Tuple[np.ndarray, np.ndarray, np.ndarray]]: One (S, T, P) triple per level."""
+    workspaces = []
+    while min(m, k, n) > crossover:
+        m, k, n = m // 2, k // 2, n // 2  # Odd rows/columns are peeled off
+        workspaces.append((np.empty((m, k), dtype=dtype), np.empty((k, n), dtype=dtype),
+                           np.empty((m, n), dtype=dtype)))
+    return workspaces
+
+
+def _winograd_into(A: "np.ndarray", B: "np.ndarray", C: "np.ndarray", crossover: int,
+                   workspaces: List[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]], level: int = 0) -> None:
+    """ Compute C = A @ B with the Strassen-Winograd recursion (7 products, 15 additions).
+    A, B and C may be arbitrary strided views. Odd trailing rows and columns are
+    peeled off and handled with a classical update, so any shape is accepted.
+    Args:
+        A (np.ndarray): Left operand of shape (m, k).
+        B (np.ndarray): Right operand of shape (k, n).
+        C (np.ndarray): Output view of shape (m, n), overwritten.
+        crossover (int): Size at or below which the classical kernel is used.
+        workspaces (List): Scratch buffers from _allocate_workspaces.
+        level (int): Current recursion depth, selects the scratch buffers."""
+    m, k = A.shape
+    n = B.shape[1]
+    if min(m, k, n) <= crossover:
+        np.matmul(A, B, out=C)  # Blocked classical (BLAS) kernel
+        return
+
+    # Split off the largest even core, the peeled edges are fixed up afterwards
+    m2, k2, n2 = m // 2, k // 2, n // 2
+    me, ke, ne = 2 * m2, 2 * k2, 2 * n2
+    S, T, P = workspaces[level]
+
+    # Quadrant views, no data is copied
+    A11, A12, A21, A22 = A[:m2, :k2], A[:m2, k2:ke], A[m2:me, :k2], A[m2:me, k2:ke]
+    B11, B12, B21, B22 = B[:k2, :n2], B[:k2, n2:ne], B[k2:ke, :n2], B[k2:ke, n2:ne]
+    C11, C12, C21, C22 = C[:m2, :n2], C[:m2, n2:ne], C[m2:me, :n2], C[m2:me, n2:ne]
+
+    def product(X, Y, out):
+        _winograd_into(X, Y, out, crossover, workspaces, level + 1)
+
+    np.add(A21, A22, out=S)         # S1
+    np.subtract(B12, B11, out=T)    # T1
+    product(S, T, C22)              # C22 = M5
+    np.subtract(S, A11, out=S)      # S2
+    np.subtract(B22, T, out=T)      # T2
+    product(S, T, C12)              # C12 = M6
+    product(A11, B11, P)            # P = M1
+    C12 += P                        # C12 = U2 = M1 + M6
+    product(A12, B21, C11)          # C11 = M2
+    C11 += P                        # C11 = M1 + M2 (final)
+    np.subtract(A12, S, out=S)      # S4
+    product(S, B22, P)              # P = M3
+    np.subtract(T, B21, out=T)      # T4
+    product(A22, T, C21)            # C21 = M4
+    C22 += C12                      # C22 = U2 + M5
+    np.subtract(C12, C21, out=C21)  # C21 = U2 - M4
+    np.add(P, C22, out=C12)         # C12 = U2 + M5 + M3 (final)
+    np.subtract(A11, A21, out=S)    # S3
+    np.subtract(B22, B12, out=T)    # T3
+    product(S, T, P)                # P = M7
+    C21 += P                        # C21 = U2 + M7 - M4 (final)
+    C22 += P                        # C22 = U2 + M7 + M5 (final)
+
+    # Peeling: add the contribution of the odd inner index to the core,
+    # one quadrant at a time so that P can be reused as the temporary.
+    if ke < k:
+        a_col, b_row = A[:, ke:], B[ke:, :]
+        for rows in (slice(0, m2), slice(m2, me)):
+            for cols in (slice(0, n2), slice(n2, ne)):
+                np.multiply(a_col[rows], b_row[:, cols], out=P)
+                C[rows, cols] += P
+    # Odd last row and column are plain matrix-vector products
+    if ne < n:
+        np.matmul(A[:me], B[:, ne:], out=C[:me, ne:])
+    if me < m:
+        np.matmul(A[me:], B, out=C[me:])
+
+
+def hybrid_strassen_multiply(matrix1: Union[List[List[Union[int, float]]], "np.ndarray"],
+                             matrix2: Union[List[List[Union[int, float]]], "np.ndarray"],
+                             crossover: int = DEFAULT_CROSSOVER) -> Union[List[List[Union[int, float]]], "np.ndarray"]:
+    """ Multiply matrices with the Strassen-Winograd algorithm, switching to the
+    classical kernel once a subproblem is at most crossover in any dimension.
+    Unlike Strassen_multiply, any rectangular shapes are accepted: odd rows and
+    columns are peeled off at every level. Quadrants are views into the operands
+    and all temporaries live in scratch buffers allocated once up front.
+    Args:
+        matrix1 (List[List[Union[int, float]]] or np.ndarray): The first matrix.
+        matrix2 (List[List[Union[int, float]]] or np.ndarray): The second matrix.
+        crossover (int, optional): Size at or below which the classical product
+            is used. Defaults to DEFAULT_CROSSOVER, see benchmark_crossover.
+    Returns:
+        List[List[Union[int, float]]] or np.ndarray: The product of the two matrices.
+            An ndarray is returned if either input is an ndarray. Lists holding
+            anything but floats are multiplied with Python numbers (object dtype),
+            so integer products never overflow.
+    Raises:
+        ValueError: If the number of columns in the first matrix is not equal to the number of rows in the second matrix.
+        ValueError: If either matrix is not a rectangular matrix.
+        ValueError: If crossover is smaller than 1.
+        ImportError: If NumPy is not installed."""
+    if np is None:
+        raise ImportError("hybrid_strassen_multiply requires NumPy.")
+    if crossover < 1:
+        raise ValueError("The crossover must be a positive integer.")
+    is_array = isinstance(matrix1, np.ndarray) or isinstance(matrix2, np.ndarray)
+    try:
+        A, B = np.asarray(matrix1), np.asarray(matrix2)
+    except ValueError:  # Ragged nested lists
+        raise ValueError("Both matrices must be rectangular matrices.")
+    if A.ndim != 2:
+        raise ValueError("The first matrix must be a rectangular matrix.")
+    if B.ndim != 2:
+        raise ValueError("The second matrix must be a rectangular matrix.")
+    if A.shape[1] != B.shape[0]:
+        raise ValueError("The number of columns in the first matrix must be equal to the number of rows in the second matrix.")
+
+    if is_array or (_all_floats(matrix1) and _all_floats(matrix2)):
+        dtype = np.result_type(A, B)
+    else:  # Keep Python ints exact instead of letting int64 overflow
+        dtype = object
+    A, B = A.astype(dtype, copy=False), B.astype(dtype, copy=False)
+    C = np.empty((A.shape[0], B.shape[1]), dtype=dtype)
+    workspaces = _allocate_workspaces(A.shape[0], A.shape[1], B.shape[1], crossover, dtype)
+    _winograd_into(A, B, C, crossover, workspaces)
+    return C if is_array else C.tolist()
+
+
+def benchmark_crossover(size: int = 512, candidates: Tuple[int, ...] = (16, 32, 64, 128, 256),
+                        repeats: int = 3, seed: int = 0) -> Tuple[int, Dict[int, float]]:
+    """ Time hybrid_strassen_multiply on this machine for several crossover values.
+    A candidate of at least size means no Strassen level at all, so the classical
+    kernel is always part of the comparison.
+    Args:
+        size (int, optional): Edge length of the random square operands. Defaults to 512.
+        candidates (Tuple[int, ...], optional): Crossover values to try.
+        repeats (int, optional): Best-of repeats per candidate. Defaults to 3.
+        seed (int, optional): Seed for the random operands. Defaults to 0.
+    Returns:
+        Tuple[int, Dict[int, float]]: The fastest crossover and the best time in seconds for each candidate."""
+    rng = np.random.default_rng(seed)
+    A, B = rng.standard_normal((size, size)), rng.standard_normal((size, size))
+    timings = {}
+    for crossover in sorted(set(candidates) | {size}):
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            hybrid_strassen_multiply(A, B, crossover=crossover)
+            best = min(best, time.perf_counter() - start)
+        timings[crossover] = best
+    return min(timings, key=timings.get), timings
+
+
 if __name__ == "__main__":
     matrix1 = [[1, 2, 3, 4], [5, 6, 7, 8], [1, 2, 3, 4], [5, 6, 7, 8]]
     matrix2 = [[1, 2, 3, 4], [5, 6, 7, 8], [1, 2, 3, 4], [5, 6, 7, 8]]
 
-    print(Strassen_multiply(matrix1, matrix2))
\ No newline at end of file
+    print(Strassen_multiply(matrix1, matrix2))
+
+    # Python ints stay exact: NumPy's int64 would overflow on this product
+    big = [[2 ** 40] * 40 for _ in range(40)]
+    assert hybrid_strassen_multiply(big, big, crossover=8)[0][0] == 40 * 2 ** 80
+    assert hybrid_strassen_multiply(matrix1, matrix2) == matrix_multiply(matrix1, matrix2)
+
+    if np is not None:
+        best, timings = benchmark_crossover()
+        for crossover, seconds in timings.items():
+            print(f"crossover {crossover:>4}: {seconds:.4f} s")
+        print(f"Best crossover on this machine: {best}")
@@ -1,25 +1,184 @@
-from typing import List, Union
+from typing import List, Tuple, Union
+from array import array
+from functools import reduce
+import sys
+from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the loops below work without it
+    np = None
 
-def tensor_product(matrix1: List[List[Union[int, float]]], matrix2: List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
-    """ Calculate the tensor m2_rowsroduct of two matrices
+current_dir = Path().resolve()
+subdir_type = current_dir / "Matrix_operations" / "matrix_type"
+
+# Add subfolder to sys.path
+if str(subdir_type) not in sys.path:
+    sys.path.append(str(subdir_type))
+
+from matrix_type import Matrix
+
+MatrixLike = Union[List[List[Union[int, float]]], Matrix]
+
+
+def _kron_dense(matrix1: "np.ndarray", matrix2: "np.ndarray") -> "np.ndarray":
+    """ Dense Kronecker product by broadcasting: the (i, k, j, l) element of the
+    4-D outer product is matrix1[i, j] * matrix2[k, l], and a reshape lays it out
+    as the (i*m2_rows + k, j*m2_cols + l) element of the result."""
+    m1_rows, m1_cols = matrix1.shape
+    m2_rows, m2_cols = matrix2.shape
+    outer = matrix1[:, None, :, None] * matrix2[None, :, None, :]
+    return outer.reshape(m1_rows * m2_rows, m1_cols * m2_cols)
+
+
+def tensor_product(matrix1: Union[MatrixLike, "np.ndarray"],
+                   matrix2: Union[MatrixLike, "np.ndarray"]) -> Union[MatrixLike, "np.ndarray"]:
+    """ Calculate the tensor product of two matrices
     Args:
-        matrix1 (List[List[Union[int, float]]]): The first matrix.
-        matrix2 (List[List[Union[int, float]]]): The second matrix.
+        matrix1 (MatrixLike or np.ndarray): The first matrix, a nested list, a Matrix or an ndarray.
+        matrix2 (MatrixLike or np.ndarray): The second matrix, a nested list, a Matrix or an ndarray.
     Returns:
-        List[List[Union[int, float]]]: The tensor m2_rowsroduct of the two matrices."""
-    # Get the dimensions of matrices A and B
+        MatrixLike or np.ndarray: The tensor product of the two matrices. A Matrix is returned
+            if either input is a Matrix, otherwise an ndarray if either input is an ndarray.
+    Raises:
+        ValueError: If either matrix is not a rectangular matrix."""
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        matrix1, matrix2 = Matrix.asmatrix(matrix1), Matrix.asmatrix(matrix2)
+        if np is not None:
+            return Matrix.from_numpy(_kron_dense(matrix1.to_numpy(), matrix2.to_numpy()))
+        (m1_rows, m1_cols), (m2_rows, m2_cols) = matrix1.shape, matrix2.shape
+        rows2 = matrix2.tolist()
+        # Rows of the result are written straight into one flat buffer
+        data = array("d")
+        for row1 in matrix1.iter_rows():
+            for row2 in rows2:
+                for value in row1:
+                    data.extend([value * b for b in row2])
+        return Matrix.from_buffer(data, (m1_rows * m2_rows, m1_cols * m2_cols))
+
+    if np is not None:
+        is_array = isinstance(matrix1, np.ndarray) or isinstance(matrix2, np.ndarray)
+        try:
+            dense1, dense2 = np.asarray(matrix1), np.asarray(matrix2)
+        except ValueError:  # Ragged nested lists
+            raise ValueError("Both matrices must be rectangular matrices.")
+        if dense1.ndim != 2 or dense2.ndim != 2:
+            raise ValueError("Both matrices must be rectangular matrices.")
+        result = _kron_dense(dense1, dense2)
+        return result if is_array else result.tolist()
+
+    # Get the dimensions of the two matrices
     m1_rows, m1_cols = len(matrix1), len(matrix1[0])
     m2_rows, m2_cols = len(matrix2), len(matrix2[0])
 
-    # Initialize the result matrix with zeros
-    result = [[0 for _ in range(m1_cols * m2_cols)] for _ in range(m1_rows * m2_rows)]
+    # Calculate the tensor product one result row at a time
+    result = []
+    for row1 in matrix1:
+        for row2 in matrix2:
+            result.append([a * b for a in row1 for b in row2])
+    return result
+
+
+class KroneckerOperator:
+    """ The Kronecker product F_1 ⊗ F_2 ⊗ ... ⊗ F_k as a lazy linear operator.
+    The dense product has prod(rows) x prod(cols) entries and is never formed.
+    Products with vectors use the identity (A ⊗ B) vec(X) = vec(B X A^T): the
+    vector is reshaped to a k-dimensional tensor and every factor is applied
+    along its own axis, which costs O(N * sum(n_i)) instead of O(N^2).
+    Args:
+        *factors (MatrixLike or np.ndarray): Two or more 2-D factors, outermost first.
+    Raises:
+        ValueError: If no factor is given or a factor is not 2-D."""
+    __slots__ = ("factors", "shape")
+
+    def __init__(self, *factors) -> None:
+        if np is None:
+            raise ImportError("KroneckerOperator requires NumPy.")
+        if len(factors) == 0:
+            raise ValueError("At least one factor is required.")
+        self.factors: Tuple["np.ndarray", ...] = tuple(np.asarray(factor) for factor in factors)
+        if any(factor.ndim != 2 for factor in self.factors):
+            raise ValueError("Every factor must be a rectangular matrix.")
+        self.shape: Tuple[int, int] = (int(np.prod([f.shape[0] for f in self.factors])),
+                                       int(np.prod([f.shape[1] for f in self.factors])))
+
+    @property
+    def T(self) -> "KroneckerOperator":
+        """ The transpose, (A ⊗ B)^T = A^T ⊗ B^T."""
+        return KroneckerOperator(*(factor.T for factor in self.factors))
+
+    def kron(self, other: Union["KroneckerOperator", "np.ndarray"]) -> "KroneckerOperator":
+        """ Append more factors: self ⊗ other."""
+        other_factors = other.factors if isinstance(other, KroneckerOperator) else (other,)
+        return KroneckerOperator(*self.factors, *other_factors)
+
+    def _apply(self, tensor: "np.ndarray") -> "np.ndarray":
+        """ Apply every factor along its axis of tensor, trailing axes are batch axes."""
+        for axis, factor in enumerate(self.factors):
+            # tensordot puts the new axis first, move it back into place
+            tensor = np.moveaxis(np.tensordot(factor, tensor, axes=([1], [axis])), 0, axis)
+        return tensor
+
+    def matvec(self, vector: "np.ndarray") -> "np.ndarray":
+        """ Compute (F_1 ⊗ ... ⊗ F_k) @ vector.
+        Args:
+            vector (np.ndarray): Vector of length shape[1].
+        Returns:
+            np.ndarray: Vector of length shape[0].
+        Raises:
+            ValueError: If the length of the vector does not match."""
+        vector = np.asarray(vector)
+        if vector.shape != (self.shape[1],):
+            raise ValueError(f"Expected a vector of length {self.shape[1]}, got shape {vector.shape}.")
+        tensor = vector.reshape([factor.shape[1] for factor in self.factors])
+        return self._apply(tensor).reshape(self.shape[0])
+
+    def matmat(self, matrix: "np.ndarray") -> "np.ndarray":
+        """ Compute (F_1 ⊗ ... ⊗ F_k) @ matrix, all columns at once.
+        Args:
+            matrix (np.ndarray): Matrix with shape[1] rows.
+        Returns:
+            np.ndarray: Matrix with shape[0] rows.
+        Raises:
+            ValueError: If the number of rows does not match."""
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2 or matrix.shape[0] != self.shape[1]:
+            raise ValueError(f"Expected a matrix with {self.shape[1]} rows, got shape {matrix.shape}.")
+        tensor = matrix.reshape([factor.shape[1] for factor in self.factors] + [matrix.shape[1]])
+        return self._apply(tensor).reshape(self.shape[0], matrix.shape[1])
+
+    def __matmul__(self, other: "np.ndarray") -> "np.ndarray":
+        other = np.asarray(other)
+        return self.matvec(other) if other.ndim == 1 else self.matmat(other)
+
+    def __getitem__(self, index: Tuple[int, int]) -> float:
+        """ A single entry, computed as the product of one entry of each factor."""
+        row, col = index
+        if not (0 <= row < self.shape[0] and 0 <= col < self.shape[1]):
+            raise IndexError("Operator index out of range.")
+        rows = np.unravel_index(row, [factor.shape[0] for factor in self.factors])
+        cols = np.unravel_index(col, [factor.shape[1] for factor in self.factors])
+        value = 1
+        for factor, i, j in zip(self.factors, rows, cols):
+            value = value * factor[i, j]
+        return value
+
+    def todense(self) -> "np.ndarray":
+        """ Materialise the full product. Only sensible for small operators."""
+        return reduce(_kron_dense, self.factors)
+
+    def __repr__(self) -> str:
+        shapes = " ⊗ ".join(f"{f.shape[0]}x{f.shape[1]}" for f in self.factors)
+        return f"KroneckerOperator({shapes})"
+
 
-    # Calculate the tensor m2_rowsroduct
-    for i in range(m1_rows):
-        for j in range(m1_cols):
-            for k in range(m2_rows):
-                for l in range(m2_cols):
-                    result[i*m2_rows + k][j*m2_cols + l] = A[i][j] * B[k][l]
+if __name__ == "__main__":
+    matrix1 = [[1, 2], [3, 4]]
+    matrix2 = [[0, 5], [6, 7]]
+    print(tensor_product(matrix1, matrix2))
 
-    return result
\ No newline at end of file
+    # A chain whose dense form would need 4096 x 4096 entries
+    rng = np.random.default_rng(0)
+    operator = KroneckerOperator(*(rng.standard_normal((8, 8)) for _ in range(4)))
+    vector = rng.standard_normal(operator.shape[1])
+    print(operator, operator.matvec(vector)[:3], operator[5, 7])
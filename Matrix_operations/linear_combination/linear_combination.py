@@ -0,0 +1,113 @@
+from typing import List, Optional, Sequence, Tuple, Union
+from operator import add, sub
+import sys
+from pathlib import Path
+
+current_dir = Path().resolve()
+subdir_type = current_dir / "Matrix_operations" / "matrix_type"
+
+# Add subfolder to sys.path
+if str(subdir_type) not in sys.path:
+    sys.path.append(str(subdir_type))
+
+from matrix_type import Matrix
+
+MatrixLike = Union[List[List[Union[int, float]]], Matrix]
+
+
+def combine(terms: Sequence[Tuple[Union[int, float], MatrixLike]],
+            out: Optional[MatrixLike] = None) -> MatrixLike:
+    """ Evaluate the linear combination sum(coefficient * matrix) in a single pass.
+    Chaining matrix_add / matrix_subtract allocates one full matrix per operator,
+    e.g. matrix_add(matrix_subtract(matrix_add(P, S), T), V) builds three. Here
+    every output row is computed directly from the matching rows of all operands.
+    Args:
+        terms (Sequence[Tuple[Union[int, float], MatrixLike]]): (coefficient, matrix)
+            pairs, e.g. [(1, P), (1, S), (-1, T), (1, V)]. Nested lists and Matrix
+            objects are accepted.
+        out (MatrixLike, optional): Matrix to write the result into. It may be one
+            of the operands. Defaults to None, in which case a new matrix is allocated.
+    Returns:
+        MatrixLike: The linear combination (out if given). A Matrix is returned if
+            any operand is a Matrix.
+    Raises:
+        ValueError: If no terms are given.
+        ValueError: If the dimensions of the matrices are not equal.
+        ValueError: If a matrix is not a rectangular matrix.
+        ValueError: If out does not have the dimensions of the matrices."""
+    if len(terms) == 0:
+        raise ValueError("At least one term is required.")
+
+    is_matrix = any(isinstance(matrix, Matrix) for _, matrix in terms)
+    if is_matrix:
+        # Matrix objects are rectangular by construction, only the shapes are compared
+        terms = [(coef, Matrix.asmatrix(matrix)) for coef, matrix in terms]
+        n_rows, n_cols = terms[0][1].shape
+        if any(matrix.shape != (n_rows, n_cols) for _, matrix in terms):
+            raise ValueError("The dimensions of the matrices must be equal.")
+        if out is not None and (not isinstance(out, Matrix) or out.shape != (n_rows, n_cols)):
+            raise ValueError("The output matrix must have the dimensions of the matrices.")
+    else:
+        n_rows, n_cols = len(terms[0][1]), len(terms[0][1][0])
+        for _, matrix in terms:
+            if len(matrix) != n_rows or len(matrix[0]) != n_cols:
+                raise ValueError("The dimensions of the matrices must be equal.")
+            for row in matrix:
+                if len(row) != n_cols:
+                    raise ValueError("Every matrix must be a rectangular matrix.")
+        if out is not None and (len(out) != n_rows or any(len(row) != n_cols for row in out)):
+            raise ValueError("The output matrix must have the dimensions of the matrices.")
+
+    (first_coef, first), rest = terms[0], terms[1:]
+    if out is not None:
+        result = out
+    else:
+        result = Matrix.zeros(n_rows, n_cols) if is_matrix else [None] * n_rows
+    for idx in range(n_rows):
+        # Only row-sized temporaries are created, never a full matrix
+        if first_coef == 1:
+            row = list(first[idx])
+        else:
+            row = [first_coef * value for value in first[idx]]
+        for coef, matrix in rest:
+            if coef == 1:
+                row = list(map(add, row, matrix[idx]))
+            elif coef == -1:
+                row = list(map(sub, row, matrix[idx]))
+            else:
+                row = [acc + coef * value for acc, value in zip(row, matrix[idx])]
+        if is_matrix:
+            result.set_row(idx, row)
+        elif out is not None:
+            out[idx][:] = row
+        else:
+            result[idx] = row
+    return result
+
+
+if __name__ == "__main__":
+    import random
+    import tracemalloc
+
+    for subdir in ("matrix_addition", "matrix_subtraction"):
+        if str(current_dir / "Matrix_operations" / subdir) not in sys.path:
+            sys.path.append(str(current_dir / "Matrix_operations" / subdir))
+    from matrix_addition import matrix_add
+    from matrix_subtraction import matrix_subtract
+
+    # Peak memory traced while forming Strassen's C11 = P + S - T + V
+    size = 256
+    P, S, T, V = ([[random.random() for _ in range(size)] for _ in range(size)] for _ in range(4))
+    C11 = [[0.0] * size for _ in range(size)]
+
+    def peak_allocation(func) -> int:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    chained = peak_allocation(lambda: matrix_add(matrix_subtract(matrix_add(P, S), T), V, out=C11))
+    fused = peak_allocation(lambda: combine([(1, P), (1, S), (-1, T), (1, V)], out=C11))
+    print(f"chained: {chained / 1024:.0f} KiB peak, fused: {fused / 1024:.0f} KiB peak")
+    assert fused < chained
@@ -1,18 +1,41 @@
-from typing import List, Union
-from copy import deepcopy as deep
+from typing import List, Optional, Union
+from operator import add
+import sys
+from pathlib import Path
 
-def matrix_add(matrix1 : List[List[Union[int, float]]], matrix2 : List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
-    """ Multiplies two matrices together.
+current_dir = Path().resolve()
+subdir_type = current_dir / "Matrix_operations" / "matrix_type"
+
+# Add subfolder to sys.path
+if str(subdir_type) not in sys.path:
+    sys.path.append(str(subdir_type))
+
+from matrix_type import Matrix
+
+MatrixLike = Union[List[List[Union[int, float]]], Matrix]
+
+
+def matrix_add(matrix1 : MatrixLike, matrix2 : MatrixLike,
+               out : Optional[MatrixLike] = None) -> MatrixLike:
+    """ Adds two matrices element by element.
     Args:
-        matrix1 (List[List[Union[int, float]]]): The first matrix.
-        matrix2 (List[List[Union[int, float]]]): The second matrix.
+        matrix1 (MatrixLike): The first matrix, a nested list or a Matrix.
+        matrix2 (MatrixLike): The second matrix.
+        out (MatrixLike, optional): Matrix to write the result into.
+            Pass out=matrix1 to update the first matrix in place. Defaults to None,
+            in which case a new matrix is allocated.
     Returns:
-        List[List[Union[int, float]]]: The sum of the two matrices.
+        MatrixLike: The sum of the two matrices (out if given).
+            A Matrix is returned if either operand is a Matrix.
     Raises:
         ValueError: If the dimensions of the two matrices are not equal.
         ValueError: If the first matrix is not a rectangular matrix.
-        ValueError: If the second matrix is not a rectangular matrix."""
-    
+        ValueError: If the second matrix is not a rectangular matrix.
+        ValueError: If out does not have the dimensions of the two matrices."""
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        # Matrix objects are rectangular by construction, only the shapes are compared
+        return Matrix.asmatrix(matrix1).elementwise(add, Matrix.asmatrix(matrix2), out)
+
     m1_rows, m1_cols = len(matrix1), len(matrix1[0])
     m2_rows, m2_cols = len(matrix2), len(matrix2[0])
 
@@ -27,11 +50,15 @@ def matrix_add(matrix1 : List[List[Union[int, float]]], matrix2 : List[List[Unio
         if len(row) != m2_cols:
             raise ValueError("The second matrix must be a rectangular matrix.")
 
-    result = deep(matrix1)
-    for row in range(m1_rows):
-        for col in range(m1_cols):
-            result[row][col] += matrix2[row][col]
-    return result
+    if out is None:
+        return [list(map(add, row1, row2)) for row1, row2 in zip(matrix1, matrix2)]
+
+    if len(out) != m1_rows or any(len(row) != m1_cols for row in out):
+        raise ValueError("The output matrix must have the dimensions of the two matrices.")
+    # Rows are overwritten one at a time, so out may alias matrix1 or matrix2
+    for out_row, row1, row2 in zip(out, matrix1, matrix2):
+        out_row[:] = map(add, row1, row2)
+    return out
 
 
 if __name__ == "__main__":
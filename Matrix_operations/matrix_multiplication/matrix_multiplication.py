@@ -1,35 +1,215 @@
 from typing import List, Union
+import sys
+from pathlib import Path
 
-def matrix_multiply(matrix1 : List[List[Union[int, float]]], matrix2 : List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
-    """ Multiplies two matrices together.
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python kernels work without it
+    np = None
+
+current_dir = Path().resolve()
+subdir_type = current_dir / "Matrix_operations" / "matrix_type"
+
+# Add subfolder to sys.path
+if str(subdir_type) not in sys.path:
+    sys.path.append(str(subdir_type))
+
+from matrix_type import Matrix
+
+# Work (rows * inner * cols) above which the automatic backend selection
+# switches from the i-k-j kernel to NumPy for float data when NumPy is present,
+# and to the blocked kernel for data that stays in Python (ints, mixed types or no NumPy).
+BLOCKED_THRESHOLD: int = 128 ** 3
+NUMPY_THRESHOLD: int = 32 ** 3
+DEFAULT_BLOCK_SIZE: int = 64
+
+BACKENDS = ("auto", "naive", "ikj", "blocked", "numpy")
+
+
+def _multiply_naive(matrix1: List[List[Union[int, float]]],
+                    matrix2: List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
+    """ Textbook i-j-k triple loop. Kept as a reference kernel.
+    Args:
+        matrix1 (List[List[Union[int, float]]]): The first matrix.
+        matrix2 (List[List[Union[int, float]]]): The second matrix.
+    Returns:
+        List[List[Union[int, float]]]: The product of the two matrices."""
+    m1_rows, m2_rows, m2_cols = len(matrix1), len(matrix2), len(matrix2[0])
+    product = [[0 for _ in range(m2_cols)] for _ in range(m1_rows)]
+    for m1_row in range(m1_rows):
+        for m2_col in range(m2_cols):
+            for m2_row in range(m2_rows):
+                product[m1_row][m2_col] += matrix1[m1_row][m2_row] * matrix2[m2_row][m2_col]
+    return product
+
+
+def _multiply_ikj(matrix1: List[List[Union[int, float]]],
+                  matrix2: List[List[Union[int, float]]]) -> List[List[Union[int, float]]]:
+    """ i-k-j ordered product. The innermost loop walks a row of matrix2 and a row
+    of the result, so both are read sequentially and the scalar matrix1[i][k] is
+    hoisted out of the loop.
+    Args:
+        matrix1 (List[List[Union[int, float]]]): The first matrix.
+        matrix2 (List[List[Union[int, float]]]): The second matrix.
+    Returns:
+        List[List[Union[int, float]]]: The product of the two matrices."""
+    m2_cols = len(matrix2[0])
+    product = []
+    for row1 in matrix1:
+        product_row = [0] * m2_cols
+        for value, row2 in zip(row1, matrix2):
+            if value == 0:  # Nothing to accumulate for this row of matrix2
+                continue
+            product_row = [acc + value * b for acc, b in zip(product_row, row2)]
+        product.append(product_row)
+    return product
+
+
+def _multiply_blocked(matrix1: List[List[Union[int, float]]], matrix2: List[List[Union[int, float]]],
+                      block_size: int = DEFAULT_BLOCK_SIZE) -> List[List[Union[int, float]]]:
+    """ Tiled i-k-j product. The inner dimension and the columns are split into
+    tiles of block_size so that a tile of matrix2 stays hot while every row of
+    matrix1 is streamed over it.
     Args:
         matrix1 (List[List[Union[int, float]]]): The first matrix.
         matrix2 (List[List[Union[int, float]]]): The second matrix.
+        block_size (int): Edge length of a tile.
     Returns:
-        List[List[Union[int, float]]]: The product of the two matrices.
+        List[List[Union[int, float]]]: The product of the two matrices."""
+    m1_rows, m1_cols, m2_cols = len(matrix1), len(matrix1[0]), len(matrix2[0])
+    product = [[0] * m2_cols for _ in range(m1_rows)]
+    for col_start in range(0, m2_cols, block_size):
+        col_stop = min(col_start + block_size, m2_cols)
+        for inner_start in range(0, m1_cols, block_size):
+            inner_stop = min(inner_start + block_size, m1_cols)
+            # Slice the tile of matrix2 once and reuse it for every row of matrix1
+            tile = [matrix2[k][col_start:col_stop] for k in range(inner_start, inner_stop)]
+            for row1, product_row in zip(matrix1, product):
+                acc = product_row[col_start:col_stop]
+                for value, tile_row in zip(row1[inner_start:inner_stop], tile):
+                    if value == 0:
+                        continue
+                    acc = [a + value * b for a, b in zip(acc, tile_row)]
+                product_row[col_start:col_stop] = acc
+    return product
+
+
+def _all_floats(matrix: List[List[Union[int, float]]]) -> bool:
+    """ True if every element is a float. Python ints are unbounded, so only float
+    data can be handed to NumPy without the risk of int64 overflow."""
+    return all(isinstance(value, float) for row in matrix for value in row)
+
+
+def _choose_backend(m1_rows: int, m1_cols: int, m2_cols: int, floats: bool = True) -> str:
+    """ Pick a kernel from the amount of work in the product. NumPy is only
+    chosen for float data (floats=True)."""
+    work = m1_rows * m1_cols * m2_cols
+    if np is not None and floats and work >= NUMPY_THRESHOLD:
+        return "numpy"
+    if work >= BLOCKED_THRESHOLD:
+        return "blocked"
+    return "ikj"
+
+
+def matrix_multiply(matrix1: Union[List[List[Union[int, float]]], Matrix, "np.ndarray"],
+                    matrix2: Union[List[List[Union[int, float]]], Matrix, "np.ndarray"],
+                    backend: str = "auto", block_size: int = DEFAULT_BLOCK_SIZE
+                    ) -> Union[List[List[Union[int, float]]], Matrix, "np.ndarray"]:
+    """ Multiplies two matrices together.
+    Args:
+        matrix1 (List[List[Union[int, float]]], Matrix or np.ndarray): The first matrix.
+        matrix2 (List[List[Union[int, float]]], Matrix or np.ndarray): The second matrix.
+        backend (str, optional): The kernel to use. One of "auto", "naive", "ikj",
+            "blocked" or "numpy". "auto" picks NumPy/BLAS for large products of float
+            data when NumPy is installed, and otherwise the i-k-j or blocked pure
+            Python kernel, so that lists of Python ints keep exact results.
+            Defaults to "auto".
+        block_size (int, optional): Tile size of the blocked kernel. Defaults to 64.
+    Returns:
+        List[List[Union[int, float]]], Matrix or np.ndarray: The product of the two matrices.
+            A Matrix is returned if either input is a Matrix, otherwise an ndarray if
+            either input is an ndarray, and a nested list otherwise.
     Raises:
         ValueError: If the number of columns in the first matrix is not equal to the number of rows in the second matrix.
         ValueError: If the first matrix is not a rectangular matrix.
-        ValueError: If the second matrix is not a rectangular matrix."""
+        ValueError: If the second matrix is not a rectangular matrix.
+        ValueError: If the backend is unknown or NumPy is requested but not installed."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {BACKENDS}.")
+    if block_size <= 0:
+        raise ValueError("The block size must be a positive integer.")
+
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        matrix1, matrix2 = Matrix.asmatrix(matrix1), Matrix.asmatrix(matrix2)
+        if matrix1.shape[1] != matrix2.shape[0]:
+            raise ValueError("The number of columns in the first matrix must be equal to the number of rows in the second matrix.")
+        if backend == "auto":
+            backend = _choose_backend(matrix1.shape[0], matrix1.shape[1], matrix2.shape[1])
+        if backend == "numpy":
+            if np is None:
+                raise ValueError("The numpy backend requires NumPy to be installed.")
+            # Both operands are shared with NumPy through the buffer protocol
+            return Matrix.from_numpy(matrix1.to_numpy() @ matrix2.to_numpy())
+        return Matrix(matrix_multiply(matrix1.tolist(), matrix2.tolist(), backend=backend, block_size=block_size))
+
+    is_array = np is not None and (isinstance(matrix1, np.ndarray) or isinstance(matrix2, np.ndarray))
+    if is_array:
+        matrix1, matrix2 = np.asarray(matrix1), np.asarray(matrix2)
+        if matrix1.ndim != 2:
+            raise ValueError("The first matrix must be a rectangular matrix.")
+        if matrix2.ndim != 2:
+            raise ValueError("The second matrix must be a rectangular matrix.")
+        if matrix1.shape[1] != matrix2.shape[0]:
+            raise ValueError("The number of columns in the first matrix must be equal to the number of rows in the second matrix.")
+        if backend in ("auto", "numpy"):
+            return matrix1 @ matrix2
+        # An explicit pure Python kernel was requested, run it on nested lists
+        product = matrix_multiply(matrix1.tolist(), matrix2.tolist(), backend=backend, block_size=block_size)
+        return np.array(product)
+
     m1_rows, m1_cols = len(matrix1), len(matrix1[0])
-    m2_rows, m2_cols = len(matrix2), len(matrix2[0]) 
+    m2_rows, m2_cols = len(matrix2), len(matrix2[0])
 
     if m1_cols != m2_rows:
         raise ValueError("The number of columns in the first matrix must be equal to the number of rows in the second matrix.")
-    
+
     for row in matrix1:
         if len(row) != m1_cols:
             raise ValueError("The first matrix must be a rectangular matrix.")
-    
+
     for row in matrix2:
         if len(row) != m2_cols:
             raise ValueError("The second matrix must be a rectangular matrix.")
-    
-    product = [[0 for _ in range(m2_cols)] for _ in range(m1_rows)]
-    for m1_row in range(m1_rows):
-        for m2_col in range(m2_cols):
-            for m2_row in range(m2_rows):
-                product[m1_row][m2_col] += matrix1[m1_row][m2_row] * matrix2[m2_row][m2_col]
-    return product
 
+    if backend == "auto":
+        floats = np is not None and _all_floats(matrix1) and _all_floats(matrix2)
+        backend = _choose_backend(m1_rows, m1_cols, m2_cols, floats)
+
+    if backend == "numpy":
+        if np is None:
+            raise ValueError("The numpy backend requires NumPy to be installed.")
+        return (np.asarray(matrix1) @ np.asarray(matrix2)).tolist()
+    if backend == "blocked":
+        return _multiply_blocked(matrix1, matrix2, block_size)
+    if backend == "naive":
+        return _multiply_naive(matrix1, matrix2)
+    return _multiply_ikj(matrix1, matrix2)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    size = 128
+    matrix1 = [[random.random() for _ in range(size)] for _ in range(size)]
+    matrix2 = [[random.random() for _ in range(size)] for _ in range(size)]
+    for backend in BACKENDS:
+        if backend == "numpy" and np is None:
+            continue
+        start = time.perf_counter()
+        matrix_multiply(matrix1, matrix2, backend=backend)
+        print(f"{backend:>8}: {time.perf_counter() - start:.4f} s")
 
+    # Python ints stay exact: NumPy's int64 would overflow on this product
+    big = [[2 ** 40] * 40 for _ in range(40)]
+    assert matrix_multiply(big, big)[0][0] == 40 * 2 ** 80
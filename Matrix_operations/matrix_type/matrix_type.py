@@ -0,0 +1,251 @@
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from array import array
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only needed for the conversions
+    np = None
+
+
+class Matrix:
+    """ Dense matrix of doubles stored in one flat buffer.
+    The elements live in an array('d') (or any buffer exposing doubles) and are
+    addressed through an offset and a (row, column) stride, so transposes and
+    submatrices are views that share the buffer instead of copies. Compared with
+    List[List[float]] this stores 8 bytes per element instead of a pointer plus a
+    boxed float, and the shape is known without re-checking every row.
+    Args:
+        rows (List[List[Union[int, float]]]): The elements as a nested list.
+    Raises:
+        ValueError: If rows is empty or not a rectangular matrix."""
+    __slots__ = ("_data", "_offset", "_shape", "_strides")
+
+    def __init__(self, rows: List[List[Union[int, float]]]) -> None:
+        if len(rows) == 0 or len(rows[0]) == 0:
+            raise ValueError("The matrix must have at least one row and one column.")
+        n_cols = len(rows[0])
+        for row in rows:
+            if len(row) != n_cols:
+                raise ValueError("The matrix must be a rectangular matrix.")
+        self._data = array("d", chain.from_iterable(rows))
+        self._offset = 0
+        self._shape = (len(rows), n_cols)
+        self._strides = (n_cols, 1)
+
+    @classmethod
+    def _view(cls, data, shape: Tuple[int, int], strides: Tuple[int, int], offset: int = 0) -> "Matrix":
+        """ Build a matrix over an existing buffer without copying it."""
+        matrix = cls.__new__(cls)
+        matrix._data = data
+        matrix._shape = shape
+        matrix._strides = strides
+        matrix._offset = offset
+        return matrix
+
+    @classmethod
+    def zeros(cls, n_rows: int, n_cols: int) -> "Matrix":
+        """ Create a contiguous matrix of zeros.
+        Args:
+            n_rows (int): Number of rows.
+            n_cols (int): Number of columns.
+        Returns:
+            Matrix: The zero matrix."""
+        if n_rows <= 0 or n_cols <= 0:
+            raise ValueError("The matrix must have at least one row and one column.")
+        return cls._view(array("d", bytes(8 * n_rows * n_cols)), (n_rows, n_cols), (n_cols, 1))
+
+    @classmethod
+    def from_buffer(cls, buffer, shape: Tuple[int, int], strides: Optional[Tuple[int, int]] = None,
+                    offset: int = 0) -> "Matrix":
+        """ Wrap any object exposing the buffer protocol as a matrix, without copying.
+        Args:
+            buffer: Object exposing at least offset + extent doubles through the buffer protocol.
+            shape (Tuple[int, int]): Number of rows and columns.
+            strides (Tuple[int, int], optional): Row and column strides in elements.
+                Defaults to row-major contiguous.
+            offset (int, optional): Index of the first element. Defaults to 0.
+        Returns:
+            Matrix: A matrix sharing memory with buffer.
+        Raises:
+            ValueError: If the buffer is too small for the requested layout."""
+        data = memoryview(buffer)
+        if data.ndim != 1 or data.format != "d":
+            data = data.cast("B").cast("d")
+        strides = strides if strides is not None else (shape[1], 1)
+        last = offset + (shape[0] - 1) * strides[0] + (shape[1] - 1) * strides[1]
+        if shape[0] <= 0 or shape[1] <= 0 or offset < 0 or last >= len(data):
+            raise ValueError("The buffer is too small for the requested shape and strides.")
+        return cls._view(data, tuple(shape), tuple(strides), offset)
+
+    @classmethod
+    def from_numpy(cls, matrix: "np.ndarray") -> "Matrix":
+        """ Convert a 2-D ndarray. A C-contiguous float64 array is shared, not copied.
+        Args:
+            matrix (np.ndarray): The array to convert.
+        Returns:
+            Matrix: The converted matrix.
+        Raises:
+            ValueError: If the array is not 2-D."""
+        matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2:
+            raise ValueError("The matrix must be a rectangular matrix.")
+        return cls.from_buffer(matrix, matrix.shape)
+
+    @classmethod
+    def asmatrix(cls, matrix: Union["Matrix", List[List[Union[int, float]]], "np.ndarray"]) -> "Matrix":
+        """ Return matrix unchanged if it is a Matrix, otherwise convert it."""
+        if isinstance(matrix, cls):
+            return matrix
+        if np is not None and isinstance(matrix, np.ndarray):
+            return cls.from_numpy(matrix)
+        return cls(matrix)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """ Number of rows and columns."""
+        return self._shape
+
+    @property
+    def T(self) -> "Matrix":
+        """ The transpose, as a view sharing this matrix's buffer."""
+        return self.transpose()
+
+    def transpose(self) -> "Matrix":
+        """ Return the transpose as a view. No element is copied."""
+        return Matrix._view(self._data, self._shape[::-1], self._strides[::-1], self._offset)
+
+    def submatrix(self, row_start: int, row_stop: int, col_start: int, col_stop: int) -> "Matrix":
+        """ Return the block [row_start:row_stop, col_start:col_stop] as a view.
+        Writes through the view change this matrix.
+        Raises:
+            ValueError: If the block is empty or out of bounds."""
+        n_rows, n_cols = self._shape
+        if not (0 <= row_start < row_stop <= n_rows and 0 <= col_start < col_stop <= n_cols):
+            raise ValueError("The submatrix bounds are outside the matrix.")
+        offset = self._offset + row_start * self._strides[0] + col_start * self._strides[1]
+        return Matrix._view(self._data, (row_stop - row_start, col_stop - col_start), self._strides, offset)
+
+    def is_contiguous(self) -> bool:
+        """ True if the elements are stored row-major without gaps."""
+        return self._strides == (self._shape[1], 1)
+
+    def _row_slice(self, idx: int) -> slice:
+        """ Slice of the buffer holding row idx."""
+        start = self._offset + idx * self._strides[0]
+        step = self._strides[1]
+        return slice(start, start + self._shape[1] * step, step)
+
+    def row(self, idx: int) -> List[float]:
+        """ Return a copy of row idx as a list."""
+        if not 0 <= idx < self._shape[0]:
+            raise IndexError("Row index out of range.")
+        return self._data[self._row_slice(idx)].tolist()
+
+    def set_row(self, idx: int, values) -> None:
+        """ Overwrite row idx with values."""
+        if not 0 <= idx < self._shape[0]:
+            raise IndexError("Row index out of range.")
+        values = array("d", values)
+        if len(values) != self._shape[1]:
+            raise ValueError("The row must have as many values as the matrix has columns.")
+        self._data[self._row_slice(idx)] = values
+
+    def iter_rows(self) -> Iterator[List[float]]:
+        """ Iterate over copies of the rows."""
+        for idx in range(self._shape[0]):
+            yield self.row(idx)
+
+    def flat(self) -> Iterator[float]:
+        """ Iterate over the elements in row-major order."""
+        if self.is_contiguous():
+            return iter(self._data[self._offset:self._offset + self._shape[0] * self._shape[1]])
+        return chain.from_iterable(self.iter_rows())
+
+    def tolist(self) -> List[List[float]]:
+        """ Convert to a nested list."""
+        return list(self.iter_rows())
+
+    def copy(self) -> "Matrix":
+        """ Return a contiguous copy."""
+        return Matrix._view(array("d", self.flat()), self._shape, (self._shape[1], 1))
+
+    def to_numpy(self) -> "np.ndarray":
+        """ Return an ndarray view of the same memory (no copy)."""
+        if np is None:
+            raise ImportError("to_numpy requires NumPy.")
+        itemsize = 8
+        return np.ndarray(self._shape, dtype=np.float64, buffer=self._data, offset=self._offset * itemsize,
+                          strides=(self._strides[0] * itemsize, self._strides[1] * itemsize))
+
+    def __array__(self, dtype=None, copy=None) -> "np.ndarray":
+        array_view = self.to_numpy()
+        return array_view if dtype is None else array_view.astype(dtype)
+
+    def assign(self, other: "Matrix") -> "Matrix":
+        """ Copy the elements of other into this matrix (or view) and return it.
+        Raises:
+            ValueError: If the shapes differ."""
+        if other.shape != self._shape:
+            raise ValueError("The dimensions of the two matrices must be equal.")
+        for idx, values in enumerate(other.iter_rows()):
+            self.set_row(idx, values)
+        return self
+
+    def elementwise(self, op: Callable[[float, float], float], other: "Matrix",
+                    out: Optional["Matrix"] = None) -> "Matrix":
+        """ Apply a binary operator element by element, e.g. operator.add.
+        Args:
+            op (Callable[[float, float], float]): The operator.
+            other (Matrix): The second operand, same shape as this matrix.
+            out (Matrix, optional): Matrix to write the result into. It may be one of
+                the operands, but not a view of it with a different layout.
+        Returns:
+            Matrix: The result (out if given).
+        Raises:
+            ValueError: If the dimensions of the matrices are not equal.
+            TypeError: If out is given but is not a Matrix."""
+        if out is not None and not isinstance(out, Matrix):
+            raise TypeError("out must be a Matrix when the operands are Matrix objects.")
+        if other.shape != self._shape or (out is not None and out.shape != self._shape):
+            raise ValueError("The dimensions of the two matrices must be equal.")
+        if out is None:
+            data = array("d", map(op, self.flat(), other.flat()))
+            return Matrix._view(data, self._shape, (self._shape[1], 1))
+        for idx in range(self._shape[0]):
+            out.set_row(idx, map(op, self.row(idx), other.row(idx)))
+        return out
+
+    def __len__(self) -> int:
+        return self._shape[0]
+
+    def __getitem__(self, key: Union[int, Tuple[int, int]]) -> Union[float, List[float]]:
+        if isinstance(key, tuple):
+            row, col = key
+            if not (0 <= row < self._shape[0] and 0 <= col < self._shape[1]):
+                raise IndexError("Matrix index out of range.")
+            return self._data[self._offset + row * self._strides[0] + col * self._strides[1]]
+        return self.row(key)
+
+    def __setitem__(self, key: Tuple[int, int], value: float) -> None:
+        row, col = key
+        if not (0 <= row < self._shape[0] and 0 <= col < self._shape[1]):
+            raise IndexError("Matrix index out of range.")
+        self._data[self._offset + row * self._strides[0] + col * self._strides[1]] = value
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.tolist()})"
+
+
+if __name__ == "__main__":
+    import sys
+
+    matrix = Matrix([[1, 2, 3], [4, 5, 6]])
+    print(matrix, matrix.T, matrix.submatrix(0, 2, 1, 3))
+
+    # Memory of a 2048 x 2048 matrix: nested lists vs one flat buffer
+    size = 2048
+    rows = [[float(i * size + j) for j in range(size)] for i in range(size)]
+    list_bytes = sys.getsizeof(rows) + sum(sys.getsizeof(row) + 24 * len(row) for row in rows)
+    matrix = Matrix(rows)
+    print(f"List[List[float]]: {list_bytes / 2**20:.0f} MiB, Matrix: {sys.getsizeof(matrix._data) / 2**20:.0f} MiB")
@@ -0,0 +1,277 @@
+from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import product as cartesian
+from multiprocessing import get_context, shared_memory, util
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+current_dir = Path().resolve()
+subdir_strassen = current_dir / "Matrix_operations" / "Strassen_multiplication"
+
+# Add subfolder to sys.path
+if str(subdir_strassen) not in sys.path:
+    sys.path.append(str(subdir_strassen))
+
+from Strassen_multiplication import DEFAULT_CROSSOVER, _allocate_workspaces, _winograd_into
+
+# A bilinear algorithm is a list of products. Each product is described by the
+# coefficients of the A quadrants, of the B quadrants, and of the C quadrants it
+# contributes to. Quadrants are numbered 0 = 11, 1 = 12, 2 = 21, 3 = 22.
+Bilinear = List[Tuple[Dict[int, int], Dict[int, int], Dict[int, int]]]
+
+STRASSEN: Bilinear = [
+    ({0: 1, 3: 1}, {0: 1, 3: 1}, {0: 1, 3: 1}),    # P = (A11 + A22)(B11 + B22)
+    ({2: 1, 3: 1}, {0: 1}, {2: 1, 3: -1}),          # Q = (A21 + A22)B11
+    ({0: 1}, {1: 1, 3: -1}, {1: 1, 3: 1}),          # R = A11(B12 - B22)
+    ({3: 1}, {2: 1, 0: -1}, {0: 1, 2: 1}),          # S = A22(B21 - B11)
+    ({0: 1, 1: 1}, {3: 1}, {0: -1, 1: 1}),          # T = (A11 + A12)B22
+    ({2: 1, 0: -1}, {0: 1, 1: 1}, {3: 1}),          # U = (A21 - A11)(B11 + B12)
+    ({1: 1, 3: -1}, {2: 1, 3: 1}, {0: 1}),          # V = (A12 - A22)(B21 + B22)
+]
+
+# Plain divide and conquer: C_ij = A_i0 B_0j + A_i1 B_1j
+DIVIDE_AND_CONQUER: Bilinear = [
+    ({2 * i + k: 1}, {2 * k + j: 1}, {2 * i + j: 1}) for i, j, k in cartesian(range(2), repeat=3)
+]
+
+# Environment variables that cap the BLAS thread pools (OpenBLAS, MKL, OpenMP builds)
+BLAS_THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+# Shared memory blocks attached by each worker process
+_worker_state: Dict[str, object] = {}
+
+Terms = List[Tuple[int, int, int]]  # (coefficient, block row, block column)
+
+
+def _expand(algorithm: Bilinear, depth: int) -> List[Tuple[Terms, Terms, Terms]]:
+    """ Unroll depth levels of a bilinear algorithm into a flat list of products
+    whose operands are linear combinations of (2^depth x 2^depth) blocks.
+    Args:
+        algorithm (Bilinear): One level of the algorithm.
+        depth (int): Number of levels to unroll.
+    Returns:
+        List[Tuple[Terms, Terms, Terms]]: For each product the A, B and C block terms."""
+    tasks = [([(1, 0, 0)], [(1, 0, 0)], [(1, 0, 0)])]
+    for _ in range(depth):
+        expanded = []
+        for a_terms, b_terms, c_terms in tasks:
+            for a_coeffs, b_coeffs, c_coeffs in algorithm:
+                expanded.append(tuple(
+                    [(coef * c, 2 * row + q // 2, 2 * col + q % 2)
+                     for coef, row, col in terms for q, c in coeffs.items()]
+                    for terms, coeffs in ((a_terms, a_coeffs), (b_terms, b_coeffs), (c_terms, c_coeffs))))
+        tasks = expanded
+    return tasks
+
+
+def _attach(name: str, shape: Tuple[int, ...], dtype: str) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """ Attach to a shared memory block and view it as an array."""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+@contextmanager
+def _single_threaded_blas():
+    """ Set the BLAS thread variables to 1 while a pool is alive. BLAS reads them
+    once, when NumPy is imported, so they must be in the environment a spawned
+    worker starts with; the caller's values are restored afterwards."""
+    saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+    os.environ.update({name: "1" for name in BLAS_THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                del os.environ[name]
+            else:
+                os.environ[name] = value
+
+
+def _init_worker(specs: Dict[str, Tuple[str, Tuple[int, ...]]], dtype: str) -> None:
+    """ Pool initializer: attach the operand and product blocks once per process
+    and close them again when the process exits."""
+    for key, (name, shape) in specs.items():
+        _worker_state[key] = _attach(name, shape, dtype)
+    # Pool workers leave through os._exit, which skips atexit; finalizers with an
+    # exit priority are still run by multiprocessing
+    util.Finalize(None, _detach_worker, exitpriority=10)
+
+
+def _detach_worker() -> None:
+    """ Close the blocks attached by _init_worker. The array views are dropped
+    first, a block cannot be closed while they export its buffer."""
+    blocks = [block for block, _ in _worker_state.values()]
+    _worker_state.clear()
+    for block in blocks:
+        block.close()
+
+
+def _block_combination(matrix: np.ndarray, terms: Terms, block_shape: Tuple[int, int]) -> np.ndarray:
+    """ Sum coefficient * block over the terms, reading blocks as views."""
+    rows, cols = block_shape
+    result = np.zeros(block_shape, dtype=matrix.dtype)
+    for coef, row, col in terms:
+        block = matrix[row * rows:(row + 1) * rows, col * cols:(col + 1) * cols]
+        if coef == 1:
+            result += block
+        elif coef == -1:
+            result -= block
+        else:
+            result += coef * block
+    return result
+
+
+def _compute_product(index: int, a_terms: Terms, b_terms: Terms, block_k: int, leaf: str, crossover: int) -> int:
+    """ Worker task: form both operands from the shared inputs and write their
+    product into slot index of the shared product buffer."""
+    A = _worker_state["A"][1]
+    B = _worker_state["B"][1]
+    products = _worker_state["M"][1]
+    _, block_m, block_n = products.shape
+    left = _block_combination(A, a_terms, (block_m, block_k))
+    right = _block_combination(B, b_terms, (block_k, block_n))
+    if leaf == "strassen":
+        workspaces = _allocate_workspaces(block_m, block_k, block_n, crossover, products.dtype)
+        _winograd_into(left, right, products[index], crossover, workspaces)
+    else:
+        np.matmul(left, right, out=products[index])
+    return index
+
+
+def _parallel_bilinear_multiply(matrix1: Union[List[List[Union[int, float]]], np.ndarray],
+                                matrix2: Union[List[List[Union[int, float]]], np.ndarray],
+                                algorithm: Bilinear, leaf: str, workers: Optional[int], depth: int,
+                                crossover: int) -> Union[List[List[Union[int, float]]], np.ndarray]:
+    """ Shared driver of parallel_strassen_multiply and parallel_dc_matrix_mul."""
+    if depth < 1:
+        raise ValueError("The fan-out depth must be at least 1.")
+    is_array = isinstance(matrix1, np.ndarray) or isinstance(matrix2, np.ndarray)
+    try:
+        A, B = np.asarray(matrix1), np.asarray(matrix2)
+    except ValueError:  # Ragged nested lists
+        raise ValueError("Both matrices must be rectangular matrices.")
+    if A.ndim != 2:
+        raise ValueError("The first matrix must be a rectangular matrix.")
+    if B.ndim != 2:
+        raise ValueError("The second matrix must be a rectangular matrix.")
+    if A.shape[1] != B.shape[0]:
+        raise ValueError("The number of columns in the first matrix must be equal to the number of rows in the second matrix.")
+
+    # Pad every dimension to a multiple of 2^depth so the blocks split evenly
+    m, k = A.shape
+    n = B.shape[1]
+    dtype = np.result_type(A, B)
+    if m == 0 or k == 0 or n == 0:  # Nothing to distribute, the product is all zeros
+        C = np.zeros((m, n), dtype=dtype)
+        return C if is_array else C.tolist()
+    grid = 2 ** depth
+    pm, pk, pn = (-(-size // grid) * grid for size in (m, k, n))
+    tasks = _expand(algorithm, depth)
+    shapes = {"A": (pm, pk), "B": (pk, pn), "M": (len(tasks), pm // grid, pn // grid)}
+
+    blocks = {}
+    try:
+        for key, shape in shapes.items():
+            nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+            blocks[key] = shared_memory.SharedMemory(create=True, size=nbytes)
+        views = {key: np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf) for key, shape in shapes.items()}
+        # The only copy of the operands: into the shared blocks, zero padded
+        views["A"][:] = 0
+        views["A"][:m, :k] = A
+        views["B"][:] = 0
+        views["B"][:k, :n] = B
+
+        specs = {key: (blocks[key].name, shape) for key, shape in shapes.items()}
+        # Spawned workers start a fresh interpreter, so NumPy is imported with one
+        # BLAS thread each instead of every worker using all cores
+        with _single_threaded_blas(), \
+                ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=get_context("spawn"),
+                                    initializer=_init_worker, initargs=(specs, dtype.str)) as pool:
+            futures = [pool.submit(_compute_product, index, a_terms, b_terms, pk // grid, leaf, crossover)
+                       for index, (a_terms, b_terms, _) in enumerate(tasks)]
+            for future in futures:
+                future.result()  # Re-raise any worker error
+
+        # Scatter the products into the quadrants of the result
+        C = np.zeros((pm, pn), dtype=dtype)
+        block_m, block_n = pm // grid, pn // grid
+        for index, (_, _, c_terms) in enumerate(tasks):
+            for coef, row, col in c_terms:
+                target = C[row * block_m:(row + 1) * block_m, col * block_n:(col + 1) * block_n]
+                if coef == 1:
+                    target += views["M"][index]
+                else:
+                    target -= views["M"][index]
+        C = C[:m, :n].copy()
+        del views
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+    return C if is_array else C.tolist()
+
+
+def parallel_strassen_multiply(matrix1: Union[List[List[Union[int, float]]], np.ndarray],
+                               matrix2: Union[List[List[Union[int, float]]], np.ndarray],
+                               workers: Optional[int] = None, depth: int = 1,
+                               crossover: int = DEFAULT_CROSSOVER) -> Union[List[List[Union[int, float]]], np.ndarray]:
+    """ Multiply matrices with Strassen's algorithm, computing the sub-products
+    P..V of the top depth levels in a process pool.
+    The operands are copied once into multiprocessing.shared_memory blocks and
+    every worker writes its product into a shared output block, so no matrix is
+    pickled. depth=1 gives 7 tasks, depth=2 gives 49, which keeps 8-16 cores busy.
+    Each task is finished serially with hybrid_strassen_multiply's kernel, and
+    workers are spawned with one BLAS thread each so that workers times BLAS
+    threads does not oversubscribe the cores.
+    Args:
+        matrix1 (List[List[Union[int, float]]] or np.ndarray): The first matrix.
+        matrix2 (List[List[Union[int, float]]] or np.ndarray): The second matrix.
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        depth (int, optional): Number of Strassen levels fanned out to the pool. Defaults to 1.
+        crossover (int, optional): Crossover of the serial kernel used inside each task.
+    Returns:
+        List[List[Union[int, float]]] or np.ndarray: The product of the two matrices.
+    Raises:
+        ValueError: If the number of columns in the first matrix is not equal to the number of rows in the second matrix.
+        ValueError: If either matrix is not a rectangular matrix.
+        ValueError: If depth is smaller than 1."""
+    return _parallel_bilinear_multiply(matrix1, matrix2, STRASSEN, "strassen", workers, depth, crossover)
+
+
+def parallel_dc_matrix_mul(matrix1: Union[List[List[Union[int, float]]], np.ndarray],
+                           matrix2: Union[List[List[Union[int, float]]], np.ndarray],
+                           workers: Optional[int] = None, depth: int = 1) -> Union[List[List[Union[int, float]]], np.ndarray]:
+    """ Multiply matrices with the divide and conquer method, computing the eight
+    sub-products of the top depth levels in a process pool over shared memory.
+    Args:
+        matrix1 (List[List[Union[int, float]]] or np.ndarray): The first matrix.
+        matrix2 (List[List[Union[int, float]]] or np.ndarray): The second matrix.
+        workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        depth (int, optional): Number of levels fanned out to the pool. Defaults to 1.
+    Returns:
+        List[List[Union[int, float]]] or np.ndarray: The product of the two matrices.
+    Raises:
+        ValueError: If the number of columns in the first matrix is not equal to the number of rows in the second matrix.
+        ValueError: If either matrix is not a rectangular matrix.
+        ValueError: If depth is smaller than 1."""
+    return _parallel_bilinear_multiply(matrix1, matrix2, DIVIDE_AND_CONQUER, "classical", workers, depth, 0)
+
+
+if __name__ == "__main__":
+    import time
+
+    # Empty operands never reach the pool
+    assert parallel_strassen_multiply(np.zeros((3, 0)), np.zeros((0, 2))).shape == (3, 2)
+
+    rng = np.random.default_rng(0)
+    A, B = rng.standard_normal((2048, 2048)), rng.standard_normal((2048, 2048))
+    # Speedups need that many cores: with a single core, extra workers only add spawn cost
+    print(f"{os.cpu_count()} cores available")
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        parallel_strassen_multiply(A, B, workers=workers, depth=2)
+        print(f"{workers} workers: {time.perf_counter() - start:.3f} s")
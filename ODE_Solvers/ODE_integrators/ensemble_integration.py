@@ -0,0 +1,303 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
+import sys
+from pathlib import Path
+
+import numpy as np
+
+current_dir = Path().resolve()
+subdir_ode = current_dir / "ODE_Solvers" / "ODE_integrators"
+
+# Add subfolder to sys.path
+if str(subdir_ode) not in sys.path:
+    sys.path.append(str(subdir_ode))
+
+from ode_integrators import (DP_A, DP_B, DP_C, DP_E, EPSILON, FAILED, FINISHED, NOT_FINITE, STATUS_MESSAGES,
+                             STEP_LIMIT, STEP_TOO_SMALL, _hermite)
+
+ENSEMBLE_METHODS = ("rk4", "rk45")
+
+
+class EnsembleResult(NamedTuple):
+    """ Report of integrate_ensemble, one entry per member.
+    t: The time every member reached (t_end unless it stopped early).
+    y: The state at that time, shape (m, n).
+    y_eval: The solution at t_eval, shape (m, len(t_eval), n), nan where a member
+        stopped before; None without t_eval.
+    status: Status code of every member, see STATUS_MESSAGES.
+    steps: Accepted steps of every member.
+    rejected: Rejected steps of every member."""
+    t: np.ndarray
+    y: np.ndarray
+    y_eval: Optional[np.ndarray]
+    status: np.ndarray
+    steps: np.ndarray
+    rejected: np.ndarray
+
+    @property
+    def success(self) -> np.ndarray:
+        """ Boolean mask of the members that reached t_end."""
+        return self.status == FINISHED
+
+    def message(self, member: int) -> str:
+        return STATUS_MESSAGES[int(self.status[member])]
+
+
+def _call(f: Callable, t: np.ndarray, y: np.ndarray, params: Optional[np.ndarray]) -> np.ndarray:
+    values = f(t, y) if params is None else f(t, y, params)
+    return np.asarray(values, dtype=float).reshape(y.shape)
+
+
+def _initial_steps(f: Callable, t0: float, y0: np.ndarray, f0: np.ndarray, params: Optional[np.ndarray],
+                   rtol: float, atol: float, span: float) -> np.ndarray:
+    """ The starting step heuristic of integrate_ode, one step size per member."""
+    scale = atol + rtol * np.abs(y0)
+    d0 = np.sqrt(np.mean((y0 / scale) ** 2, axis=1))
+    d1 = np.sqrt(np.mean((f0 / scale) ** 2, axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h0 = np.where((d0 > 1e-5) & (d1 > 1e-5), 0.01 * d0 / d1, 1e-6)
+        h0 = np.minimum(h0, span)
+        d2 = np.sqrt(np.mean(((_call(f, np.full(h0.shape, t0) + h0, y0 + h0[:, None] * f0, params) - f0)
+                              / scale) ** 2, axis=1)) / h0
+        largest = np.maximum(d1, d2)
+        h1 = np.where(largest <= 1e-15, np.maximum(1e-6, 1e-3 * h0), (0.01 / largest) ** (1 / 5))
+    h = np.minimum(np.minimum(100 * h0, h1), span)
+    return np.where(np.isfinite(h) & (h > 0), h, 1e-6)
+
+
+def _integrate_members(f: Callable, t0: float, t_end: float, y0: np.ndarray, params: Optional[np.ndarray],
+                       method: str, h: Optional[float], rtol: float, atol: float, t_eval: Optional[np.ndarray],
+                       max_steps: int) -> Tuple[np.ndarray, ...]:
+    """ Advance all members together, each with its own time and step size.
+    Every pass over the loop attempts one step for every member that is still running,
+    with one call of f per stage on the stacked (active members, n) state."""
+    m, n = y0.shape
+    t = np.full(m, t0)
+    y = y0.copy()
+    status = np.full(m, STEP_LIMIT, dtype=np.int8)
+    steps = np.zeros(m, dtype=np.int64)
+    rejected = np.zeros(m, dtype=np.int64)
+    y_eval = None
+    next_output = np.zeros(m, dtype=np.int64)
+    if t_eval is not None:
+        y_eval = np.full((m, t_eval.shape[0], n), np.nan)
+        if t_eval[0] == t0:
+            y_eval[:, 0] = y
+            next_output[:] = 1
+
+    derivative = _call(f, t, y, params)
+    if method == "rk4":
+        step = np.full(m, float(h))
+    else:
+        step = np.full(m, float(h)) if h is not None else _initial_steps(f, t0, y, derivative, params, rtol,
+                                                                           atol, t_end - t0)
+    active = np.flatnonzero(np.isfinite(derivative).all(axis=1))
+    status[np.setdiff1d(np.arange(m), active)] = NOT_FINITE
+
+    for _ in range(max_steps):
+        if active.size == 0:
+            break
+        ta, ya, fa = t[active], y[active], derivative[active]
+        pa = None if params is None else params[active]
+        hs = np.minimum(step[active], t_end - ta)
+        with np.errstate(all="ignore"):
+            if method == "rk4":
+                k2 = _call(f, ta + hs / 2, ya + (hs / 2)[:, None] * fa, pa)
+                k3 = _call(f, ta + hs / 2, ya + (hs / 2)[:, None] * k2, pa)
+                k4 = _call(f, ta + hs, ya + hs[:, None] * k3, pa)
+                y_new = ya + (hs / 6)[:, None] * (fa + 2 * k2 + 2 * k3 + k4)
+                f_new = _call(f, ta + hs, y_new, pa)
+                error = np.where(np.isfinite(y_new).all(axis=1) & np.isfinite(f_new).all(axis=1), 0.0, np.inf)
+            else:
+                k = np.empty((7,) + ya.shape)
+                k[0] = fa
+                for stage in range(1, 6):
+                    k[stage] = _call(f, ta + DP_C[stage] * hs,
+                                     ya + hs[:, None] * np.tensordot(DP_A[stage, :stage], k[:stage], 1), pa)
+                y_new = ya + hs[:, None] * np.tensordot(DP_B, k[:6], 1)
+                k[6] = f_new = _call(f, ta + hs, y_new, pa)
+                scale = atol + rtol * np.maximum(np.abs(ya), np.abs(y_new))
+                error = np.sqrt(np.mean((hs[:, None] * np.tensordot(DP_E, k, 1) / scale) ** 2, axis=1))
+        finite = np.isfinite(error)
+        accepted = finite & (error <= 1)
+        rejected[active[~accepted]] += 1
+
+        # Accepted members move on, and write the t_eval points they passed
+        rows = np.flatnonzero(accepted)
+        members = active[rows]
+        # The last step lands on t_end exactly, ta + hs could fall just short of it
+        end = np.where(hs == t_end - ta, t_end, ta + hs)
+        t_new = end[rows]
+        if y_eval is not None:
+            pending = rows[next_output[members] < t_eval.shape[0]]
+            pending = pending[t_eval[np.minimum(next_output[active[pending]], t_eval.shape[0] - 1)]
+                              <= end[pending]]
+            while pending.size:
+                owners = active[pending]
+                times = t_eval[next_output[owners]]
+                y_eval[owners, next_output[owners]] = _hermite(ta[pending], hs[pending], ya[pending], fa[pending],
+                                                              y_new[pending], f_new[pending], times)
+                next_output[owners] += 1
+                pending = pending[next_output[owners] < t_eval.shape[0]]
+                pending = pending[t_eval[np.minimum(next_output[active[pending]], t_eval.shape[0] - 1)]
+                                  <= end[pending]]
+        t[members] = t_new
+        y[members] = y_new[rows]
+        derivative[members] = f_new[rows]
+        steps[members] += 1
+
+        # Next step sizes: only the adaptive method changes them
+        if method == "rk4":
+            status[active[~finite]] = NOT_FINITE
+        else:
+            with np.errstate(divide="ignore"):
+                factor = np.where(error == 0, 5.0, np.clip(0.9 * error ** (-1 / 5), 0.2, 5.0))
+            factor[~finite] = 0.2
+            step[active] = hs * factor
+            too_small = step[active] < 10 * EPSILON * np.maximum(np.abs(t[active]), 1e-300)
+            status[active[too_small]] = np.where(finite[too_small], STEP_TOO_SMALL, NOT_FINITE)
+        done = t[active] >= t_end - 10 * EPSILON * abs(t_end)
+        status[active[done]] = FINISHED
+        if y_eval is not None:
+            # Output times within rounding of t_end get the final state
+            for member in active[done][next_output[active[done]] < t_eval.shape[0]]:
+                y_eval[member, next_output[member]:] = y[member]
+                next_output[member] = t_eval.shape[0]
+        active = active[status[active] == STEP_LIMIT]
+    return t, y, y_eval, status, steps, rejected
+
+
+def _run_shard(f: Callable, t0: float, t_end: float, y0: np.ndarray, params: Optional[np.ndarray], method: str,
+               h: Optional[float], rtol: float, atol: float, t_eval: Optional[np.ndarray],
+               max_steps: int) -> Tuple[np.ndarray, ...]:
+    """ Integrate a shard of members. If f raises, the shard is split in halves and
+    retried, so that only the members for which f fails end up with status FAILED."""
+    try:
+        return _integrate_members(f, t0, t_end, y0, params, method, h, rtol, atol, t_eval, max_steps)
+    except Exception:
+        m, n = y0.shape
+        if m == 1:
+            y_eval = None if t_eval is None else np.full((1, t_eval.shape[0], n), np.nan)
+            return (np.full(1, t0), y0.copy(), y_eval, np.full(1, FAILED, dtype=np.int8),
+                    np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
+        half = m // 2
+        parts = [_run_shard(f, t0, t_end, y0[part], None if params is None else params[part], method, h,
+                            rtol, atol, t_eval, max_steps) for part in (slice(0, half), slice(half, m))]
+        return _concatenate(parts)
+
+
+def _concatenate(parts: Sequence[Tuple[np.ndarray, ...]]) -> Tuple[np.ndarray, ...]:
+    return tuple(None if part[0] is None else np.concatenate(part) for part in zip(*parts))
+
+
+def integrate_ensemble(f: Callable, t_span: Tuple[float, float], y0: np.ndarray,
+                       params: Optional[np.ndarray] = None, method: str = "rk45", h: Optional[float] = None,
+                       rtol: float = 1e-6, atol: float = 1e-9, t_eval: Optional[np.ndarray] = None,
+                       max_steps: int = 100_000, workers: Optional[int] = None,
+                       shards: Optional[int] = None) -> EnsembleResult:
+    """
+    Integrate the same system y' = f(t, y; p) for many initial states or parameter sets at once.
+
+    The m members are stacked into one (m, n) state. Every stage of a step calls f once
+    for all running members, each member keeps its own time and, for rk45, its own step
+    size chosen by the error control of integrate_ode. Members that finish, fail or run
+    out of steps drop out of the batch while the others continue, so one bad member
+    never aborts the rest.
+
+    Parameters:
+    - f: Vectorized right-hand side, called as f(t, y) or f(t, y, params) with t of
+      shape (k,), y of shape (k, n) and params holding the k matching rows of params.
+      Must be picklable if workers > 1.
+    - t_span: (t0, t_end) with t_end > t0.
+    - y0: Initial states, shape (m, n), or (n,) for the same start for every member.
+    - params: Per-member parameters, shape (m,) or (m, p).
+    - method: "rk4" (fixed step h) or "rk45" (Dormand-Prince 5(4)). Default is "rk45".
+    - h: Step size for rk4, first step for rk45 (estimated per member if None).
+    - rtol, atol: Tolerances of rk45.
+    - t_eval: Increasing output times inside t_span, interpolated per member.
+    - max_steps: Maximum number of attempted steps per member.
+    - workers: Integrate the shards on this many processes. Default runs in-process.
+    - shards: Number of shards, default workers (or 1 in-process).
+
+    Returns:
+    - An EnsembleResult with one entry per member.
+
+    Raises:
+    - ValueError: If the arguments are inconsistent or the method is unknown.
+    """
+    if method not in ENSEMBLE_METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose from {ENSEMBLE_METHODS}.")
+    t0, t_end = float(t_span[0]), float(t_span[1])
+    if not t_end > t0:
+        raise ValueError("t_span must be increasing.")
+    if method == "rk4" and (h is None or h <= 0):
+        raise ValueError("rk4 needs a positive step size h.")
+    y0 = np.asarray(y0, dtype=float)
+    if y0.ndim not in (1, 2):
+        raise ValueError("y0 must have shape (m, n) or (n,).")
+    if params is not None:
+        params = np.asarray(params, dtype=float)
+        members = params.shape[0]
+        if y0.ndim == 2 and y0.shape[0] != members:
+            raise ValueError("y0 and params must have the same number of members.")
+    else:
+        members = y0.shape[0] if y0.ndim == 2 else 1
+    y0 = np.array(np.broadcast_to(y0, (members, y0.shape[-1])))
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        if np.any(np.diff(t_eval) <= 0) or t_eval[0] < t0 or t_eval[-1] > t_end:
+            raise ValueError("t_eval must be increasing and inside t_span.")
+
+    executor = ProcessPoolExecutor(workers) if workers and workers > 1 else None
+    count = max(1, min(members, shards or (workers if executor is not None else 1)))
+    parts = np.array_split(np.arange(members), count)
+    arguments = [[f] * count, [t0] * count, [t_end] * count, [y0[part] for part in parts],
+                 [None if params is None else params[part] for part in parts], [method] * count, [h] * count,
+                 [rtol] * count, [atol] * count, [t_eval] * count, [max_steps] * count]
+    try:
+        if executor is None:
+            results = list(map(_run_shard, *arguments))
+        else:
+            results = list(executor.map(_run_shard, *arguments))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return EnsembleResult(*_concatenate(results))
+
+
+def radial_hydrogen(t: np.ndarray, y: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """ The radial Schrodinger equation of hydrogen in atomic units as a first order system,
+    u' = v, v' = (l (l + 1) / r^2 - 2 / r - 2 E) u, with params rows (E, l)."""
+    energy, l = params[:, 0], params[:, 1]
+    g = l * (l + 1) / t ** 2 - 2 / t - 2 * energy
+    return np.stack((y[:, 1], g * y[:, 0]), axis=1)
+
+
+if __name__ == "__main__":
+    import time
+
+    # Sweep the energy for l = 0 and l = 1; u(r_end) changes sign at the bound states
+    energies = np.linspace(-0.55, -0.1, 2000)
+    params = np.array([(energy, l) for l in (0, 1) for energy in energies])
+    r0 = 1e-6
+    y0 = np.stack((r0 ** (params[:, 1] + 1), (params[:, 1] + 1) * r0 ** params[:, 1]), axis=1)
+    start = time.perf_counter()
+    result = integrate_ensemble(radial_hydrogen, (r0, 25.0), y0, params, rtol=1e-8, atol=1e-12)
+    print(f"{params.shape[0]} members in {time.perf_counter() - start:.2f} s, "
+          f"{np.count_nonzero(result.success)} finished, median {np.median(result.steps):.0f} steps")
+    for l in (0, 1):
+        end = result.y[params[:, 1] == l, 0]
+        change = np.flatnonzero(np.sign(end[:-1]) != np.sign(end[1:]))
+        print(f"l = {l}: eigenvalues near {(energies[change] + energies[change + 1]) / 2}")
+
+    # A member whose right-hand side blows up does not stop the others
+    def blow_up(t, y, params):
+        return params[:, None] * y ** 2
+
+    result = integrate_ensemble(blow_up, (0.0, 1.0), [1.0], params=[0.5, 2.0, -1.0])
+    print(result.status, [result.message(member) for member in range(3)], result.y[:, 0])
+
+    # Fixed steps of 0.1 still land on t_end and fill the last t_eval point
+    result = integrate_ensemble(blow_up, (0.0, 1.0), [1.0], params=[-1.0, -0.5], method="rk4", h=0.1,
+                                t_eval=np.linspace(0, 1, 11))
+    assert not np.isnan(result.y_eval).any() and np.all(result.status == 0)
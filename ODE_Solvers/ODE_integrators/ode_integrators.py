@@ -0,0 +1,522 @@
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+import sys
+from pathlib import Path
+
+import numpy as np
+
+current_dir = Path().resolve()
+subdir_brent = current_dir / "Root_finding_algorithms" / "Hybrid_bracketing_method"
+subdir_lu = current_dir / "Matrix_operations" / "LU_Decomposition"
+
+# Add subfolders to sys.path
+for subdir in (subdir_brent, subdir_lu):
+    if str(subdir) not in sys.path:
+        sys.path.append(str(subdir))
+
+from hybrid_bracketing import brent
+from decompose_into_lu import lu_factor
+
+METHODS = ("rk4", "rk45", "ros2")
+EPSILON = 2.220446049250313e-16
+DEFAULT_CHUNK_ROWS = 4096  # Rows of the solution buffered before they are written out
+
+# Status codes of integrate_ode
+FINISHED = 0          # The end of the interval was reached
+TERMINAL_EVENT = 1    # A terminal event stopped the integration
+STEP_LIMIT = 2        # The step budget ran out
+STEP_TOO_SMALL = 3    # The step size fell below the resolution of t
+NOT_FINITE = 4        # The state became inf or nan (integrate_ensemble)
+FAILED = 5            # f raised an exception for this member (integrate_ensemble)
+
+STATUS_MESSAGES = {
+    FINISHED: "the end of the interval was reached",
+    TERMINAL_EVENT: "a terminal event occurred",
+    STEP_LIMIT: "maximum number of steps reached",
+    STEP_TOO_SMALL: "the step size became too small",
+    NOT_FINITE: "the state became inf or nan",
+    FAILED: "the right-hand side raised an exception",
+}
+
+# Dormand-Prince 5(4) tableau, with the first same as last property
+DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1])
+DP_A = np.array([
+    [0, 0, 0, 0, 0],
+    [1 / 5, 0, 0, 0, 0],
+    [3 / 40, 9 / 40, 0, 0, 0],
+    [44 / 45, -56 / 15, 32 / 9, 0, 0],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+])
+DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# Fifth minus fourth order weights, the last one multiplies f(t + h, y_new)
+DP_E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+# ROS2 (Verwer et al.), L-stable, second order for any approximation of the Jacobian
+ROS2_GAMMA = 1 + 1 / np.sqrt(2)
+
+
+class DenseOutput:
+    """ Piecewise cubic Hermite interpolant of an integration.
+    Every step contributes the cubic matching y and y' = f(t, y) at both of its ends,
+    so the interpolant is C^1 and costs nothing beyond the stored step data.
+    Args:
+        t (np.ndarray): The step boundaries, increasing.
+        y (np.ndarray): The solution at the boundaries, shape (len(t), n).
+        dy (np.ndarray): The derivatives at the boundaries, shape (len(t), n)."""
+
+    def __init__(self, t: np.ndarray, y: np.ndarray, dy: np.ndarray) -> None:
+        self.t = t
+        self.y = y
+        self.dy = dy
+
+    def __call__(self, t: np.ndarray) -> np.ndarray:
+        """ The interpolated solution at t, of shape t.shape + (n,)."""
+        t = np.asarray(t, dtype=float)
+        step = np.clip(np.searchsorted(self.t, t, side="right") - 1, 0, self.t.shape[0] - 2)
+        return _hermite(self.t[step], self.t[step + 1] - self.t[step], self.y[step], self.dy[step],
+                        self.y[step + 1], self.dy[step + 1], t)
+
+
+class OdeResult(NamedTuple):
+    """ Report of integrate_ode.
+    t: The output times (the accepted steps, or t_eval).
+    y: The solution at those times, shape (len(t), n); a view of out if one was given.
+    t_events: For every event, the times at which it occurred.
+    y_events: For every event, the solution at those times.
+    status: Status code, see STATUS_MESSAGES.
+    steps: Number of accepted steps.
+    rejected: Number of rejected steps.
+    evaluations: Number of evaluations of f, including those for finite difference Jacobians.
+    factorizations: Number of LU factorizations (ros2 only).
+    dense: The DenseOutput if dense_output was requested, else None."""
+    t: np.ndarray
+    y: np.ndarray
+    t_events: List[np.ndarray]
+    y_events: List[np.ndarray]
+    status: int
+    steps: int
+    rejected: int
+    evaluations: int
+    factorizations: int
+    dense: Optional[DenseOutput]
+
+    @property
+    def success(self) -> bool:
+        return self.status in (FINISHED, TERMINAL_EVENT)
+
+    @property
+    def message(self) -> str:
+        return STATUS_MESSAGES[self.status]
+
+
+def _hermite(t0, h, y0, f0, y1, f1, t):
+    """ Cubic Hermite interpolation on [t0, t0 + h], vectorized over the points t."""
+    theta = np.asarray((t - t0) / h)[..., None]
+    h = np.asarray(h)[..., None]
+    return ((1 + 2 * theta) * (1 - theta) ** 2 * y0 + theta * (1 - theta) ** 2 * h * f0
+            + theta ** 2 * (3 - 2 * theta) * y1 + theta ** 2 * (theta - 1) * h * f1)
+
+
+def _error_norm(error: np.ndarray, y: np.ndarray, y_new: np.ndarray, rtol: float, atol: float) -> float:
+    """ RMS norm of the error, weighted by atol + rtol |y|."""
+    scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+    return float(np.sqrt(np.mean((error / scale) ** 2)))
+
+
+def rk4_step(f: Callable, t: float, y: np.ndarray, h: float, f0: np.ndarray) -> Tuple[np.ndarray, None]:
+    """ One classical fourth order Runge-Kutta step, given f0 = f(t, y).
+    Returns the new state and None, since RK4 has no error estimate."""
+    k2 = f(t + h / 2, y + h / 2 * f0)
+    k3 = f(t + h / 2, y + h / 2 * k2)
+    k4 = f(t + h, y + h * k3)
+    return y + h / 6 * (f0 + 2 * k2 + 2 * k3 + k4), None
+
+
+def dormand_prince_step(f: Callable, t: float, y: np.ndarray, h: float, f0: np.ndarray
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ One Dormand-Prince 5(4) step, given f0 = f(t, y).
+    Returns the fifth order solution, f at the new point (the first stage of the
+    next step) and the local error estimate."""
+    k = np.empty((7,) + y.shape)
+    k[0] = f0
+    for stage in range(1, 6):
+        k[stage] = f(t + DP_C[stage] * h, y + h * (DP_A[stage, :stage] @ k[:stage]))
+    y_new = y + h * (DP_B @ k[:6])
+    k[6] = f(t + h, y_new)
+    return y_new, k[6], h * (DP_E @ k)
+
+
+def _numerical_jacobian(f: Callable, t: float, y: np.ndarray, f0: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Forward difference approximations of df/dy and df/dt, n + 1 evaluations of f."""
+    jacobian = np.empty((y.shape[0], y.shape[0]))
+    for j in range(y.shape[0]):
+        delta = np.sqrt(EPSILON) * max(1.0, abs(y[j]))
+        shifted = y.copy()
+        shifted[j] += delta
+        jacobian[:, j] = (f(t, shifted) - f0) / delta
+    delta = np.sqrt(EPSILON) * max(1.0, abs(t))
+    return jacobian, (f(t + delta, y) - f0) / delta
+
+
+def ros2_step(f: Callable, t: float, y: np.ndarray, h: float, f0: np.ndarray, factorization,
+              time_derivative: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ One ROS2 step with the LU factorization of W = I - gamma h J, given f0 = f(t, y).
+    Both stages solve with the same factorization, and the step stays second order
+    when J is only an approximation, so W can be reused over many steps.
+    Returns the new state and the error estimate against the embedded first order solution."""
+    shift = ROS2_GAMMA * h * time_derivative
+    k1 = factorization.solve(f0 + shift)
+    k2 = factorization.solve(f(t + h, y + h * k1) - 2 * k1 - shift)
+    return y + h * (1.5 * k1 + 0.5 * k2), 0.5 * h * (k1 + k2)
+
+
+class _ChunkedWriter:
+    """ Buffer output rows and write them to out (for example an np.memmap) one chunk
+    at a time, or collect the chunks in memory when out is None."""
+
+    def __init__(self, n: int, out: Optional[np.ndarray], chunk_rows: int) -> None:
+        self.out = out
+        self.rows = 0
+        self._t: List[np.ndarray] = []
+        self._chunks: List[np.ndarray] = []
+        self._buffer = np.empty((chunk_rows, n))
+        self._filled = 0
+
+    def write(self, t: np.ndarray, y: np.ndarray) -> None:
+        self._t.append(np.atleast_1d(t))
+        y = y.reshape(-1, self._buffer.shape[1])
+        while y.shape[0]:
+            take = min(y.shape[0], self._buffer.shape[0] - self._filled)
+            self._buffer[self._filled:self._filled + take] = y[:take]
+            self._filled += take
+            y = y[take:]
+            if self._filled == self._buffer.shape[0]:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._filled == 0:
+            return
+        if self.out is not None:
+            self.out[self.rows:self.rows + self._filled] = self._buffer[:self._filled]
+        else:
+            self._chunks.append(self._buffer[:self._filled].copy())
+        self.rows += self._filled
+        self._filled = 0
+
+    def finish(self) -> Tuple[np.ndarray, np.ndarray]:
+        self._flush()
+        t = np.concatenate(self._t) if self._t else np.empty(0)
+        if self.out is not None:
+            if hasattr(self.out, "flush"):
+                self.out.flush()  # np.memmap
+            return t, self.out[:self.rows]
+        if not self._chunks:
+            return t, np.empty((0, self._buffer.shape[1]))
+        return t, np.concatenate(self._chunks)
+
+
+def _initial_step(f: Callable, t0: float, y0: np.ndarray, f0: np.ndarray, order: int,
+                  rtol: float, atol: float, span: float) -> float:
+    """ Starting step size from the size of y, f and a finite difference estimate of y''."""
+    scale = atol + rtol * np.abs(y0)
+    d0 = np.sqrt(np.mean((y0 / scale) ** 2))
+    d1 = np.sqrt(np.mean((f0 / scale) ** 2))
+    h0 = 0.01 * d0 / d1 if d0 > 1e-5 and d1 > 1e-5 else 1e-6
+    h0 = min(h0, span)
+    d2 = np.sqrt(np.mean(((f(t0 + h0, y0 + h0 * f0) - f0) / scale) ** 2)) / h0
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, 1e-3 * h0)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / (order + 1))
+    return min(100 * h0, h1, span)
+
+
+def integrate_ode(f: Callable, t_span: Tuple[float, float], y0: Sequence[float], method: str = "rk45",
+                  h: Optional[float] = None, rtol: float = 1e-6, atol: float = 1e-9,
+                  t_eval: Optional[np.ndarray] = None, events: Sequence[Callable] = (),
+                  dense_output: bool = False, jacobian: Optional[Callable] = None,
+                  out: Optional[np.ndarray] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                  max_steps: int = 1_000_000) -> OdeResult:
+    """
+    Integrate the first order system y' = f(t, y) from t_span[0] to t_span[1].
+
+    Methods:
+    - "rk4": classical Runge-Kutta with the fixed step h.
+    - "rk45": Dormand-Prince 5(4) with embedded error control.
+    - "ros2": second order Rosenbrock method for stiff problems. The Jacobian (given, or
+      by forward differences) is kept across steps and step size changes, and only
+      evaluated again when a step is rejected at the step size of the last accepted
+      step; df/dt costs one evaluation per step. The LU factorization of I - gamma h J
+      is reused as long as h stays the same: the controller keeps h when the proposed
+      factor lies in [0.8, 1.2], and never grows h right after a rejection.
+
+    The adaptive methods accept a step when the RMS of error / (atol + rtol |y|) is at most 1.
+
+    Events are callables g(t, y); a sign change of g over a step is located with Brent's
+    method on the cubic Hermite interpolant of the step. A crossing that Brent's method
+    does not resolve within its iteration limit keeps the last estimate instead of
+    raising. Like in SciPy, an event may carry the attributes terminal (stop at the first
+    occurrence) and direction (> 0: only upward crossings, < 0: only downward ones).
+
+    Parameters:
+    - f: Right-hand side, called as f(t, y) with y a 1-D array.
+    - t_span: (t0, t_end) with t_end > t0.
+    - y0: Initial state.
+    - method: One of METHODS. Default is "rk45".
+    - h: Step size for rk4, first step for the adaptive methods (estimated if None).
+    - rtol, atol: Relative and absolute tolerances of the adaptive methods.
+    - t_eval: Increasing output times inside t_span, interpolated between steps. If None,
+      every accepted step is returned.
+    - events: Event functions, see above.
+    - dense_output: Also return a DenseOutput covering the whole integration.
+    - jacobian: Optional df/dy(t, y) for ros2.
+    - out: Preallocated array (for example np.lib.format.open_memmap) of shape
+      (len(t_eval), n) that receives the solution. Requires t_eval.
+    - chunk_rows: Number of rows buffered before they are written out. Default is 4096.
+    - max_steps: Maximum number of accepted and rejected steps.
+
+    Returns:
+    - An OdeResult.
+
+    Raises:
+    - ValueError: If the arguments are inconsistent or the method is unknown.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose from {METHODS}.")
+    t0, t_end = float(t_span[0]), float(t_span[1])
+    if not t_end > t0:
+        raise ValueError("t_span must be increasing.")
+    if method == "rk4" and (h is None or h <= 0):
+        raise ValueError("rk4 needs a positive step size h.")
+    y = np.array(y0, dtype=float).reshape(-1)
+    n = y.shape[0]
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        if np.any(np.diff(t_eval) <= 0) or t_eval[0] < t0 or t_eval[-1] > t_end:
+            raise ValueError("t_eval must be increasing and inside t_span.")
+    if out is not None:
+        if t_eval is None:
+            raise ValueError("out requires t_eval, which fixes the number of rows.")
+        if out.shape != (t_eval.shape[0], n):
+            raise ValueError(f"out must have shape {(t_eval.shape[0], n)}.")
+
+    evaluations = 0
+
+    def rhs(t: float, state: np.ndarray) -> np.ndarray:
+        nonlocal evaluations
+        evaluations += 1
+        return np.asarray(f(t, state), dtype=float).reshape(n)
+
+    writer = _ChunkedWriter(n, out, chunk_rows)
+    next_output = 0  # Index of the next pending entry of t_eval
+    if t_eval is None:
+        writer.write(t0, y)
+    elif t_eval[0] == t0:
+        writer.write(t0, y)
+        next_output = 1
+
+    t = t0
+    f_current = rhs(t, y)
+    event_values = [g(t, y) for g in events]
+    t_events: List[list] = [[] for _ in events]
+    y_events: List[list] = [[] for _ in events]
+    dense_t, dense_y, dense_dy = [t], [y], [f_current]
+
+    order = {"rk4": 4, "rk45": 5, "ros2": 2}[method]
+    if h is None:
+        h = _initial_step(rhs, t, y, f_current, order, rtol, atol, t_end - t0)
+    factorizations = 0
+    factorization = None
+    factored_h = None
+    jacobian_matrix = time_derivative = derivative_t = None
+    jacobian_fresh = False
+    accepted_h = None  # Size of the last accepted step
+    after_rejection = False
+
+    status = STEP_LIMIT
+    steps = rejected = 0
+    while steps + rejected < max_steps:
+        if t_end - t <= 10 * EPSILON * abs(t):
+            status = FINISHED
+            if t_eval is not None and next_output < t_eval.shape[0]:
+                # Output times within rounding of t_end
+                times = t_eval[next_output:]
+                writer.write(times, np.tile(y, (times.shape[0], 1)))
+                next_output = t_eval.shape[0]
+            break
+        h_step = min(h, t_end - t)
+        # The last step lands on t_end exactly, t + h_step could fall just short of it
+        t_new = t_end if h_step == t_end - t else t + h_step
+        if method != "rk4" and h_step < 10 * EPSILON * abs(t):
+            status = STEP_TOO_SMALL
+            break
+
+        # Attempt a step
+        if method == "rk4":
+            y_new, _ = rk4_step(rhs, t, y, h_step, f_current)
+            f_new = rhs(t_new, y_new)
+            error = 0.0
+        elif method == "rk45":
+            y_new, f_new, local_error = dormand_prince_step(rhs, t, y, h_step, f_current)
+            error = _error_norm(local_error, y, y_new, rtol, atol)
+        else:
+            if jacobian_matrix is None:
+                if jacobian is not None:
+                    jacobian_matrix = np.asarray(jacobian(t, y), dtype=float)
+                    delta = np.sqrt(EPSILON) * max(1.0, abs(t))
+                    time_derivative = (rhs(t + delta, y) - f_current) / delta
+                else:
+                    jacobian_matrix, time_derivative = _numerical_jacobian(rhs, t, y, f_current)
+                jacobian_fresh = True
+                factorization = None
+                derivative_t = t
+            elif derivative_t != t:
+                # J is kept, but df/dt is refreshed at every new t: one evaluation, no factorization
+                delta = np.sqrt(EPSILON) * max(1.0, abs(t))
+                time_derivative = (rhs(t + delta, y) - f_current) / delta
+                derivative_t = t
+            if factorization is None or factored_h != h_step:
+                factorization = lu_factor(np.eye(n) - ROS2_GAMMA * h_step * jacobian_matrix)
+                factored_h = h_step
+                factorizations += 1
+            if factorization.is_singular():
+                y_new, error = y, np.inf
+            else:
+                y_new, local_error = ros2_step(rhs, t, y, h_step, f_current, factorization, time_derivative)
+                error = _error_norm(local_error, y, y_new, rtol, atol)
+            f_new = None
+
+        if not np.isfinite(error) or error > 1:
+            rejected += 1
+            h = h_step * (0.2 if not np.isfinite(error) else max(0.2, 0.9 * error ** (-1 / order)))
+            if method == "ros2" and not jacobian_fresh and h_step == accepted_h:
+                jacobian_matrix = None  # The step size did not change, a stale Jacobian may be to blame
+            after_rejection = True
+            continue
+
+        if f_new is None:
+            f_new = rhs(t_new, y_new)
+        steps += 1
+        jacobian_fresh = False
+        accepted_h = h_step
+
+        # Events, located on the Hermite interpolant of the step
+        terminal_time = None
+        found = []
+        for index, g in enumerate(events):
+            value = g(t_new, y_new)
+            old = event_values[index]
+            event_values[index] = value
+            direction = getattr(g, "direction", 0)
+            if old == 0 or old * value > 0 or (direction > 0 and old > 0) or (direction < 0 and old < 0):
+                continue
+
+            def crossing(s: float, g=g) -> float:
+                return g(s, _hermite(t, h_step, y, f_current, y_new, f_new, s))
+
+            # The interpolant is only approximate anyway: a slow crossing keeps the last estimate
+            t_root = brent(crossing, t, t_new, full_output=True).root
+            found.append((t_root, index))
+            if getattr(g, "terminal", False) and (terminal_time is None or t_root < terminal_time):
+                terminal_time = t_root
+        for t_root, index in sorted(found):
+            if terminal_time is not None and t_root > terminal_time:
+                continue
+            t_events[index].append(t_root)
+            y_events[index].append(_hermite(t, h_step, y, f_current, y_new, f_new, t_root))
+        if terminal_time is not None:
+            y_stop = _hermite(t, h_step, y, f_current, y_new, f_new, terminal_time)
+            f_stop = rhs(terminal_time, y_stop)
+            # Reinterpolate the outputs on the truncated step
+            h_step = terminal_time - t
+            y_new, f_new, t_new = y_stop, f_stop, terminal_time
+
+        # Output
+        if t_eval is None:
+            writer.write(t_new, y_new)
+        else:
+            stop = np.searchsorted(t_eval, t_new, side="right")
+            if stop > next_output:
+                times = t_eval[next_output:stop]
+                writer.write(times, _hermite(t, h_step, y, f_current, y_new, f_new, times))
+                next_output = stop
+        if dense_output:
+            dense_t.append(t_new)
+            dense_y.append(y_new)
+            dense_dy.append(f_new)
+
+        t, y, f_current = t_new, y_new, f_new
+        if terminal_time is not None:
+            status = TERMINAL_EVENT
+            break
+
+        # Next step size
+        if method != "rk4":
+            factor = 5.0 if error == 0 else min(5.0, max(0.2, 0.9 * error ** (-1 / order)))
+            if after_rejection:
+                factor = min(factor, 1.0)  # Do not grow right after a rejection, as in SciPy
+            if method == "ros2" and 0.8 <= factor <= 1.2:
+                factor = 1.0  # Keep h, and with it the factorization
+            h = h_step * factor
+        after_rejection = False
+
+    t_out, y_out = writer.finish()
+    dense = DenseOutput(np.array(dense_t), np.array(dense_y), np.array(dense_dy)) if dense_output else None
+    return OdeResult(t_out, y_out, [np.array(times) for times in t_events],
+                     [np.array(states).reshape(-1, n) for states in y_events],
+                     status, steps, rejected, evaluations, factorizations, dense)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    # Harmonic oscillator y'' = -y, exact solution (cos t, -sin t)
+    def oscillator(t: float, y: np.ndarray) -> np.ndarray:
+        return np.array([y[1], -y[0]])
+
+    for method in METHODS:
+        result = integrate_ode(oscillator, (0.0, 10.0), [1.0, 0.0], method=method, h=0.01, rtol=1e-6, atol=1e-9)
+        print(f"{method}: error {abs(result.y[-1, 0] - np.cos(10.0)):.2e}, "
+              f"{result.steps} steps, {result.evaluations} evaluations")
+
+    # Ten steps of 0.1 add up to 0.9999999999999999: the last step must still land on t_end
+    result = integrate_ode(oscillator, (0.0, 1.0), [1.0, 0.0], method="rk4", h=0.1, t_eval=np.linspace(0, 1, 11))
+    assert result.y.shape == (11, 2) and result.t[-1] == 1.0
+
+    # Stiff Van der Pol oscillator, mu = 1000
+    def van_der_pol(t: float, y: np.ndarray) -> np.ndarray:
+        return np.array([y[1], 1000 * (1 - y[0] ** 2) * y[1] - y[0]])
+
+    for method in ("ros2", "rk45"):
+        start = time.perf_counter()
+        result = integrate_ode(van_der_pol, (0.0, 300.0), [2.0, 0.0], method=method, rtol=1e-4, atol=1e-6,
+                               max_steps=20_000)
+        print(f"{method}: {result.message}, {result.steps} steps, {result.factorizations} factorizations,"
+              f" {time.perf_counter() - start:.2f} s")
+
+    # Stiff relaxation towards cos t: few rejections and the factorization is reused over many steps
+    result = integrate_ode(lambda t, y: -1e4 * (y - np.cos(t)) - np.sin(t), (0.0, 1.0), [1.0], method="ros2", rtol=1e-5)
+    print(f"ros2: {result.steps} steps, {result.rejected} rejected, {result.factorizations} factorizations")
+    assert result.rejected < result.steps // 10 and result.factorizations < result.steps // 10
+
+    # Terminal event: a ball thrown upwards hits the ground
+    def ground(t: float, y: np.ndarray) -> float:
+        return y[0]
+    ground.terminal, ground.direction = True, -1
+
+    result = integrate_ode(lambda t, y: np.array([y[1], -9.81]), (0.0, 10.0), [0.0, 10.0],
+                           events=[ground], dense_output=True)
+    print(result.t_events[0], 2 * 10 / 9.81, result.dense(1.0), 10 - 9.81 / 2)
+
+    # A triple zero of the event function, where interpolation converges slowly
+    result = integrate_ode(oscillator, (0.0, 10.0), [1.0, 0.0], events=[lambda t, y: y[0] ** 3])
+    assert np.allclose(result.t_events[0], np.pi / 2 + np.pi * np.arange(3), atol=1e-5)
+
+    # Long integration written in chunks to a memory-mapped file
+    t_eval = np.linspace(0, 1000, 200_001)
+    with tempfile.TemporaryDirectory() as folder:
+        out = np.lib.format.open_memmap(str(Path(folder) / "solution.npy"), mode="w+", shape=(t_eval.shape[0], 2))
+        result = integrate_ode(oscillator, (0.0, 1000.0), [1.0, 0.0], t_eval=t_eval, out=out, rtol=1e-9, atol=1e-12)
+        print(type(result.y).__name__, result.y.shape, np.max(np.abs(result.y[:, 0] - np.cos(t_eval))))
+        del out, result
@@ -1,40 +1,70 @@
-def bisection_method(f, lower_lim: float, high_lim: float, tolerance: float = 1e-8, iterations: int = 1000) -> float:
+from typing import Union
+import sys
+from pathlib import Path
+
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Root_finding_algorithms" / "root_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from root_utils import CONVERGED, MAX_ITERATIONS, RootResult, counted
+
+
+def bisection_method(f, lower_lim: float, high_lim: float, tolerance: float = 1e-8, iterations: int = 1000,
+                     full_output: bool = False) -> Union[float, RootResult]:
     """ This function implements the bisection method to find the root of
       a function f(x) in the interval [lower_lim, high_lim] with a 
-      tolerance of tolerance.
+      tolerance of tolerance. f is evaluated once per new point: the value
+      at the lower limit is carried forward instead of being recomputed.
     Args:
         f (function): The function for which we want to find the root.
         lower_lim (float): The lower limit of the interval.
         high_lim (float): The upper limit of the interval.
         tolerance (float, optional): The tolerance of the method. Defaults to 1e-8.
         iterations (int, optional): The maximum number of iterations. Defaults to 1000.
+        full_output (bool, optional): Return a RootResult with the iteration and function
+            call counts instead of the root, and report a failure to converge in its
+            status instead of raising. Defaults to False.
     Returns:
-        float: The root of the function.
+        float or RootResult: The root of the function.
     Raises:
         ValueError: If the root is not in the interval.
         ValueError: If the maximum number of iterations was reached.
     """
+    f = counted(f)
+    calls_before = f.calls
+    max_iterations = iterations
+    f_lower = f(lower_lim)
+
     # Check if the root is in the interval
-    if f(lower_lim) * f(high_lim) >= 0:
+    if f_lower * f(high_lim) >= 0:
         raise ValueError("The root is not in the interval.")
       
     # Initialize the variables
     middle_val = (lower_lim + high_lim) / 2
+    f_middle = f(middle_val)
 
     # Iterate until the root is found
     # We check for 3 conditions for robustness:
     # 1. The function value is smaller than the tolerance
     # 2. The maximum number of iterations was reached
     # 3. The lower limit is smaller than the upper limit
-    while (abs(f(middle_val)) > tolerance) and (iterations > 0) and (lower_lim < high_lim):
+    while (abs(f_middle) > tolerance) and (iterations > 0) and (lower_lim < high_lim):
         # Check if the root is in the left or right half of the interval
-        if f(lower_lim) * f(middle_val) < 0:
+        if f_lower * f_middle < 0:
             high_lim = middle_val  # Set the new upper limit
         else:
             lower_lim = middle_val  # f(lower_lim) * f(middle_val) > 0
+            f_lower = f_middle
         # Calculate the new middle value
         middle_val = (lower_lim + high_lim) / 2
+        f_middle = f(middle_val)
         iterations -= 1  # Decrease the number of iterations
-    if iterations == 0:
+    status = MAX_ITERATIONS if iterations == 0 else CONVERGED
+    if full_output:
+        return RootResult(middle_val, max_iterations - iterations, f.calls - calls_before, status)
+    if status == MAX_ITERATIONS:
         raise ValueError("The maximum number of iterations was reached.")
-    return middle_val
\ No newline at end of file
+    return middle_val
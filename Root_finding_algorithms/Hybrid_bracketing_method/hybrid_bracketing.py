@@ -0,0 +1,285 @@
+from typing import List, Union
+import math
+import sys
+from pathlib import Path
+
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Root_finding_algorithms" / "root_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from root_utils import CONVERGED, MAX_ITERATIONS, RootResult, counted
+
+METHODS = ("brent", "illinois", "anderson_bjorck", "itp")
+EPSILON = 2.220446049250313e-16
+
+
+def _finish(result: RootResult, full_output: bool) -> Union[float, RootResult]:
+    """ Return the root, the full report, or raise if the method did not converge."""
+    if full_output:
+        return result
+    if result.status != CONVERGED:
+        raise ValueError(f"Could not find root after {result.iterations} iterations. Last estimate is {result.root}")
+    return result.root
+
+
+def _bracket(f, lower_lim: float, upper_lim: float):
+    """ Evaluate f at both limits and check that they bracket a root."""
+    f_lower, f_upper = f(lower_lim), f(upper_lim)
+    if (f_lower > 0 and f_upper > 0) or (f_lower < 0 and f_upper < 0):  # A product could underflow
+        raise ValueError("The function must have opposite signs at the limits.")
+    return f_lower, f_upper
+
+
+def _safeguard_bisect(widths: List[float], remaining: int, xtol: float) -> bool:
+    """ The bisection safeguard of the interpolating methods. widths holds the bracket
+    width at the start of every iteration. Bisect if the bracket has not at least
+    halved over the last two iterations, or once the remaining iterations are only
+    just enough for bisection to shrink it below xtol, so the methods converge
+    whenever bisection would within the same maxiter."""
+    if widths[-1] > widths[-3] / 2:
+        return True
+    return remaining <= math.floor(math.log2(max(widths[-1] / xtol, 1))) + 2
+
+
+def brent(f, lower_lim: float, upper_lim: float, xtol: float = 2e-12, rtol: float = 4 * EPSILON,
+          maxiter: int = 100, full_output: bool = False) -> Union[float, RootResult]:
+    """ Brent's method: inverse quadratic interpolation or secant steps, falling
+    back to bisection whenever the interpolated step is too long, shrinks too
+    slowly or cannot be computed (a zero or non-finite denominator). With the
+    safeguard of _safeguard_bisect the root stays bracketed and is found within
+    maxiter whenever bisection finds it, and superlinearly near a simple root.
+    Args:
+        f: Function to find the root of.
+        lower_lim (float): One end of the bracket.
+        upper_lim (float): The other end of the bracket. f must change sign between the limits.
+        xtol (float, optional): Absolute tolerance on the root. Defaults to 2e-12.
+        rtol (float, optional): Relative tolerance on the root. Defaults to 4 machine epsilons.
+        maxiter (int, optional): Maximum number of iterations. Defaults to 100.
+        full_output (bool, optional): Return a RootResult instead of the root, and report a
+            failure to converge in its status instead of raising. Defaults to False.
+    Returns:
+        float or RootResult: The root of the function.
+    Raises:
+        ValueError: If the function has the same sign at both limits.
+        ValueError: If the maximum number of iterations was reached."""
+    f = counted(f)
+    calls_before = f.calls
+    x_previous, x_current = lower_lim, upper_lim
+    f_previous, f_current = _bracket(f, lower_lim, upper_lim)
+    if f_previous == 0:
+        return _finish(RootResult(x_previous, 0, f.calls - calls_before, CONVERGED), full_output)
+
+    # x_block is the far end of the bracket, s_previous/s_current the last two steps
+    x_block, f_block = x_previous, f_previous
+    s_previous = s_current = x_current - x_previous
+    widths = [math.inf, math.inf]  # Bracket widths for the bisection safeguard
+    for iteration in range(maxiter):
+        if f_previous != 0 and f_current != 0 and (f_previous < 0) != (f_current < 0):
+            x_block, f_block = x_previous, f_previous
+            s_previous = s_current = x_current - x_previous
+        if abs(f_block) < abs(f_current):
+            # Keep the best point in x_current
+            x_previous, x_current, x_block = x_current, x_block, x_current
+            f_previous, f_current, f_block = f_current, f_block, f_current
+
+        delta = (xtol + rtol * abs(x_current)) / 2
+        s_bisect = (x_block - x_current) / 2
+        if f_current == 0 or abs(s_bisect) < delta:
+            return _finish(RootResult(x_current, iteration, f.calls - calls_before, CONVERGED), full_output)
+        widths.append(abs(2 * s_bisect))
+        if (not _safeguard_bisect(widths, maxiter - iteration, xtol)
+                and abs(s_previous) > delta and abs(f_current) < abs(f_previous)):
+            if x_previous == x_block:
+                # Secant step
+                numerator, denominator = -f_current * (x_current - x_previous), f_current - f_previous
+            else:
+                # Inverse quadratic interpolation
+                d_previous = (f_previous - f_current) / (x_previous - x_current)
+                d_block = (f_block - f_current) / (x_block - x_current)
+                numerator = -f_current * (f_block * d_block - f_previous * d_previous)
+                denominator = d_block * d_previous * (f_block - f_previous)
+            # Python floats raise on division by zero: bisect when the interpolation degenerates
+            s_try = numerator / denominator if denominator != 0 and math.isfinite(denominator) else math.inf
+            if 2 * abs(s_try) < min(abs(s_previous), 3 * abs(s_bisect) - delta):
+                s_previous, s_current = s_current, s_try
+            else:
+                s_previous = s_current = s_bisect
+        else:
+            s_previous = s_current = s_bisect
+
+        x_previous, f_previous = x_current, f_current
+        if abs(s_current) > delta:
+            x_current += s_current
+        else:
+            x_current += delta if s_bisect > 0 else -delta
+        f_current = f(x_current)
+
+    return _finish(RootResult(x_current, maxiter, f.calls - calls_before, MAX_ITERATIONS), full_output)
+
+
+def _modified_false_position(f, lower_lim: float, upper_lim: float, xtol: float, rtol: float, maxiter: int,
+                             full_output: bool, anderson_bjorck: bool) -> Union[float, RootResult]:
+    """ Regula falsi in which the function value kept at a stale end is scaled down,
+    so that end cannot stay fixed: by 1/2 (Illinois) or by 1 - f(c)/f(b)
+    (Anderson-Bjorck, falling back to 1/2 when that factor is not positive).
+    The bisection safeguard of _safeguard_bisect keeps the worst case within maxiter
+    whenever bisection converges within it. Interpolated points are kept at least half a tolerance away from the
+    ends of the bracket, so the far end moves once the root is resolved."""
+    f = counted(f)
+    calls_before = f.calls
+    a, b = lower_lim, upper_lim
+    f_a, f_b = _bracket(f, a, b)
+    if f_a == 0:
+        return _finish(RootResult(a, 0, f.calls - calls_before, CONVERGED), full_output)
+    if f_b == 0:
+        return _finish(RootResult(b, 0, f.calls - calls_before, CONVERGED), full_output)
+
+    widths = [math.inf, math.inf]
+    for iteration in range(1, maxiter + 1):
+        tolerance = xtol + rtol * abs(b)
+        widths.append(abs(b - a))
+        bisect = _safeguard_bisect(widths, maxiter - iteration + 1, xtol)
+        if bisect:
+            c = a + (b - a) / 2
+        else:
+            c = b - f_b * (b - a) / (f_b - f_a)
+            # Stay inside the bracket, at least tolerance / 2 away from both ends
+            low, high = min(a, b) + tolerance / 2, max(a, b) - tolerance / 2
+            c = min(max(c, low), high) if low < high else a + (b - a) / 2
+        f_c = f(c)
+        if (f_c < 0) != (f_b < 0) and f_c != 0:
+            # The root lies between b and c: b becomes the far end
+            a, f_a = b, f_b
+        elif not bisect:
+            # The far end a is kept a second time, shrink its function value
+            factor = 1 - f_c / f_b if anderson_bjorck else 0.5
+            f_a *= factor if factor > 0 else 0.5
+        b, f_b = c, f_c
+        if f_c == 0 or abs(b - a) <= xtol + rtol * abs(b):
+            return _finish(RootResult(b, iteration, f.calls - calls_before, CONVERGED), full_output)
+
+    return _finish(RootResult(b, maxiter, f.calls - calls_before, MAX_ITERATIONS), full_output)
+
+
+def illinois(f, lower_lim: float, upper_lim: float, xtol: float = 2e-12, rtol: float = 4 * EPSILON,
+             maxiter: int = 100, full_output: bool = False) -> Union[float, RootResult]:
+    """ The Illinois variant of regula falsi, superlinear (order about 1.44) and
+    without the stalling end point of regular_falsi; a bisection safeguard keeps
+    the worst case close to bisection. Arguments as for brent."""
+    return _modified_false_position(f, lower_lim, upper_lim, xtol, rtol, maxiter, full_output, False)
+
+
+def anderson_bjorck(f, lower_lim: float, upper_lim: float, xtol: float = 2e-12, rtol: float = 4 * EPSILON,
+                    maxiter: int = 100, full_output: bool = False) -> Union[float, RootResult]:
+    """ The Anderson-Bjorck variant of regula falsi, usually the fastest of the false
+    position family. Like illinois it falls back to bisection whenever the bracket
+    shrinks too slowly. Arguments as for brent."""
+    return _modified_false_position(f, lower_lim, upper_lim, xtol, rtol, maxiter, full_output, True)
+
+
+def itp(f, lower_lim: float, upper_lim: float, xtol: float = 2e-12, maxiter: int = 100,
+        k1: float = 0.2, k2: float = 2.0, n0: int = 1, full_output: bool = False) -> Union[float, RootResult]:
+    """ The ITP (interpolate, truncate, project) method. A false position estimate
+    is truncated towards the midpoint and projected into a ball around it, which
+    guarantees at most n0 more iterations than bisection while converging
+    superlinearly on smooth functions.
+    Args:
+        f: Function to find the root of.
+        lower_lim (float): One end of the bracket.
+        upper_lim (float): The other end of the bracket. f must change sign between the limits.
+        xtol (float, optional): Half-width of the final bracket. Defaults to 2e-12.
+        maxiter (int, optional): Maximum number of iterations. Defaults to 100.
+        k1 (float, optional): Truncation factor, scaled by the initial bracket width. Defaults to 0.2.
+        k2 (float, optional): Truncation exponent, in [1, 2.618). Defaults to 2.
+        n0 (int, optional): Iterations allowed beyond bisection. Defaults to 1.
+        full_output (bool, optional): Return a RootResult instead of the root. Defaults to False.
+    Returns:
+        float or RootResult: The root of the function.
+    Raises:
+        ValueError: If the function has the same sign at both limits.
+        ValueError: If the maximum number of iterations was reached."""
+    f = counted(f)
+    calls_before = f.calls
+    a, b = min(lower_lim, upper_lim), max(lower_lim, upper_lim)
+    f_a, f_b = _bracket(f, a, b)
+    if f_a == 0 or f_b == 0:
+        return _finish(RootResult(a if f_a == 0 else b, 0, f.calls - calls_before, CONVERGED), full_output)
+    sign = 1 if f_b > 0 else -1  # Work with sign * f, which is negative at a and positive at b
+    f_a, f_b = sign * f_a, sign * f_b
+
+    k1 = k1 / (b - a)
+    n_max = max(0, math.ceil(math.log2((b - a) / (2 * xtol)))) + n0
+    for iteration in range(maxiter):
+        if b - a <= 2 * xtol:
+            return _finish(RootResult((a + b) / 2, iteration, f.calls - calls_before, CONVERGED), full_output)
+        middle = (a + b) / 2
+        radius = xtol * 2 ** (n_max - iteration) - (b - a) / 2
+        delta = k1 * (b - a) ** k2
+        # Interpolate
+        x_f = (f_b * a - f_a * b) / (f_b - f_a)
+        # Truncate
+        direction = 1 if middle >= x_f else -1
+        x_t = x_f + direction * delta if delta <= abs(middle - x_f) else middle
+        # Project
+        x_itp = x_t if abs(x_t - middle) <= radius else middle - direction * radius
+        f_itp = sign * f(x_itp)
+        if f_itp > 0:
+            b, f_b = x_itp, f_itp
+        elif f_itp < 0:
+            a, f_a = x_itp, f_itp
+        else:
+            return _finish(RootResult(x_itp, iteration + 1, f.calls - calls_before, CONVERGED), full_output)
+
+    return _finish(RootResult((a + b) / 2, maxiter, f.calls - calls_before, MAX_ITERATIONS), full_output)
+
+
+def hybrid_bracketing(f, lower_lim: float, upper_lim: float, method: str = "brent", xtol: float = 2e-12,
+                      maxiter: int = 100, full_output: bool = False) -> Union[float, RootResult]:
+    """ Find a bracketed root with one of the hybrid methods.
+    Args:
+        f: Function to find the root of.
+        lower_lim (float): One end of the bracket.
+        upper_lim (float): The other end of the bracket.
+        method (str, optional): "brent", "illinois", "anderson_bjorck" or "itp". Defaults to "brent".
+        xtol (float, optional): Absolute tolerance on the root. Defaults to 2e-12.
+        maxiter (int, optional): Maximum number of iterations. Defaults to 100.
+        full_output (bool, optional): Return a RootResult instead of the root. Defaults to False.
+    Returns:
+        float or RootResult: The root of the function.
+    Raises:
+        ValueError: If the method is unknown, the limits do not bracket a root or
+            the maximum number of iterations was reached."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose from {METHODS}.")
+    solver = {"brent": brent, "illinois": illinois, "anderson_bjorck": anderson_bjorck, "itp": itp}[method]
+    return solver(f, lower_lim, upper_lim, xtol=xtol, maxiter=maxiter, full_output=full_output)
+
+
+if __name__ == "__main__":
+    subdir_bisection = current_dir / "Root_finding_algorithms" / "Bisection_method"
+    if str(subdir_bisection) not in sys.path:
+        sys.path.append(str(subdir_bisection))
+    from biscection import bisection_method
+
+    problems = {
+        "x^3 - 2x - 5": (lambda x: x ** 3 - 2 * x - 5, 2, 3),
+        "exp(x) - 1e4": (lambda x: math.exp(x) - 1e4, 0, 20),
+        "x^10 - 0.5": (lambda x: x ** 10 - 0.5, 0, 1.5),
+    }
+    for name, (f, a, b) in problems.items():
+        reference = bisection_method(f, a, b, tolerance=1e-10, full_output=True)
+        calls = ", ".join(f"{method} {hybrid_bracketing(f, a, b, method, full_output=True).function_calls}"
+                          for method in METHODS)
+        print(f"{name:>13}: bisection {reference.function_calls}, {calls} evaluations")
+
+    # The bisection safeguard keeps every method on the right root and within maxiter,
+    # also on odd powers where interpolation crawls and x^19 where it divides by zero
+    for method in METHODS:
+        assert abs(hybrid_bracketing(lambda x: math.exp(x) - 1e4, 0, 20, method) - math.log(1e4)) < 1e-9
+        assert abs(hybrid_bracketing(lambda x: (x - 1) ** 3, -3, 2, method) - 1) < 1e-9
+        assert abs(hybrid_bracketing(lambda x: x ** 3, -1, 2, method)) < 1e-9
+        assert abs(hybrid_bracketing(lambda x: x ** 9, -1, 3, method)) < 1e-9
+        assert abs(hybrid_bracketing(lambda x: x ** 19, -1, 3, method)) < 1e-9
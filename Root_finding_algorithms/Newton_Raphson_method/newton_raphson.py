@@ -1,5 +1,36 @@
-def newton_raphson(f, x0, h: float = 1e-5, max_iter:int = 1000, tol:float = 1e-5) -> float:
+from typing import Callable, Optional, Union
+import sys
+from pathlib import Path
+
+import numpy as np
+
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Root_finding_algorithms" / "root_utils"
+subdir_dual = current_dir / "Differentiation_algorithms" / "automatic_differentiation"
+subdir_lu = current_dir / "Matrix_operations" / "LU_Decomposition"
+
+# Add subfolders to sys.path
+for subdir in (subdir_utils, subdir_dual, subdir_lu):
+    if str(subdir) not in sys.path:
+        sys.path.append(str(subdir))
+
+from root_utils import CONVERGED, MAX_ITERATIONS, ZERO_DERIVATIVE, RootResult, counted
+from dual_number import Dual
+from decompose_into_lu import lu_factor
+
+SYSTEM_METHODS = ("newton", "chord", "broyden")
+
+
+def newton_raphson(f, x0, h: float = 1e-5, max_iter:int = 1000, tol:float = 1e-5,
+                   full_output: bool = False, fprime: Optional[Callable[[float], float]] = None,
+                   fprime2: Optional[Callable[[float], float]] = None,
+                   autodiff: bool = False) -> Union[float, RootResult]:
     """ The Newton-Raphson method for finding roots of a function.
+    f(x_new) from the stopping check is reused as f(x0) of the next step. The
+    derivative comes from fprime if given, from forward-mode automatic
+    differentiation if autodiff is set (f and f' in one call of f), and
+    otherwise from a central difference, which costs two more calls per step.
+    With fprime2 the step is Halley's, which converges cubically.
     Args:
         f : A function whose derivative is required
         x0(float) : The initial guess for the root. 
@@ -8,8 +39,16 @@ def newton_raphson(f, x0, h: float = 1e-5, max_iter:int = 1000, tol:float = 1e-5
         h(float) : Step size for calculating the derivative
         max_iter(int) : Maximum number of iterations
         tol(float) : Tolerance for convergence
+        full_output(bool) : Return a RootResult with the iteration and function call counts
+            instead of the root, and report a failure to converge in its status instead of raising
+        fprime(Callable) : The derivative of f, optional
+        fprime2(Callable) : The second derivative of f, optional. Switches to Halley's method
+        autodiff(bool) : Differentiate f with dual numbers. f must be built from arithmetic and
+            functions that accept Dual (math functions do not, their NumPy counterparts do)
     Returns:
-        x : The estimated root of the function
+        x : The estimated root of the function, or a RootResult if full_output is True
+    Raises:
+        ZeroDivisionError: If the derivative vanishes and full_output is False
     """
     # First we define the derivative function
     def df(f, x:float, h:float) -> float:
@@ -22,20 +61,162 @@ def newton_raphson(f, x0, h: float = 1e-5, max_iter:int = 1000, tol:float = 1e-5
             (float): The derivative at point x"""
         return (f(x + h) - f(x - h))/(2 * h) # The central difference formula
 
+    def evaluate(x: float):
+        """ f(x), and f'(x) when it comes for free with autodiff."""
+        if autodiff and fprime is None:
+            result = f(Dual(x, 1.0))
+            return (result.value, result.derivative) if isinstance(result, Dual) else (result, 0.0)
+        return f(x), None
+
+    f = counted(f)
+    calls_before = f.calls
+    f_x0, df_x0 = evaluate(x0)
     # Algorithm starts iteratively
-    for _ in range(max_iter):
-        x_new : float = x0 - f(x0)/df(f, x0, h)  # The Newton-Raphson step
+    for iteration in range(max_iter):
+        if fprime is not None:
+            df_x0 = fprime(x0)
+        elif not autodiff:
+            df_x0 = df(f, x0, h)
+        if df_x0 == 0:
+            if full_output:
+                return RootResult(x0, iteration, f.calls - calls_before, ZERO_DERIVATIVE)
+            raise ZeroDivisionError(f"The derivative is zero at {x0}.")
+        if fprime2 is not None:
+            x_new : float = x0 - 2 * f_x0 * df_x0 / (2 * df_x0 ** 2 - f_x0 * fprime2(x0))  # Halley's step
+        else:
+            x_new : float = x0 - f_x0/df_x0  # The Newton-Raphson step
+        f_new, df_new = evaluate(x_new)
 
-        if (abs(x_new - x0) < tol) or (abs(f(x_new)) < tol):  # Stopping condition
+        if (abs(x_new - x0) < tol) or (abs(f_new) < tol):  # Stopping condition
             """we implemented two stopping conditions
             1. If the difference between the new and old estimate is less than the tolerance
             2. If the function evaluated at the new estimate is less than the tolerance
             this increases the robustness of the algorithm. The second condition prevents
             the algorithm from oscillating around the root."""
+            if full_output:
+                return RootResult(x_new, iteration + 1, f.calls - calls_before, CONVERGED)
             return x_new  # Return the estimate
-        x0 = x_new  # Update the guess
+        x0, f_x0, df_x0 = x_new, f_new, df_new  # Update the guess
 
+    if full_output:
+        return RootResult(x0, max_iter, f.calls - calls_before, MAX_ITERATIONS)
     # If max_iters are exhausted, raise an error
     raise ValueError(f"Could not converge to root in {max_iter} iterations. Last estimate is {x0}")
 
 
+def _finite_difference_jacobian(F: Callable[[np.ndarray], np.ndarray], x: np.ndarray, F_x: np.ndarray,
+                                h: float) -> np.ndarray:
+    """ Forward difference Jacobian, one extra call of F per column."""
+    jacobian = np.empty((F_x.shape[0], x.shape[0]))
+    for j in range(x.shape[0]):
+        step = h * max(1.0, abs(x[j]))
+        shifted = x.copy()
+        shifted[j] += step
+        jacobian[:, j] = (np.asarray(F(shifted), dtype=float) - F_x) / step
+    return jacobian
+
+
+def newton_system(F: Callable[[np.ndarray], np.ndarray], x0: np.ndarray,
+                  jacobian: Optional[Callable[[np.ndarray], np.ndarray]] = None, method: str = "newton",
+                  tol: float = 1e-10, max_iter: int = 100, h: float = 1e-7, max_updates: int = 20,
+                  full_output: bool = False) -> Union[np.ndarray, RootResult]:
+    """ Newton's method for a system of equations F(x) = 0.
+    Every linear solve reuses an LU factorisation from lu_factor:
+    "newton" refactorises the Jacobian at every step, "chord" keeps the first
+    factorisation and only refactorises when the residual stops decreasing, and
+    "broyden" applies rank-one (good Broyden) updates to the inverse on top of
+    the stored factors, refactorising after max_updates updates or on stagnation.
+    Args:
+        F (Callable): Maps a vector of length n to a vector of length n.
+        x0 (np.ndarray): The initial guess.
+        jacobian (Callable, optional): Returns the n x n Jacobian of F. Without it a forward
+            difference with relative step h is used, which costs n calls of F.
+        method (str, optional): "newton", "chord" or "broyden". Defaults to "newton".
+        tol (float, optional): Tolerance on the max-norm of the step and of F. Defaults to 1e-10.
+        max_iter (int, optional): Maximum number of iterations. Defaults to 100.
+        h (float, optional): Relative step of the finite difference Jacobian. Defaults to 1e-7.
+        max_updates (int, optional): Broyden updates before a fresh Jacobian. Defaults to 20.
+        full_output (bool, optional): Return a RootResult, whose function_calls counts calls of F,
+            instead of the root. Defaults to False.
+    Returns:
+        np.ndarray or RootResult: The estimated root.
+    Raises:
+        ValueError: If the method is unknown, the Jacobian is singular or the
+            maximum number of iterations was reached (unless full_output is True)."""
+    if method not in SYSTEM_METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose from {SYSTEM_METHODS}.")
+    calls = 0
+
+    def residual(x: np.ndarray) -> np.ndarray:
+        nonlocal calls
+        calls += 1
+        return np.asarray(F(x), dtype=float)
+
+    def factorise(x: np.ndarray, F_x: np.ndarray):
+        nonlocal calls
+        if jacobian is not None:
+            matrix = np.asarray(jacobian(x), dtype=float)
+        else:
+            matrix = _finite_difference_jacobian(F, x, F_x, h)
+            calls += x.shape[0]
+        return lu_factor(matrix, overwrite=True)
+
+    def finish(x: np.ndarray, iteration: int, status: int):
+        if full_output:
+            return RootResult(x, iteration, calls, status)
+        if status == ZERO_DERIVATIVE:
+            raise ValueError("The Jacobian is singular.")
+        raise ValueError(f"Could not converge to root in {max_iter} iterations. Last estimate is {x}")
+
+    x = np.array(x0, dtype=float).reshape(-1)
+    F_x = residual(x)
+    factors = None
+    updates = []  # Broyden: H = (I + u_k s_k^T) ... (I + u_0 s_0^T) J^{-1}
+    for iteration in range(max_iter):
+        if factors is None or method == "newton":
+            factors = factorise(x, F_x)
+            updates = []
+            if factors.is_singular():
+                return finish(x, iteration, ZERO_DERIVATIVE)
+        step = factors.solve(-F_x)
+        for u, s in updates:
+            step += u * (s @ step)
+        x_new = x + step
+        F_new = residual(x_new)
+
+        if np.max(np.abs(step)) < tol * (1 + np.max(np.abs(x))) or np.max(np.abs(F_new)) < tol:
+            return x_new if not full_output else RootResult(x_new, iteration + 1, calls, CONVERGED)
+
+        stagnated = np.linalg.norm(F_new) > 0.9 * np.linalg.norm(F_x)
+        if method == "chord" and stagnated:
+            factors = None
+        elif method == "broyden":
+            # Good Broyden update of the inverse: H_new = (I + u s^T) H with u = (s - H y) / (s^T H y)
+            H_y = factors.solve(F_new - F_x)
+            for u, s in updates:
+                H_y += u * (s @ H_y)
+            denominator = step @ H_y
+            if stagnated or len(updates) >= max_updates or abs(denominator) < 1e-14 * np.linalg.norm(step) ** 2:
+                factors = None
+            else:
+                updates.append(((step - H_y) / denominator, step))
+        x, F_x = x_new, F_new
+
+    return finish(x, max_iter, MAX_ITERATIONS)
+
+
+if __name__ == "__main__":
+    def f(x):
+        return x ** 3 - 2 * x - 5
+
+    print(newton_raphson(f, 2, full_output=True))
+    print(newton_raphson(f, 2, fprime=lambda x: 3 * x ** 2 - 2, full_output=True))
+    print(newton_raphson(f, 2, autodiff=True, full_output=True))
+    print(newton_raphson(f, 2, fprime=lambda x: 3 * x ** 2 - 2, fprime2=lambda x: 6 * x, full_output=True))
+
+    # Intersection of the unit circle with y = x^3
+    def circle_cubic(v):
+        return np.array([v[0] ** 2 + v[1] ** 2 - 1, v[1] - v[0] ** 3])
+
+    for method in SYSTEM_METHODS:
+        print(method, newton_system(circle_cubic, [1.0, 1.0], method=method, full_output=True))
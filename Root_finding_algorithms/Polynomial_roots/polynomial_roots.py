@@ -0,0 +1,227 @@
+from typing import Optional, Sequence, Tuple, Union
+import sys
+from pathlib import Path
+
+import numpy as np
+
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Root_finding_algorithms" / "root_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from root_utils import CONVERGED, MAX_ITERATIONS, RootResult
+
+METHODS = ("companion", "aberth")
+
+# Coefficients are in ascending order, coefficients[i] multiplies x^i, as
+# returned by least_squares_fit.
+
+
+def horner(coefficients: Sequence, x: Union[float, np.ndarray], derivative: bool = False
+           ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Evaluate polynomials at many points with Horner's scheme.
+
+    Parameters:
+    - coefficients: Ascending coefficients of shape (n + 1,), or (..., n + 1) for a batch
+      of polynomials that broadcasts against x.
+    - x: Points at which to evaluate, real or complex.
+    - derivative: Also return the derivative, computed in the same pass.
+
+    Returns:
+    - The values, and the derivatives if derivative is True.
+    """
+    coefficients = np.asarray(coefficients)
+    x = np.asarray(x)
+    value = np.zeros(np.broadcast_shapes(coefficients.shape[:-1], x.shape), dtype=np.result_type(coefficients, x, float))
+    slope = np.zeros_like(value)
+    for i in range(coefficients.shape[-1] - 1, -1, -1):
+        if derivative:
+            slope = slope * x + value
+        value = value * x + coefficients[..., i]
+    return (value, slope) if derivative else value
+
+
+def newton_to_monomial(coefficients: Sequence, nodes: Sequence) -> np.ndarray:
+    """
+    Convert a polynomial in Newton form, sum_k c_k (x - x_0)...(x - x_{k-1}), as
+    returned by newton_forward_interpolation, to ascending monomial coefficients.
+
+    Parameters:
+    - coefficients: Newton coefficients c_0, ..., c_n.
+    - nodes: The interpolation nodes x_0, ..., x_n (x_n is not used).
+
+    Returns:
+    - Ascending monomial coefficients.
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    nodes = np.asarray(nodes, dtype=float)
+    monomial = np.array([coefficients[-1]])
+    for k in range(coefficients.shape[0] - 2, -1, -1):
+        # monomial * (x - nodes[k]) + c_k
+        shifted = np.zeros(monomial.shape[0] + 1)
+        shifted[1:] = monomial
+        shifted[:-1] -= nodes[k] * monomial
+        shifted[0] += coefficients[k]
+        monomial = shifted
+    return monomial
+
+
+def _trim(coefficients: Sequence) -> Tuple[np.ndarray, int]:
+    """ Drop zero leading coefficients and factor out x^m. Returns the remaining
+    ascending coefficients and the multiplicity m of the root at zero."""
+    coefficients = np.atleast_1d(np.asarray(coefficients))
+    nonzero = np.flatnonzero(coefficients)
+    if nonzero.size == 0:
+        raise ValueError("The zero polynomial has no isolated roots.")
+    return coefficients[nonzero[0]:nonzero[-1] + 1], int(nonzero[0])
+
+
+def companion_roots(coefficients: Sequence) -> np.ndarray:
+    """
+    All roots of a polynomial as the eigenvalues of its companion matrix.
+
+    Parameters:
+    - coefficients: Ascending coefficients.
+
+    Returns:
+    - The complex roots, with multiplicity.
+    """
+    coefficients, zeros = _trim(coefficients)
+    degree = coefficients.shape[0] - 1
+    if degree == 0:
+        return np.zeros(zeros, dtype=complex)
+    companion = np.zeros((degree, degree), dtype=np.result_type(coefficients, float))
+    companion[1:, :-1] = np.eye(degree - 1)
+    companion[:, -1] = -coefficients[:-1] / coefficients[-1]
+    return np.concatenate((np.linalg.eigvals(companion).astype(complex), np.zeros(zeros, dtype=complex)))
+
+
+def aberth_roots(coefficients: Sequence, tol: float = 1e-12, max_iter: int = 100,
+                 initial: Optional[np.ndarray] = None, full_output: bool = False) -> Union[np.ndarray, RootResult]:
+    """
+    All roots of a polynomial by Aberth-Ehrlich simultaneous iteration.
+
+    Every approximation z_k takes the Newton correction w_k = p(z_k) / p'(z_k)
+    damped by the repulsion of the others, z_k -= w_k / (1 - w_k sum_j 1 / (z_k - z_j)).
+    All roots are updated together with one batched Horner pass per iteration,
+    and converged roots are frozen. Convergence is cubic for simple roots. A root also
+    counts as converged once |p(z_k)| is below the rounding error of its evaluation,
+    which stops approximations of a multiple root of multiplicity m at their attainable
+    accuracy, about eps^(1/m), instead of letting them wander in the noise.
+
+    Parameters:
+    - coefficients: Ascending coefficients.
+    - tol: Relative tolerance on the corrections. Default is 1e-12.
+    - max_iter: Maximum number of iterations. Default is 100.
+    - initial: Optional starting approximations, one per root of the trimmed polynomial.
+    - full_output: Return a RootResult whose function_calls counts polynomial evaluations.
+
+    Returns:
+    - The complex roots, with multiplicity.
+
+    Raises:
+    - ValueError: If the iteration did not converge and full_output is False.
+    """
+    coefficients, zeros = _trim(coefficients)
+    coefficients = coefficients.astype(np.result_type(coefficients, float))
+    degree = coefficients.shape[0] - 1
+    zero_roots = np.zeros(zeros, dtype=complex)
+    if degree == 0:
+        return zero_roots if not full_output else RootResult(zero_roots, 0, 0, CONVERGED)
+
+    if initial is None:
+        # Points on a circle whose radius is the geometric mean of the root moduli
+        radius = abs(coefficients[0] / coefficients[-1]) ** (1 / degree)
+        angles = 2 * np.pi * np.arange(degree) / degree + 0.4
+        z = radius * np.exp(1j * angles)
+    else:
+        z = np.array(initial, dtype=complex)
+    magnitudes = np.abs(coefficients)
+    noise = 2 * degree * np.finfo(float).eps  # Error bound of Horner's scheme relative to sum |a_i| |z|^i
+    active = np.ones(degree, dtype=bool)
+    evaluations = 0
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        index = np.flatnonzero(active)
+        value, slope = horner(coefficients, z[index], derivative=True)
+        evaluations += index.size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = value / slope
+            differences = z[index, None] - z[None, :]
+            differences[np.arange(index.size), index] = np.inf  # Skip j = k
+            repulsion = np.sum(1 / differences, axis=1)
+            correction = newton / (1 - newton * repulsion)
+        # At a root the computed value is rounding noise of Horner's scheme; near a multiple
+        # root this is reached long before the corrections drop below tol
+        in_noise = np.abs(value) <= noise * horner(magnitudes, np.abs(z[index]))
+        correction[(value == 0) | in_noise] = 0
+        z[index] -= correction
+        active[index] = ~((np.abs(correction) <= tol * np.abs(z[index])) | in_noise) & np.isfinite(correction)
+        if not active.any():
+            break
+    roots = np.concatenate((z, zero_roots))
+    status = MAX_ITERATIONS if active.any() else CONVERGED
+    if full_output:
+        return RootResult(roots, iteration, evaluations, status)
+    if status != CONVERGED:
+        raise ValueError(f"Aberth iteration did not converge in {max_iter} iterations.")
+    return roots
+
+
+def polynomial_roots(coefficients: Sequence, method: str = "companion", nodes: Optional[Sequence] = None,
+                     real: bool = False, imag_tol: float = 1e-9) -> np.ndarray:
+    """
+    All roots of a polynomial given by least_squares_fit or newton_forward_interpolation.
+
+    Parameters:
+    - coefficients: Ascending monomial coefficients, or Newton coefficients if nodes is given.
+    - method: "companion" (eigenvalues of the companion matrix, O(n^3)) or "aberth"
+      (Aberth-Ehrlich iteration, O(n^2) per iteration). Default is "companion".
+    - nodes: Interpolation nodes of a Newton form polynomial.
+    - real: Return only the real roots, sorted.
+    - imag_tol: Relative size of the imaginary part below which a root counts as real.
+
+    Returns:
+    - The roots, complex unless real is True.
+
+    Raises:
+    - ValueError: If the method is unknown or the polynomial is zero.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Choose from {METHODS}.")
+    if nodes is not None:
+        coefficients = newton_to_monomial(coefficients, nodes)
+    roots = companion_roots(coefficients) if method == "companion" else aberth_roots(coefficients)
+    if not real:
+        return roots
+    is_real = np.abs(roots.imag) <= imag_tol * (1 + np.abs(roots))
+    return np.sort(roots[is_real].real)
+
+
+if __name__ == "__main__":
+    subdir_newton = current_dir / "Interpolation_algorithms" / "Newton_Forward_method"
+    if str(subdir_newton) not in sys.path:
+        sys.path.append(str(subdir_newton))
+    from newton_forward import newton_forward_interpolation
+
+    # (x - 1)(x - 2)(x - 3)(x^2 + 1), ascending coefficients
+    coefficients = np.array([-6, 11, -12, 12, -6, 1], dtype=float)
+    print(np.sort_complex(companion_roots(coefficients)))
+    print(np.sort_complex(aberth_roots(coefficients)))
+
+    # Multiple roots converge to their attainable accuracy, about eps^(1/3) for (x - 1)^3
+    triple = polynomial_roots([-1, 3, -3, 1], method="aberth")
+    assert np.max(np.abs(triple - 1)) < 1e-4
+
+    # Real roots of the Newton polynomial through samples of sin on [0, 7.5]
+    x = 0.5 * np.arange(16)
+    _, newton_coefficients = newton_forward_interpolation(list(x), list(np.sin(x)), 0.0)
+    roots = polynomial_roots(newton_coefficients, nodes=x, real=True, method="aberth")
+    print(roots[(roots >= x[0]) & (roots <= x[-1])])  # 0, pi, 2 pi
+
+    # Batched Horner: 10^6 points, 3 polynomials at once
+    points = np.linspace(-1, 1, 1_000_000)
+    print(horner(np.array([[1, 0, 1], [0, 1, 0], [1, 1, 1]])[:, None, :], points).shape)
@@ -1,6 +1,22 @@
+from typing import Union
+import sys
+from pathlib import Path
+
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Root_finding_algorithms" / "root_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from root_utils import CONVERGED, MAX_ITERATIONS, RootResult, counted
+
+
 def regular_falsi(f, lower_lim:float, upper_lim:float, n_iter: int = 1000, tol:float = 1e-6, 
-                  verbose:bool = True, noise:float = 1e-8) -> float:
+                  verbose:bool = True, noise:float = 1e-8, full_output: bool = False) -> Union[float, RootResult]:
     """Find the root of a function using the regular falsi method.
+    The function values at both limits are carried forward, so f is evaluated
+    once per iteration, at the new false position.
     Args:
         f: Function to find the root of.
         lower_lim: Lower limit of the interval. The function has negative value at this point.
@@ -9,20 +25,27 @@ def regular_falsi(f, lower_lim:float, upper_lim:float, n_iter: int = 1000, tol:f
         tol: Tolerance of the solution. Defaults to 1e-6.
         verbose: If True, print the number of iterations and the root. Defaults to True.
         noise: Small value added to the false position to avoid division by zero. Defaults to 1e-8.
+        full_output: Return a RootResult with the iteration and function call counts instead
+            of the root, and report a failure to converge in its status instead of raising.
+            Defaults to False.
     Returns:
-        The root of the function.
+        The root of the function, or a RootResult if full_output is True.
     """
-    if f(lower_lim) * f(upper_lim) > 0:
-        if f(lower_lim) == 0:
+    f = counted(f)
+    calls_before = f.calls
+    f_lower, f_upper = f(lower_lim), f(upper_lim)
+    if f_lower * f_upper > 0:
+        if f_lower == 0:
             return lower_lim # If the lower limit is a root, return it
         else:
             # If the function has the same sign at the limits, the root is not in the interval
             raise ValueError("The function must have opposite signs at the limits.")
     
+    false_position = lower_lim
     for iter in range(n_iter):
         # Calculate the false position
         ## Check if the denominator is zero
-        false_position = lower_lim - (f(lower_lim) * (lower_lim - upper_lim)) / (f(lower_lim) - f(upper_lim))
+        false_position = lower_lim - (f_lower * (lower_lim - upper_lim)) / (f_lower - f_upper)
 
         # Check if the root is found
         try:
@@ -34,13 +57,16 @@ def regular_falsi(f, lower_lim:float, upper_lim:float, n_iter: int = 1000, tol:f
         if abs(new_f) < tol:
             if verbose:
                 print(f"Found root at {false_position} after {iter} iterations.")
+            if full_output:
+                return RootResult(false_position, iter + 1, f.calls - calls_before, CONVERGED)
             return false_position
         
         # Check if the sign of f(lower_lim) and f(false_position) are the same
-        elif f(false_position) * f(lower_lim) < 0:
-            upper_lim = false_position # if sign is different, the root is in the interval [lower_lim, false_position]
+        elif new_f * f_lower < 0:
+            upper_lim, f_upper = false_position, new_f # if sign is different, the root is in the interval [lower_lim, false_position]
         else:
-            lower_lim = false_position # if sign is the same, the root is in the interval [false_position, upper_lim]
+            lower_lim, f_lower = false_position, new_f # if sign is the same, the root is in the interval [false_position, upper_lim]
 
+    if full_output:
+        return RootResult(false_position, n_iter, f.calls - calls_before, MAX_ITERATIONS)
     raise ValueError(f"Could not find root after {n_iter} iterations.")
-
@@ -1,6 +1,23 @@
+from typing import Union
+import sys
+from pathlib import Path
+
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Root_finding_algorithms" / "root_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from root_utils import CONVERGED, MAX_ITERATIONS, RootResult, counted
+
+
 def secant(f, x0: float, x1: float, tol: float = 1e-5, maxiter: int = 1000, 
-           shift_factor: float = 0.01, vertical_case_threshold: float = 1e-12) -> float:
+           shift_factor: float = 0.01, vertical_case_threshold: float = 1e-12,
+           full_output: bool = False) -> Union[float, RootResult]:
     """Uses the secant method to find a root of f.
+    f(x0) is carried over from the previous iteration, so f is evaluated once
+    per iteration, at the new point.
     Parameters:
         f: The function to find a root of.
         x0, x1: The initial points.
@@ -10,23 +27,34 @@ def secant(f, x0: float, x1: float, tol: float = 1e-5, maxiter: int = 1000,
         maxiter: The maximum number of iterations. Default is 1000.
         shift_factor: The factor to shift x1 by when the secant line is vertical.
         vertical_case_threshold: The threshold for the difference between f(x1) and f(x0) to be considered vertical.
+        full_output: Return a RootResult with the iteration and function call counts instead
+            of the root, and report a failure to converge in its status instead of raising.
     Returns:
-        (float) : The approximate root."""
-    for _ in range(maxiter):
+        (float) : The approximate root, or a RootResult if full_output is True."""
+    f = counted(f)
+    calls_before = f.calls
+    f_x0 : float = f(x0)
+    f_x1 : float = f(x1)
+    for iteration in range(maxiter):
         """Check for the stopping criterion.
         We use both the difference and the function value because
         sometimes the difference is close to zero even when the
         function value is zero."""
-        f_x1 : float = f(x1) # Store the function value for x1 for efficiency.
-        f_x0 : float = f(x0) # Store the function value for x0 for efficiency.
         if abs(x1 - x0) < tol or abs(f_x1) < tol:
-            return x1 # Stopping criterion met.
+            # Stopping criterion met.
+            if full_output:
+                return RootResult(x1, iteration, f.calls - calls_before, CONVERGED)
+            return x1
         # Handle the case where the secant line is vertical.
         # This is done by shifting x1 by a factor of shift_factor of the distance between x1 and x0.
         if abs(f_x1 - f_x0) < vertical_case_threshold:
             x1 = x1 + shift_factor * (x1 - x0)
+            f_x1 = f(x1)
             continue
         # Use the secant method formula to update x1.
         x1, x0 = x1 - f_x1 * (x1 - x0) / (f_x1 - f_x0), x1
+        f_x1, f_x0 = f(x1), f_x1
 
-    raise ValueError(f"Secant method failed to converge after {maxiter} iterations. Last found value is {x1}")
\ No newline at end of file
+    if full_output:
+        return RootResult(x1, maxiter, f.calls - calls_before, MAX_ITERATIONS)
+    raise ValueError(f"Secant method failed to converge after {maxiter} iterations. Last found value is {x1}")
@@ -0,0 +1,240 @@
+from typing import Callable, Optional, Sequence
+import sys
+from pathlib import Path
+
+import numpy as np
+
+current_dir = Path().resolve()
+subdir_utils = current_dir / "Root_finding_algorithms" / "root_utils"
+
+# Add subfolder to sys.path
+if str(subdir_utils) not in sys.path:
+    sys.path.append(str(subdir_utils))
+
+from root_utils import (ArrayRootResult, CONVERGED, MAX_ITERATIONS, NO_BRACKET, NOT_FINITE,
+                        ZERO_DERIVATIVE)
+
+# f is called with the iterates of the active lanes and the matching entries of args
+ArrayFunction = Callable[..., np.ndarray]
+
+
+def _evaluate(f: ArrayFunction, x: np.ndarray, lanes: np.ndarray, args: Sequence[np.ndarray]) -> np.ndarray:
+    """ Evaluate f on the given lanes only, passing the per-lane arguments along."""
+    return np.asarray(f(x, *(arg[lanes] for arg in args)), dtype=float)
+
+
+def _lanes(values: Sequence, args: Sequence) -> tuple:
+    """ Broadcast the starting values and the per-lane arguments to one lane shape.
+    Returns the shape, the flattened writable float copies of values and the
+    flattened arguments."""
+    shape = np.broadcast_shapes(*(np.shape(v) for v in values), *(np.shape(a) for a in args))
+    flat_values = [np.array(np.broadcast_to(np.asarray(v, dtype=float), shape)).reshape(-1) for v in values]
+    flat_args = [np.broadcast_to(np.asarray(a), shape).reshape(-1) for a in args]
+    return shape, flat_values, flat_args
+
+
+def bisection_array(f: ArrayFunction, lower_lim: np.ndarray, high_lim: np.ndarray, tolerance: float = 1e-8,
+                    iterations: int = 1000, args: Sequence[np.ndarray] = ()) -> ArrayRootResult:
+    """ Bisection on many independent brackets at once.
+    Every lane is halved with NumPy masks until |f(middle)| <= tolerance or the
+    bracket cannot be split any further, and is then frozen: f is only called
+    on the lanes that are still active. f is evaluated once per lane and iteration.
+    Args:
+        f (function): Called as f(x, *args) with x the 1-D array of active middle points.
+        lower_lim (np.ndarray): Lower limits of the brackets.
+        high_lim (np.ndarray): Upper limits of the brackets.
+        tolerance (float, optional): The tolerance on |f|. Defaults to 1e-8.
+        iterations (int, optional): The maximum number of iterations. Defaults to 1000.
+        args (Sequence[np.ndarray], optional): Per-lane parameters, broadcast to the brackets.
+    Returns:
+        ArrayRootResult: Root, iterations and status of every lane. Lanes without a
+            sign change get NO_BRACKET instead of raising."""
+    shape, (lower, upper), args = _lanes((lower_lim, high_lim), args)
+    n = lower.shape[0]
+    lanes = np.arange(n)
+    f_lower = _evaluate(f, lower, lanes, args)
+    f_upper = _evaluate(f, upper, lanes, args)
+
+    root = (lower + upper) / 2
+    status = np.full(n, MAX_ITERATIONS, dtype=np.int8)
+    count = np.zeros(n, dtype=np.int64)
+    status[f_lower * f_upper > 0] = NO_BRACKET
+    for limit, f_limit in ((lower, f_lower), (upper, f_upper)):
+        exact = f_limit == 0
+        root[exact], status[exact] = limit[exact], CONVERGED
+
+    active = np.flatnonzero(status == MAX_ITERATIONS)
+    for _ in range(iterations):
+        if active.size == 0:
+            break
+        lo, hi = lower[active], upper[active]
+        middle = (lo + hi) / 2
+        f_middle = _evaluate(f, middle, active, args)
+        count[active] += 1
+        root[active] = middle
+        done = (np.abs(f_middle) <= tolerance) | (middle <= lo) | (middle >= hi)
+        status[active[done]] = CONVERGED
+        status[active[~np.isfinite(f_middle)]] = NOT_FINITE
+        # Keep the half whose ends have opposite signs, carrying f(lower) forward
+        left = np.sign(f_middle) == np.sign(f_lower[active])
+        lower[active[left]], f_lower[active[left]] = middle[left], f_middle[left]
+        upper[active[~left]] = middle[~left]
+        active = active[status[active] == MAX_ITERATIONS]
+    return ArrayRootResult(root.reshape(shape), count.reshape(shape), status.reshape(shape))
+
+
+def regular_falsi_array(f: ArrayFunction, lower_lim: np.ndarray, upper_lim: np.ndarray, n_iter: int = 1000,
+                        tol: float = 1e-6, args: Sequence[np.ndarray] = ()) -> ArrayRootResult:
+    """ Regula falsi on many independent brackets at once.
+    Args:
+        f (function): Called as f(x, *args) with x the 1-D array of active false positions.
+        lower_lim (np.ndarray): One end of every bracket.
+        upper_lim (np.ndarray): The other end of every bracket.
+        n_iter (int, optional): Maximum number of iterations. Defaults to 1000.
+        tol (float, optional): Tolerance on |f| at the false position. Defaults to 1e-6.
+        args (Sequence[np.ndarray], optional): Per-lane parameters, broadcast to the brackets.
+    Returns:
+        ArrayRootResult: Root, iterations and status of every lane."""
+    shape, (lower, upper), args = _lanes((lower_lim, upper_lim), args)
+    n = lower.shape[0]
+    lanes = np.arange(n)
+    f_lower = _evaluate(f, lower, lanes, args)
+    f_upper = _evaluate(f, upper, lanes, args)
+
+    root = lower.copy()
+    status = np.full(n, MAX_ITERATIONS, dtype=np.int8)
+    count = np.zeros(n, dtype=np.int64)
+    status[f_lower * f_upper > 0] = NO_BRACKET
+    for limit, f_limit in ((lower, f_lower), (upper, f_upper)):
+        exact = f_limit == 0
+        root[exact], status[exact] = limit[exact], CONVERGED
+
+    active = np.flatnonzero(status == MAX_ITERATIONS)
+    for _ in range(n_iter):
+        if active.size == 0:
+            break
+        lo, hi, f_lo, f_hi = lower[active], upper[active], f_lower[active], f_upper[active]
+        false_position = lo - f_lo * (lo - hi) / (f_lo - f_hi)
+        f_new = _evaluate(f, false_position, active, args)
+        count[active] += 1
+        root[active] = false_position
+        status[active[np.abs(f_new) < tol]] = CONVERGED
+        status[active[~(np.isfinite(false_position) & np.isfinite(f_new))]] = NOT_FINITE
+        # Replace the end whose function value has the same sign as the new point
+        same = f_new * f_lo > 0
+        lower[active[same]], f_lower[active[same]] = false_position[same], f_new[same]
+        upper[active[~same]], f_upper[active[~same]] = false_position[~same], f_new[~same]
+        active = active[status[active] == MAX_ITERATIONS]
+    return ArrayRootResult(root.reshape(shape), count.reshape(shape), status.reshape(shape))
+
+
+def secant_array(f: ArrayFunction, x0: np.ndarray, x1: np.ndarray, tol: float = 1e-5, maxiter: int = 1000,
+                 shift_factor: float = 0.01, vertical_case_threshold: float = 1e-12,
+                 args: Sequence[np.ndarray] = ()) -> ArrayRootResult:
+    """ The secant method on many independent pairs of starting points at once.
+    Each lane carries f(x0) forward, so only the new iterate is evaluated.
+    Args:
+        f (function): Called as f(x, *args) with x the 1-D array of active iterates.
+        x0, x1 (np.ndarray): The initial points of every lane.
+        tol (float, optional): Tolerance on |x1 - x0| and |f(x1)|. Defaults to 1e-5.
+        maxiter (int, optional): The maximum number of iterations. Defaults to 1000.
+        shift_factor (float, optional): The factor to shift x1 by when the secant line is vertical.
+        vertical_case_threshold (float, optional): The threshold on |f(x1) - f(x0)| for a vertical secant.
+        args (Sequence[np.ndarray], optional): Per-lane parameters, broadcast to the starting points.
+    Returns:
+        ArrayRootResult: Root, iterations and status of every lane."""
+    shape, (previous, current), args = _lanes((x0, x1), args)
+    n = previous.shape[0]
+    lanes = np.arange(n)
+    f_previous = _evaluate(f, previous, lanes, args)
+    f_current = _evaluate(f, current, lanes, args)
+
+    status = np.full(n, MAX_ITERATIONS, dtype=np.int8)
+    count = np.zeros(n, dtype=np.int64)
+    active = lanes
+    for _ in range(maxiter):
+        x_prev, x_cur, f_prev, f_cur = previous[active], current[active], f_previous[active], f_current[active]
+        done = (np.abs(x_cur - x_prev) < tol) | (np.abs(f_cur) < tol)
+        status[active[done]] = CONVERGED
+        status[active[~(np.isfinite(x_cur) & np.isfinite(f_cur))]] = NOT_FINITE
+        keep = status[active] == MAX_ITERATIONS
+        active, x_prev, x_cur, f_prev, f_cur = active[keep], x_prev[keep], x_cur[keep], f_prev[keep], f_cur[keep]
+        if active.size == 0:
+            break
+        count[active] += 1
+        # A vertical secant shifts x1 away from x0, otherwise take the secant step
+        vertical = np.abs(f_cur - f_prev) < vertical_case_threshold
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(vertical, x_cur + shift_factor * (x_cur - x_prev),
+                            x_cur - f_cur * (x_cur - x_prev) / (f_cur - f_prev))
+        f_step = _evaluate(f, step, active, args)
+        previous[active] = np.where(vertical, x_prev, x_cur)
+        f_previous[active] = np.where(vertical, f_prev, f_cur)
+        current[active], f_current[active] = step, f_step
+    return ArrayRootResult(current.reshape(shape), count.reshape(shape), status.reshape(shape))
+
+
+def newton_raphson_array(f: ArrayFunction, x0: np.ndarray, df: Optional[ArrayFunction] = None, h: float = 1e-5,
+                         max_iter: int = 1000, tol: float = 1e-5, args: Sequence[np.ndarray] = ()
+                         ) -> ArrayRootResult:
+    """ The Newton-Raphson method on many independent initial guesses at once.
+    Args:
+        f (function): Called as f(x, *args) with x the 1-D array of active iterates.
+        x0 (np.ndarray): The initial guesses.
+        df (function, optional): Derivative of f with the same signature. Without it the
+            central difference with step h is used.
+        h (float, optional): Step size for the central difference. Defaults to 1e-5.
+        max_iter (int, optional): Maximum number of iterations. Defaults to 1000.
+        tol (float, optional): Tolerance on the step and on |f|. Defaults to 1e-5.
+        args (Sequence[np.ndarray], optional): Per-lane parameters, broadcast to x0.
+    Returns:
+        ArrayRootResult: Root, iterations and status of every lane."""
+    shape, (x,), args = _lanes((x0,), args)
+    n = x.shape[0]
+    active = np.arange(n)
+    f_x = _evaluate(f, x, active, args)
+
+    status = np.full(n, MAX_ITERATIONS, dtype=np.int8)
+    count = np.zeros(n, dtype=np.int64)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        x_act = x[active]
+        if df is None:
+            slope = (_evaluate(f, x_act + h, active, args) - _evaluate(f, x_act - h, active, args)) / (2 * h)
+        else:
+            slope = _evaluate(df, x_act, active, args)
+        flat = slope == 0
+        status[active[flat]] = ZERO_DERIVATIVE
+        active, x_act, slope = active[~flat], x_act[~flat], slope[~flat]
+        count[active] += 1
+        x_new = x_act - f_x[active] / slope
+        f_new = _evaluate(f, x_new, active, args)
+        x[active], f_x[active] = x_new, f_new
+        status[active[(np.abs(x_new - x_act) < tol) | (np.abs(f_new) < tol)]] = CONVERGED
+        status[active[~(np.isfinite(x_new) & np.isfinite(f_new))]] = NOT_FINITE
+        active = active[status[active] == MAX_ITERATIONS]
+    return ArrayRootResult(x.reshape(shape), count.reshape(shape), status.reshape(shape))
+
+
+if __name__ == "__main__":
+    import time
+
+    # One equation x^3 - c = 0 per grid cell
+    c = np.random.default_rng(0).uniform(1, 100, 1_000_000)
+
+    def cubic(x, c):
+        return x ** 3 - c
+
+    def cubic_prime(x, c):
+        return 3 * x ** 2
+
+    for name, solve in (("bisection", lambda: bisection_array(cubic, 0.0, 5.0, args=(c,))),
+                        ("regula falsi", lambda: regular_falsi_array(cubic, 0.0, 5.0, args=(c,))),
+                        ("secant", lambda: secant_array(cubic, 4.0, 5.0, tol=1e-10, args=(c,))),
+                        ("newton", lambda: newton_raphson_array(cubic, 5.0, df=cubic_prime, tol=1e-10, args=(c,)))):
+        start = time.perf_counter()
+        result = solve()
+        error = np.abs(result.root - np.cbrt(c))[result.converged].max()
+        print(f"{name:>12}: {time.perf_counter() - start:.2f} s, {result.converged.mean():.0%} converged, "
+              f"max error {error:.1e}, max iterations {result.iterations.max()}")
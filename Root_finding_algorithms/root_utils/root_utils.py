@@ -0,0 +1,112 @@
+from typing import Callable, NamedTuple
+from collections import OrderedDict
+import numpy as np
+
+# Status codes shared by the root finders
+CONVERGED = 0         # The stopping criterion was met
+MAX_ITERATIONS = 1    # The iteration budget ran out
+NO_BRACKET = 2        # The function has the same sign at both limits
+ZERO_DERIVATIVE = 3   # The slope (derivative or secant) vanished
+NOT_FINITE = 4        # An iterate or a function value became inf or nan
+
+STATUS_MESSAGES = {
+    CONVERGED: "converged",
+    MAX_ITERATIONS: "maximum number of iterations reached",
+    NO_BRACKET: "the function has the same sign at both limits",
+    ZERO_DERIVATIVE: "the derivative is zero",
+    NOT_FINITE: "the iteration produced a non-finite value",
+}
+
+
+class ArrayRootResult(NamedTuple):
+    """ Per-lane report of a vectorized root finder.
+    root: The last iterate of every lane.
+    iterations: Number of iterations every lane ran before it stopped.
+    status: Status code of every lane, see STATUS_MESSAGES."""
+    root: np.ndarray
+    iterations: np.ndarray
+    status: np.ndarray
+
+    @property
+    def converged(self) -> np.ndarray:
+        """ Boolean mask of the lanes that converged."""
+        return self.status == CONVERGED
+
+
+class RootResult(NamedTuple):
+    """ Report of a scalar root finder, returned when full_output=True.
+    root: The estimated root (the last iterate if the method did not converge).
+    iterations: Number of iterations performed.
+    function_calls: Number of evaluations of the underlying function.
+    status: Status code, see STATUS_MESSAGES."""
+    root: float
+    iterations: int
+    function_calls: int
+    status: int
+
+    @property
+    def converged(self) -> bool:
+        return self.status == CONVERGED
+
+    @property
+    def message(self) -> str:
+        return STATUS_MESSAGES[self.status]
+
+
+class CountedFunction:
+    """ Wrap a scalar function to count its evaluations and, optionally, memoize them.
+    The last maxsize distinct points are kept in an LRU cache, so revisiting a
+    point costs nothing. Array arguments bypass the cache and count one call per
+    element, other non-real arguments (such as dual numbers) are never cached.
+    Args:
+        f: The function to wrap.
+        maxsize (int, optional): Number of cached points, 0 disables caching. Defaults to 0."""
+    __slots__ = ("f", "maxsize", "calls", "hits", "_cache")
+
+    def __init__(self, f: Callable[[float], float], maxsize: int = 0) -> None:
+        if maxsize < 0:
+            raise ValueError("The cache size must not be negative.")
+        self.f = f
+        self.maxsize = maxsize
+        self.calls = 0  # Evaluations of f
+        self.hits = 0   # Evaluations answered by the cache
+        self._cache: "OrderedDict[float, float]" = OrderedDict()
+
+    def __call__(self, x):
+        if np.ndim(x) != 0:
+            self.calls += np.size(x)
+            return self.f(x)
+        if not isinstance(x, (int, float, np.integer, np.floating)):
+            self.calls += 1
+            return self.f(x)
+        key = float(x)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.calls += 1
+        value = self.f(x)
+        if self.maxsize:
+            self._cache[key] = value
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return value
+
+    def cache_clear(self) -> None:
+        """ Empty the cache, keeping the counters."""
+        self._cache.clear()
+
+
+def memoize(f: Callable[[float], float], maxsize: int = 128) -> CountedFunction:
+    """ Wrap f in a bounded memoizing cache with evaluation counters.
+    Args:
+        f: The function to wrap, typically an expensive simulation.
+        maxsize (int, optional): Number of cached points. Defaults to 128.
+    Returns:
+        CountedFunction: Callable like f, with calls and hits counters."""
+    return CountedFunction(f, maxsize)
+
+
+def counted(f: Callable[[float], float]) -> CountedFunction:
+    """ f itself if it already counts its calls, otherwise a counting wrapper without a cache."""
+    return f if isinstance(f, CountedFunction) else CountedFunction(f)